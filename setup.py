@@ -18,7 +18,7 @@
 
 from setuptools import setup
 from setuptools import find_packages
-from sudokusolver.__main__ import get_version
+from sudokusolver.version import get_version
 
 setup(name='sudokusolver',
       version=get_version(),
@@ -41,6 +41,8 @@ setup(name='sudokusolver',
           'Topic :: Games'
       ],
       packages=find_packages(),
-      entry_points={'console_scripts': ['sudokusolver = sudokusolver.__main__:main']},
+      package_data={'sudokusolver': ['puzzles/*.txt']},
+      extras_require={'numpy': ['numpy']},
+      entry_points={'console_scripts': ['sudokusolver = sudokusolver.cli:main']},
       zip_safe=False,
       platforms='any')
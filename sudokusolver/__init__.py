@@ -0,0 +1,84 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+A sudoku solver. Importing the package loads nothing but the version: the solving API below and the submodules are
+imported the first time they are used, so command line tools and scripts only pay for what they touch
+
+    import sudokusolver
+    board = sudokusolver.parse_puzzle_line(line)
+    [solution, solved] = sudokusolver.solve(board)
+
+The command line interface is sudokusolver.cli
+"""
+
+import importlib
+import sys
+
+from sudokusolver.version import VERSION
+
+# public name -> (module, attribute) it is loaded from
+_EXPORTS = {
+    'solve': ('sudokusolver.solver', 'solve_reasonable_sudoku'),
+    'solve_reasonable_sudoku': ('sudokusolver.solver', 'solve_reasonable_sudoku'),
+    'solve_cached_sudoku': ('sudokusolver.solver', 'solve_cached_sudoku'),
+    'count_solutions': ('sudokusolver.solver', 'count_solutions'),
+    'verify_sudoku': ('sudokusolver.solver', 'verify_sudoku'),
+    'parse_puzzle_line': ('sudokusolver.solver', 'parse_puzzle_line'),
+    'board_to_line': ('sudokusolver.solver', 'board_to_line'),
+    'solve_puzzle_line': ('sudokusolver.solver', 'solve_puzzle_line'),
+    'count_puzzle_line': ('sudokusolver.solver', 'count_puzzle_line'),
+    'ENGINES': ('sudokusolver.solver', 'ENGINES'),
+    'E': ('sudokusolver.solver', 'E'),
+    'BitBoard': ('sudokusolver.bitboard', 'BitBoard'),
+    'SolveStats': ('sudokusolver.stats', 'SolveStats'),
+    'Budget': ('sudokusolver.budget', 'Budget'),
+    'BudgetExceeded': ('sudokusolver.budget', 'BudgetExceeded'),
+    'SolutionCache': ('sudokusolver.cache', 'SolutionCache'),
+    'UnitTracker': ('sudokusolver.validate', 'UnitTracker'),
+    'validate_grid': ('sudokusolver.validate', 'validate_grid'),
+    'BinaryReader': ('sudokusolver.binary', 'BinaryReader'),
+    'BinaryWriter': ('sudokusolver.binary', 'BinaryWriter'),
+    'generate_puzzle': ('sudokusolver.generator', 'generate_puzzle'),
+}
+
+_SUBMODULES = ['batch', 'bench', 'binary', 'bitboard', 'budget', 'cache', 'cli', 'client', 'dlx', 'generator', 'search', 'server',
+               'solver', 'stats', 'symbols', 'techniques', 'units', 'validate', 'vectorized', 'version']
+
+__all__ = ['VERSION'] + list(_EXPORTS)
+
+
+def __getattr__(name: str) -> object:
+    """Imports a public name or submodule on first use and keeps it, so later lookups are plain attribute reads"""
+    if name in _EXPORTS:
+        module, attribute = _EXPORTS[name]
+        value = getattr(importlib.import_module(module), attribute)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_EXPORTS) | set(_SUBMODULES))
+
+
+if sys.version_info < (3, 7):
+    # modules only gained __getattr__ in Python 3.7, so older versions load the API up front
+    for _name in _EXPORTS:
+        __getattr__(_name)
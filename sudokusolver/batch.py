@@ -0,0 +1,212 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Solving files of one line puzzles, in this process or spread across a pool of worker processes
+concurrent.futures takes longer to import than a whole easy puzzle takes to solve, so only the functions that start
+worker processes import it
+"""
+
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Sequence, TextIO, Tuple
+import os
+
+from sudokusolver.budget import Budget
+from sudokusolver.solver import ENGINE_NUMPY, ENGINE_SEARCH, MAX_GUESSES_PER_ROLL, count_puzzle_line, read_puzzle_lines, solve_puzzle_line
+
+if TYPE_CHECKING:
+    from sudokusolver.cache import SolutionCache
+
+# number of puzzles the NumPy engine propagates together when solving a batch in one process
+NUMPY_BATCH_SIZE = 4096
+
+# the attempts at a chunk of solve_batch_parallel: as read, sent again whole after it broke the pool, split into single
+# puzzles after it broke the new pool too, and a single puzzle that broke it once more, solved in a process of its own
+FIRST_TRY = 0
+RETRY_CHUNK = 1
+RETRY_SINGLE = 2
+ISOLATED = 3
+
+def solve_batch(filename: str, out_file: TextIO, engine: str = ENGINE_SEARCH, timeout: float = 0.0, cache: Optional['SolutionCache'] = None,
+                limit: Optional[int] = None, techniques: Optional[Sequence[str]] = None, symbols: Optional[Sequence[str]] = None,
+                size: int = 0, budget: Optional[Budget] = None, max_guesses: int = MAX_GUESSES_PER_ROLL) -> None:
+    """
+    Solves every puzzle in a one puzzle per line file, writing a result line for each as soon as it is solved
+    the NumPy engine solves NUMPY_BATCH_SIZE puzzles at a time, applying the timeout and the budget only to the boards it has to
+    search, and it does not use the cache and only reads 9x9 boards
+    with a limit the solutions are counted instead, see count_puzzle_line
+    symbols and size say how the puzzles are read, see parse_puzzle_line. budget holds the limits every puzzle gets, see puzzle_budget
+    """
+    if limit is not None:
+        for line in read_puzzle_lines(filename):
+            out_file.write(count_puzzle_line(line, limit, timeout, symbols, size, budget) + "\n")
+        return
+    if engine == ENGINE_NUMPY:
+        from sudokusolver.vectorized import solve_batches
+        for result in solve_batches(read_puzzle_lines(filename), NUMPY_BATCH_SIZE, timeout=timeout, budget=budget):
+            out_file.write(result + "\n")
+        return
+    for line in read_puzzle_lines(filename):
+        out_file.write(solve_puzzle_line(line, engine, timeout, cache, techniques, symbols, size, budget, max_guesses) + "\n")
+
+def _solve_chunk(lines: List[str], engine: str, timeout: float, max_guesses: int, limit: Optional[int] = None,
+                 techniques: Optional[Sequence[str]] = None, symbols: Optional[Sequence[str]] = None, size: int = 0,
+                 budget: Optional[Budget] = None) -> List[str]:
+    """
+    Solves a chunk of one line puzzles inside a worker process, or counts their solutions up to limit when it is given
+    a puzzle that raises gets an error status instead of failing the whole chunk
+    """
+    if engine == ENGINE_NUMPY and limit is None:
+        from sudokusolver.vectorized import solve_lines
+        return solve_lines(lines, timeout=timeout, budget=budget)
+    solved_lines = []
+    for line in lines:
+        try:
+            if limit is not None:
+                solved_lines.append(count_puzzle_line(line, limit, timeout, symbols, size, budget))
+            else:
+                solved_lines.append(solve_puzzle_line(line, engine, timeout, None, techniques, symbols, size, budget, max_guesses))
+        except Exception:
+            solved_lines.append(f"{line},,error")
+    return solved_lines
+
+def _solve_isolated(line: str, engine: str, timeout: float, limit: Optional[int] = None, techniques: Optional[Sequence[str]] = None,
+                    symbols: Optional[Sequence[str]] = None, size: int = 0, budget: Optional[Budget] = None,
+                    max_guesses: int = MAX_GUESSES_PER_ROLL) -> str:
+    """
+    Solves one puzzle in a fresh worker process of its own, so a crash can be pinned on that puzzle
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        try:
+            return executor.submit(_solve_chunk, [line], engine, timeout, max_guesses, limit, techniques, symbols, size, budget).result()[0]
+        except BrokenProcessPool:
+            return f"{line},,error"
+
+def _solve_isolated_lines(lines: List[str], engine: str, timeout: float, limit: Optional[int] = None,
+                          techniques: Optional[Sequence[str]] = None, symbols: Optional[Sequence[str]] = None, size: int = 0,
+                          budget: Optional[Budget] = None, max_guesses: int = MAX_GUESSES_PER_ROLL) -> List[str]:
+    """
+    Solves each of a few puzzles in a fresh worker process of its own, see _solve_isolated
+    """
+    return [_solve_isolated(line, engine, timeout, limit, techniques, symbols, size, budget, max_guesses) for line in lines]
+
+def read_chunks(lines: Iterator[str], chunk_size: int) -> Iterator[List[str]]:
+    """
+    Groups the given lines into lists of at most chunk_size lines
+    """
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def solve_batch_parallel(filename: str, out_file: TextIO, engine: str = ENGINE_SEARCH, jobs: int = 0, chunk_size: int = 64,
+                         ordered: bool = False, timeout: float = 0.0, limit: Optional[int] = None, techniques: Optional[Sequence[str]] = None,
+                         symbols: Optional[Sequence[str]] = None, size: int = 0, budget: Optional[Budget] = None,
+                         max_guesses: int = MAX_GUESSES_PER_ROLL) -> None:
+    """
+    Solves every puzzle in a one puzzle per line file across a pool of worker processes
+    puzzles are sent to the workers in chunks of chunk_size lines, and only a few chunks per worker are in flight at once so memory stays flat
+    ordered writes the result lines in input order, otherwise they are written as soon as each chunk finishes
+    if a worker dies, the chunks it took down are sent again to a new pool, a chunk that takes that one down too is split
+    into single puzzles, and only a puzzle that fails on its own as well is solved in a process of its own, getting an
+    error status if it crashes that one too. Those run alongside the pool, so one bad puzzle does not hold up the rest
+    with a limit the solutions are counted instead, see count_puzzle_line. budget and max_guesses are passed on to every puzzle
+    """
+    from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+    from concurrent.futures.process import BrokenProcessPool
+    jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+    max_in_flight = jobs * 4
+    chunks = enumerate(read_chunks(read_puzzle_lines(filename), chunk_size))
+
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    # puzzles solved in a process of their own, each waited on by a thread so they do not hold up the main loop
+    isolator: Optional[ThreadPoolExecutor] = None
+    # future -> (chunk number, offset in the chunk, lines, attempt), see RETRY_CHUNK and the attempts after it
+    running: Dict[Future, Tuple[int, int, List[str], int]] = {}
+    # chunk number -> result lines, with None for results still missing
+    results: Dict[int, List[Optional[str]]] = {}
+    next_to_write = 0
+    input_done = False
+
+    def submit(number: int, offset: int, lines: List[str], attempt: int) -> None:
+        nonlocal isolator
+        if attempt < ISOLATED:
+            future = executor.submit(_solve_chunk, lines, engine, timeout, max_guesses, limit, techniques, symbols, size, budget)
+        else:
+            if isolator is None:
+                isolator = ThreadPoolExecutor(max_workers=jobs)
+            future = isolator.submit(_solve_isolated_lines, lines, engine, timeout, limit, techniques, symbols, size, budget, max_guesses)
+        running[future] = (number, offset, lines, attempt)
+
+    try:
+        while running or not input_done:
+            while not input_done and len(results) < max_in_flight:
+                try:
+                    number, chunk = next(chunks)
+                except StopIteration:
+                    input_done = True
+                    break
+                results[number] = [None] * len(chunk)
+                submit(number, 0, chunk, FIRST_TRY)
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            broken = False
+            retries = []
+            for future in done:
+                number, offset, lines, attempt = running.pop(future)
+                try:
+                    solved_lines = future.result()
+                except BrokenProcessPool:
+                    broken = True
+                    retries.append((number, offset, lines, attempt))
+                    continue
+                results[number][offset:offset + len(solved_lines)] = solved_lines
+
+            if broken:
+                # every chunk still running on the broken pool has to be sent again
+                for future, (number, offset, lines, attempt) in list(running.items()):
+                    if attempt < ISOLATED:
+                        del running[future]
+                        retries.append((number, offset, lines, attempt))
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=jobs)
+                for number, offset, lines, attempt in retries:
+                    if attempt == FIRST_TRY:
+                        submit(number, offset, lines, RETRY_CHUNK)
+                    elif attempt == RETRY_CHUNK and len(lines) > 1:
+                        for k, line in enumerate(lines):
+                            submit(number, offset + k, [line], RETRY_SINGLE)
+                    else:
+                        submit(number, offset, lines, ISOLATED)
+
+            if ordered:
+                while next_to_write in results and None not in results[next_to_write]:
+                    out_file.write("\n".join(results.pop(next_to_write)) + "\n")
+                    next_to_write += 1
+            else:
+                for number in [number for number, lines in results.items() if None not in lines]:
+                    out_file.write("\n".join(results.pop(number)) + "\n")
+    finally:
+        executor.shutdown(wait=False)
+        if isolator is not None:
+            isolator.shutdown(wait=False)
@@ -0,0 +1,233 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The benchmark harness behind `sudokusolver bench`. It times every solving engine on the bundled puzzle sets
+and writes the results as JSON, which can be compared against an earlier run to catch regressions
+"""
+
+from typing import Any, Dict, List
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+PUZZLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'puzzles')
+
+# the bundled puzzle sets, in the order they are run
+PUZZLE_SETS = ['easy', 'hard', 'minimal17', 'pathological']
+
+# engines benchmarked when none are asked for. The guess engine can take minutes on the harder sets
+DEFAULT_ENGINES = ['search', 'dlx']
+
+
+def load_puzzle_set(name: str) -> List[str]:
+    """Returns the puzzles of a bundled set, or of a one puzzle per line file if name is a path"""
+    path = name if os.path.exists(name) else os.path.join(PUZZLE_DIR, name + '.txt')
+    with open(path, 'r') as puzzle_file:
+        return [line.strip() for line in puzzle_file if line.strip() and not line.startswith('#')]
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Returns the given percentile of a sorted list using the nearest rank"""
+    if not values:
+        return 0.0
+    rank = max(math.ceil(fraction * len(values)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def bench_engine(engine: str, lines: List[str], repeat: int = 1) -> Dict[str, Any]:
+    """
+    Times one engine on a list of one line puzzles
+    """
+    from sudokusolver.solver import parse_puzzle_line, solve_reasonable_sudoku
+    latencies = []
+    passes = 0
+    guesses = 0
+    backtracks = 0
+    solved = 0
+    for _ in range(repeat):
+        for line in lines:
+            board = parse_puzzle_line(line)
+            start = time.perf_counter()
+            [_, is_solved, stats] = solve_reasonable_sudoku(board, engine, return_stats=True)
+            latencies.append(time.perf_counter() - start)
+            passes += stats.elimination_loops
+            guesses += stats.guesses
+            backtracks += stats.backtracks
+            solved += bool(is_solved)
+
+    # memory is measured on a separate run since tracing slows everything down
+    peak = 0
+    for line in lines:
+        board = parse_puzzle_line(line)
+        tracemalloc.start()
+        solve_reasonable_sudoku(board, engine)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+
+    runs = len(latencies)
+    total = sum(latencies)
+    latencies.sort()
+    return {
+        "puzzles": runs,
+        "solved": solved,
+        "seconds": total,
+        "puzzles_per_second": runs / total if total > 0 else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 0.50) * 1000,
+            "p95": percentile(latencies, 0.95) * 1000,
+            "p99": percentile(latencies, 0.99) * 1000,
+            "max": (latencies[-1] if latencies else 0.0) * 1000,
+        },
+        "guesses_per_puzzle": guesses / runs if runs else 0.0,
+        "elimination_passes_per_puzzle": passes / runs if runs else 0.0,
+        "backtracks_per_puzzle": backtracks / runs if runs else 0.0,
+        "peak_memory_bytes": peak,
+    }
+
+
+def bench_numpy(lines: List[str], repeat: int = 1) -> Dict[str, Any]:
+    """
+    Times the NumPy engine, which solves the whole set at once so there is no per puzzle latency
+    """
+    from sudokusolver.vectorized import solve_lines
+
+    total = 0.0
+    solved = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = solve_lines(lines)
+        total += time.perf_counter() - start
+        solved += sum(1 for result in results if result.endswith(',solved'))
+
+    tracemalloc.start()
+    solve_lines(lines)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    runs = len(lines) * repeat
+    return {
+        "puzzles": runs,
+        "solved": solved,
+        "seconds": total,
+        "puzzles_per_second": runs / total if total > 0 else 0.0,
+        "latency_ms": None,
+        "guesses_per_puzzle": None,
+        "elimination_passes_per_puzzle": None,
+        "backtracks_per_puzzle": None,
+        "peak_memory_bytes": peak,
+    }
+
+
+def run_benchmarks(engines: List[str], sets: List[str], repeat: int = 1) -> Dict[str, Any]:
+    """
+    Runs every engine on every puzzle set and returns the results keyed by engine and then set
+    """
+    report: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "repeat": repeat,
+        "engines": {},
+    }
+    for engine in engines:
+        report["engines"][engine] = {}
+        for name in sets:
+            lines = load_puzzle_set(name)
+            if engine == 'numpy':
+                result = bench_numpy(lines, repeat)
+            else:
+                result = bench_engine(engine, lines, repeat)
+            report["engines"][engine][os.path.splitext(os.path.basename(name))[0]] = result
+    return report
+
+
+def compare_reports(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Compares throughput against a baseline report
+    returns a line for every engine and set that got slower by more than the tolerance, as a fraction of the baseline
+    """
+    regressions = []
+    for engine, sets in current["engines"].items():
+        for name, result in sets.items():
+            before = baseline.get("engines", {}).get(engine, {}).get(name)
+            if not before or not before.get("puzzles_per_second"):
+                continue
+            ratio = result["puzzles_per_second"] / before["puzzles_per_second"]
+            if ratio < 1.0 - tolerance:
+                regressions.append(f"{engine}/{name}: {result['puzzles_per_second']:.1f} puzzles/s, "
+                                   f"was {before['puzzles_per_second']:.1f} ({(1.0 - ratio) * 100:.0f}% slower)")
+    return regressions
+
+
+def print_summary(report: Dict[str, Any], out_file: Any = sys.stderr) -> None:
+    """Prints a table of the results for people reading the terminal"""
+    out_file.write(f"{'engine':<8} {'set':<14} {'puzzles/s':>10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+                   f"{'guesses':>9} {'passes':>8} {'peak KiB':>9}\n")
+    missing = float('nan')
+    for engine, sets in report["engines"].items():
+        for name, result in sets.items():
+            latency = result["latency_ms"] or {}
+            guesses = result["guesses_per_puzzle"]
+            passes = result["elimination_passes_per_puzzle"]
+            out_file.write(f"{engine:<8} {name:<14} {result['puzzles_per_second']:>10.1f} "
+                           f"{latency.get('p50', missing):>9.2f} {latency.get('p95', missing):>9.2f} {latency.get('p99', missing):>9.2f} "
+                           f"{guesses if guesses is not None else missing:>9.1f} {passes if passes is not None else missing:>8.1f} "
+                           f"{result['peak_memory_bytes'] / 1024:>9.1f}\n")
+
+
+def bench_main(argv: List[str]) -> int:
+    """
+    The entry point of `sudokusolver bench`
+    returns the exit status, which is 1 when a comparison against a baseline found a regression
+    """
+    from sudokusolver.solver import available_engines
+    from sudokusolver.version import VERSION
+    parser = argparse.ArgumentParser(prog='sudokusolver bench', description="Benchmarks the solving engines on the bundled puzzle sets")
+    parser.add_argument('-e', '--engine', action='append', choices=available_engines(), help="Engine to benchmark, can be repeated. Defaults to " + ", ".join(DEFAULT_ENGINES))
+    parser.add_argument('-s', '--set', action='append', help="Puzzle set to run, one of " + ", ".join(PUZZLE_SETS) + " or a one puzzle per line file. Can be repeated, defaults to all bundled sets")
+    parser.add_argument('-n', '--repeat', type=int, help="Number of times every puzzle is solved", default=1)
+    parser.add_argument('-o', '--out', type=str, help="Name of the JSON results file, printed to standard output if not given", default="")
+    parser.add_argument('-c', '--compare', type=str, help="JSON results of an earlier run to check for regressions against", default="")
+    parser.add_argument('--tolerance', type=float, help="Fraction of throughput that may be lost before it counts as a regression", default=0.25)
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.engine or DEFAULT_ENGINES, args.set or PUZZLE_SETS, max(args.repeat, 1))
+    report["version"] = VERSION
+    print_summary(report)
+
+    if len(args.out) > 0:
+        with open(args.out, 'w') as out_file:
+            json.dump(report, out_file, indent=2)
+            out_file.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if len(args.compare) > 0:
+        with open(args.compare, 'r') as baseline_file:
+            regressions = compare_reports(report, json.load(baseline_file), args.tolerance)
+        for regression in regressions:
+            sys.stderr.write(f"regression: {regression}\n")
+        if regressions:
+            return 1
+    return 0
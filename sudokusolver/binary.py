@@ -0,0 +1,375 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+A packed binary format for puzzles and solved grids, and `sudokusolver convert`.
+A file is a 16 byte header followed by fixed size records of one board each, cells row by row with 0 for empty cells.
+Boards up to 9x9 take 4 bits a cell, two cells to a byte with the first in the high half, so a 9x9 record is 41 bytes.
+Larger boards take a byte a cell. The header holds the magic bytes SDKB, the format version, the box size of the boards,
+the bits per cell and the record size, so any record can be found by its offset.
+BinaryReader memory maps the file and hands out records as memoryview slices or a NumPy view, without copying
+"""
+
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+import argparse
+import itertools
+import mmap
+import os
+import struct
+import sys
+
+from sudokusolver.symbols import default_symbols, format_board, format_cells, iter_text_boards, parse_cells, parse_symbols
+from sudokusolver.units import Geometry, STANDARD, geometry_for_box, geometry_for_size
+
+MAGIC = b'SDKB'
+FORMAT_VERSION = 1
+# magic, version, box size, bits per cell, a padding byte, record size in bytes and four reserved bytes
+HEADER = struct.Struct('<4sBBBxI4x')
+# the box sizes a header may give, up to the largest whose digits fit in a byte a cell
+MIN_BOX = 2
+MAX_BOX = 15
+
+FORMAT_TEXT = 'text'
+FORMAT_LINE = 'line'
+FORMAT_BINARY = 'binary'
+FORMATS = [FORMAT_TEXT, FORMAT_LINE, FORMAT_BINARY]
+
+# the two 4 bit cells packed in each byte value
+_PAIRS = tuple((byte >> 4, byte & 15) for byte in range(256))
+
+
+def _numpy() -> Any:
+    """Returns the NumPy module, imported on first use so reading records one at a time never loads it"""
+    from sudokusolver.vectorized import numpy, require_numpy
+    require_numpy()
+    return numpy
+
+
+def cell_bits(geometry: Geometry) -> int:
+    """Returns the bits each cell takes in a record: 4 while every digit fits, otherwise 8"""
+    return 4 if geometry.size < 16 else 8
+
+
+def record_size(geometry: Geometry) -> int:
+    """Returns the number of bytes in one record"""
+    return (geometry.cells * cell_bits(geometry) + 7) // 8
+
+
+def pack_grid(grid: Sequence[int], geometry: Geometry = STANDARD) -> bytes:
+    """
+    Packs a flat list of digits, with 0 for empty cells, into one record
+    raises ValueError if the list is not a board of the given size
+    """
+    if len(grid) != geometry.cells or not all(0 <= digit <= geometry.size for digit in grid):
+        raise ValueError(f"not a {geometry.size}x{geometry.size} board")
+    if cell_bits(geometry) == 8:
+        return bytes(grid)
+    if len(grid) % 2:
+        grid = list(grid) + [0]
+    return bytes((grid[i] << 4) | grid[i + 1] for i in range(0, len(grid), 2))
+
+
+def unpack_record(record: Any, geometry: Geometry = STANDARD) -> List[int]:
+    """Unpacks one record, given as bytes or a memoryview, to a flat list of digits with 0 for empty cells"""
+    if cell_bits(geometry) == 8:
+        return list(record)
+    pairs = _PAIRS
+    digits = [digit for byte in record for digit in pairs[byte]]
+    del digits[geometry.cells:]
+    return digits
+
+
+def is_binary_file(path: str) -> bool:
+    """
+    Returns whether a file starts with the magic bytes of the binary format
+    only regular files are looked at, since binary files are memory mapped and reading the start of a pipe would use it up
+    """
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as in_file:
+        return in_file.read(len(MAGIC)) == MAGIC
+
+
+class BinaryReader:
+    """
+    Reads a binary file through a memory map
+    records are memoryview slices of the map, so reading them copies nothing until they are unpacked
+    use it as a context manager, or call close. A map with records or arrays still in use is closed once they are gone
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, 'rb')
+        try:
+            header = self._file.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{path} is not a binary puzzle file")
+            magic, version, box, bits, size = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a binary puzzle file")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{path} is in binary format version {version}, only version {FORMAT_VERSION} can be read")
+            if not MIN_BOX <= box <= MAX_BOX:
+                raise ValueError(f"{path} gives a box size of {box}, only {MIN_BOX} to {MAX_BOX} can be read")
+            self.geometry = geometry_for_box(box)
+            if bits != cell_bits(self.geometry) or size != record_size(self.geometry):
+                raise ValueError(f"{path} has a record layout that does not match its board size")
+            self.record_size = size
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._view = memoryview(self._map)
+        self.count = (len(self._map) - HEADER.size) // self.record_size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, index: int) -> memoryview:
+        """Returns record number index as a memoryview slice of the map"""
+        if not 0 <= index < self.count:
+            raise IndexError("record index out of range")
+        start = HEADER.size + index * self.record_size
+        return self._view[start:start + self.record_size]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        """Yields every record as a memoryview slice of the map"""
+        view = self._view
+        size = self.record_size
+        for start in range(HEADER.size, HEADER.size + self.count * size, size):
+            yield view[start:start + size]
+
+    def grids(self) -> Iterator[List[int]]:
+        """Yields every record unpacked to a flat list of digits"""
+        geometry = self.geometry
+        for record in self:
+            yield unpack_record(record, geometry)
+
+    def array(self) -> Any:
+        """Returns the records as an (N, record_size) NumPy uint8 array that is a view of the map"""
+        numpy = _numpy()
+        raw = numpy.frombuffer(self._map, dtype=numpy.uint8, count=self.count * self.record_size, offset=HEADER.size)
+        return raw.reshape(self.count, self.record_size)
+
+    def unpack_array(self, start: int = 0, stop: Optional[int] = None) -> Any:
+        """Returns records start to stop unpacked to an (N, cells) NumPy uint8 array of digits"""
+        numpy = _numpy()
+        raw = self.array()[start:stop]
+        cells = self.geometry.cells
+        if cell_bits(self.geometry) == 8:
+            return raw[:, :cells]
+        digits = numpy.empty((len(raw), 2 * self.record_size), dtype=numpy.uint8)
+        digits[:, 0::2] = raw >> 4
+        digits[:, 1::2] = raw & 15
+        return digits[:, :cells]
+
+    def close(self) -> None:
+        """Closes the file, and the map unless records or arrays taken from it are still in use"""
+        self._view.release()
+        try:
+            self._map.close()
+        except BufferError:
+            pass
+        self._file.close()
+
+    def __enter__(self) -> 'BinaryReader':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class BinaryWriter:
+    """
+    Appends records to a binary file, writing the header first when the file is new or empty
+    raises ValueError for a box size BinaryReader cannot read back, or when appending to a file of another board size
+    use it as a context manager, or call close
+    """
+
+    def __init__(self, path: str, geometry: Geometry = STANDARD) -> None:
+        if not MIN_BOX <= geometry.box <= MAX_BOX:
+            raise ValueError(f"{geometry.size}x{geometry.size} boards cannot be written, only box sizes {MIN_BOX} to {MAX_BOX}")
+        self.geometry = geometry
+        self.count = 0
+        self._file = open(path, 'ab')
+        header = HEADER.pack(MAGIC, FORMAT_VERSION, geometry.box, cell_bits(geometry), record_size(geometry))
+        if self._file.tell() == 0:
+            self._file.write(header)
+            return
+        with open(path, 'rb') as in_file:
+            existing = in_file.read(HEADER.size)
+        if existing != header:
+            self._file.close()
+            raise ValueError(f"{path} is not a binary file of {geometry.size}x{geometry.size} boards")
+
+    def write(self, grid: Sequence[int]) -> None:
+        """Appends one board given as a flat list of digits with 0 for empty cells, see pack_grid"""
+        self._file.write(pack_grid(grid, self.geometry))
+        self.count += 1
+
+    def write_array(self, grids: Any) -> None:
+        """Appends every row of an (N, cells) NumPy array of digits, packed with array operations"""
+        numpy = _numpy()
+        grids = numpy.asarray(grids)
+        geometry = self.geometry
+        if grids.ndim != 2 or grids.shape[1] != geometry.cells:
+            raise ValueError(f"expected an array of shape (N, {geometry.cells}), got {grids.shape}")
+        if grids.size and (grids.min() < 0 or grids.max() > geometry.size):
+            raise ValueError(f"digits have to be between 0 and {geometry.size}")
+        grids = grids.astype(numpy.uint8)
+        if cell_bits(geometry) == 4:
+            if geometry.cells % 2:
+                grids = numpy.hstack([grids, numpy.zeros((len(grids), 1), dtype=numpy.uint8)])
+            grids = (grids[:, 0::2] << 4) | grids[:, 1::2]
+        self._file.write(numpy.ascontiguousarray(grids).tobytes())
+        self.count += len(grids)
+
+    def close(self) -> None:
+        """Flushes and closes the file"""
+        self._file.close()
+
+    def __enter__(self) -> 'BinaryWriter':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def detect_format(path: str, symbols: Optional[Sequence[str]] = None, size: int = 0) -> str:
+    """
+    Works out the format of a file: binary from its magic bytes, one line when its first puzzle is a whole board on one line,
+    otherwise text
+    symbols and size, when given, are what a whole board has to be written with and the only size it may have, so that
+    for instance the 16 character rows of a 16x16 board are not taken for 4x4 boards in the one line format
+    """
+    if is_binary_file(path):
+        return FORMAT_BINARY
+    with open(path, 'r') as in_file:
+        return _text_format(in_file, symbols, size)[0]
+
+
+def _text_format(lines: Iterable[str], symbols: Optional[Sequence[str]], size: int = 0) -> Tuple[str, List[str]]:
+    """
+    Works out whether lines of text are in the one line or text format from their first puzzle, see detect_format
+    returns the format and the lines read to find out, so the rest can be read on from where it stopped
+    """
+    read = []
+    for line in lines:
+        read.append(line)
+        line = line.strip()
+        if line and not line.startswith('#'):
+            return (FORMAT_LINE if parse_cells(line.split(',')[0], symbols, True, size) is not None else FORMAT_TEXT), read
+    return FORMAT_TEXT, read
+
+
+def convert_main(argv: List[str]) -> int:
+    """
+    The entry point of `sudokusolver convert`
+    """
+    parser = argparse.ArgumentParser(prog='sudokusolver convert', description="Converts boards between the text, one line and binary formats")
+    parser.add_argument('file', type=str, help="File of boards to convert")
+    parser.add_argument('-f', '--from', dest='source', type=str, choices=FORMATS, default=None,
+                        help="Format of the file, worked out from its contents if not given")
+    parser.add_argument('-t', '--to', dest='target', type=str, choices=FORMATS, default=FORMAT_LINE, help="Format to convert to")
+    parser.add_argument('-o', '--out', type=str, default="",
+                        help="Name of the file the boards are appended to, standard output if not given. The binary format needs a file")
+    parser.add_argument('--solutions', action='store_true', help="Convert the solutions of puzzle,solution,status lines rather than the puzzles")
+    parser.add_argument('--size', type=int, default=0, help="Side of the boards. Text files of boards other than 9x9 need it to be told apart")
+    parser.add_argument('--symbols', type=str, default="", help="Symbols of the digits in order, see sudokusolver --help")
+    args = parser.parse_args(argv)
+
+    symbols = None
+    if len(args.symbols) > 0:
+        try:
+            symbols = parse_symbols(args.symbols)
+        except ValueError as error:
+            parser.error(str(error))
+        if args.size and args.size != len(symbols):
+            parser.error(f"--symbols gives {len(symbols)} symbols for a board of size {args.size}")
+    if args.size and (args.size < 4 or geometry_for_size(args.size) is None):
+        parser.error("--size has to be a square number of at least 4, such as 4, 9, 16 or 25")
+    if args.target == FORMAT_BINARY and len(args.out) == 0:
+        parser.error("--to binary needs --out")
+    out_file: Optional[TextIO] = None
+    writer: Optional[BinaryWriter] = None
+    written = 0
+    skipped = 0
+    try:
+        if args.target != FORMAT_BINARY:
+            out_file = open(args.out, 'a') if len(args.out) > 0 else sys.stdout
+        for geometry, grid in _read_boards(args.file, args.source, symbols, args.size, args.solutions):
+            if grid is None:
+                skipped += 1
+                continue
+            if args.target == FORMAT_BINARY:
+                if writer is None:
+                    writer = BinaryWriter(args.out, geometry)
+                if geometry is not writer.geometry:
+                    skipped += 1
+                    continue
+                writer.write(grid)
+            else:
+                board_symbols = symbols or default_symbols(geometry.size)
+                if args.target == FORMAT_LINE:
+                    out_file.write(format_cells(grid, board_symbols) + "\n")
+                else:
+                    out_file.write(format_board(grid, geometry, board_symbols) + "\n\n")
+            written += 1
+    except (OSError, ValueError) as error:
+        sys.stderr.write(f"sudokusolver convert: {error}\n")
+        return 1
+    finally:
+        if writer is not None:
+            writer.close()
+        if out_file is not None and out_file is not sys.stdout:
+            out_file.close()
+    if skipped:
+        sys.stderr.write(f"sudokusolver convert: {written} boards converted, {skipped} skipped that are not boards of the right size\n")
+    return 0
+
+
+def _read_boards(path: str, source: Optional[str], symbols: Optional[Sequence[str]], size: int,
+                 solutions: bool) -> Iterator[Any]:
+    """
+    Yields (geometry, digits) for every board of a file in the given format, with None for digits that are not a board
+    a source of None works out the format like detect_format, reading the file only once so it can be a pipe
+    """
+    if source is None and is_binary_file(path):
+        source = FORMAT_BINARY
+    if source == FORMAT_BINARY:
+        with BinaryReader(path) as reader:
+            if size and reader.geometry.size != size:
+                raise ValueError(f"{path} holds {reader.geometry.size}x{reader.geometry.size} boards")
+            for grid in reader.grids():
+                yield reader.geometry, grid
+        return
+
+    with open(path, 'r') as in_file:
+        lines: Iterable[str] = in_file
+        if source is None:
+            source, read = _text_format(in_file, symbols, size)
+            lines = itertools.chain(read, in_file)
+        if source == FORMAT_TEXT:
+            geometry = geometry_for_size(size or (len(symbols) if symbols is not None else 9))
+            for grid in iter_text_boards(lines, geometry, symbols):
+                yield geometry, grid
+            return
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            fields = line.split(',')
+            cells = parse_cells(fields[1] if solutions and len(fields) > 1 else fields[0], symbols, True, size)
+            yield (cells[0], cells[1]) if cells is not None else (None, None)
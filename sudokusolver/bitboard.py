@@ -0,0 +1,264 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The bitmask board. Each cell holds a candidate mask with one bit per digit and each row, column and square
+keeps a mask of the digits already placed in it, so elimination is a handful of bitwise operations
+"""
+
+from typing import Any, List, Optional
+
+from sudokusolver.stats import SolveStats
+from sudokusolver.units import Geometry, STANDARD, geometry_for_size
+
+# the value stored in E represents an empty space in the puzzle
+E = '.'
+
+
+def mask_to_digits(mask: int) -> List[int]:
+    """Returns the digits set in the given candidate mask in ascending order"""
+    digits = []
+    digit = 1
+    while mask:
+        if mask & 1:
+            digits.append(digit)
+        mask >>= 1
+        digit += 1
+    return digits
+
+
+def digits_to_mask(digits: List[int]) -> int:
+    """Returns the candidate mask holding the given digits"""
+    mask = 0
+    for digit in digits:
+        mask |= 1 << (digit - 1)
+    return mask
+
+
+class BitBoard:
+    """
+    A sudoku board stored as flat lists of ints
+    cands[cell] is the candidate mask of a cell, values[cell] is its placed digit or 0 when empty
+    rows, cols and boxes hold the masks of the digits placed in each unit
+    stats is an optional SolveStats that placements and elimination passes are counted in
+    """
+
+    __slots__ = ('geometry', 'cands', 'values', 'rows', 'cols', 'boxes', 'unsolved', 'stats')
+
+    def __init__(self, geometry: Geometry = STANDARD) -> None:
+        self.geometry = geometry
+        self.cands = [geometry.all_digits] * geometry.cells
+        self.values = [0] * geometry.cells
+        self.rows = [0] * geometry.size
+        self.cols = [0] * geometry.size
+        self.boxes = [0] * geometry.size
+        self.unsolved = geometry.cells
+        self.stats: Optional[SolveStats] = None
+
+    @classmethod
+    def from_list_board(cls, board: List[List[Any]], stats: Optional[SolveStats] = None) -> Optional['BitBoard']:
+        """
+        Builds a bitmask board from the list of lists format used by the rest of the program
+        cells may hold a digit, the empty marker E or a list of remaining candidates
+        stats is attached to the board once the given digits are placed
+        returns None if the board is malformed or the given digits contradict each other
+        """
+        geometry = geometry_for_size(len(board))
+        if geometry is None:
+            return None
+        size = geometry.size
+        bit_board = cls(geometry)
+        givens = []
+        for i in range(size):
+            if len(board[i]) != size:
+                return None
+            for j in range(size):
+                value = board[i][j]
+                cell = i * size + j
+                if isinstance(value, list):
+                    bit_board.cands[cell] = digits_to_mask(value) & geometry.all_digits
+                elif isinstance(value, int):
+                    if not 1 <= value <= size:
+                        return None
+                    givens.append((cell, value))
+                elif value != E:
+                    return None
+
+        for cell, value in givens:
+            if not bit_board.place(cell, value):
+                return None
+        for cell in range(geometry.cells):
+            if not bit_board.values[cell] and not bit_board.cands[cell]:
+                return None
+        bit_board.stats = stats
+        return bit_board
+
+    @classmethod
+    def from_candidates(cls, cands: List[int], geometry: Geometry = STANDARD) -> Optional['BitBoard']:
+        """
+        Builds a bitmask board from a flat list of candidate masks, placing every cell that is down to one candidate
+        returns None if the masks contradict each other
+        """
+        bit_board = cls(geometry)
+        bit_board.cands[:] = [mask & geometry.all_digits for mask in cands]
+        for cell in range(geometry.cells):
+            mask = bit_board.cands[cell]
+            if not mask:
+                return None
+            if not mask & (mask - 1) and not bit_board.values[cell]:
+                if not bit_board.place(cell, mask.bit_length()):
+                    return None
+        return bit_board
+
+    def to_list_board(self) -> List[List[Any]]:
+        """
+        Converts back to the list of lists format
+        solved cells hold their digit and unsolved cells hold a list of their candidates
+        """
+        size = self.geometry.size
+        board = []
+        for i in range(size):
+            row = []
+            for cell in range(i * size, (i + 1) * size):
+                if self.values[cell]:
+                    row.append(self.values[cell])
+                else:
+                    row.append(mask_to_digits(self.cands[cell]))
+            board.append(row)
+        return board
+
+    def copy(self) -> 'BitBoard':
+        """Returns an independent copy of this board"""
+        other = BitBoard.__new__(BitBoard)
+        other.geometry = self.geometry
+        other.cands = self.cands[:]
+        other.values = self.values[:]
+        other.rows = self.rows[:]
+        other.cols = self.cols[:]
+        other.boxes = self.boxes[:]
+        other.unsolved = self.unsolved
+        other.stats = self.stats
+        return other
+
+    def save(self) -> tuple:
+        """Returns a snapshot of the board state that restore can roll back to"""
+        return (self.cands[:], self.values[:], self.rows[:], self.cols[:], self.boxes[:], self.unsolved)
+
+    def restore(self, state: tuple) -> None:
+        """Rolls the board back to a snapshot taken with save. The snapshot is copied so it can be reused"""
+        cands, values, rows, cols, boxes, self.unsolved = state
+        self.cands[:] = cands
+        self.values[:] = values
+        self.rows[:] = rows
+        self.cols[:] = cols
+        self.boxes[:] = boxes
+
+    def is_solved(self) -> bool:
+        """Returns True when every cell holds a digit. Placement never allows a conflict, so this means solved"""
+        return self.unsolved == 0
+
+    def place(self, cell: int, digit: int, technique: str = 'given') -> bool:
+        """
+        Places a digit in a cell and removes it from the candidates of the cell's peers
+        technique names what found the placement, for the candidates removed count in stats
+        returns False if the digit is not a candidate there or if a peer is left without candidates
+        """
+        bit = 1 << (digit - 1)
+        own = self.cands[cell]
+        if not own & bit:
+            return False
+        geometry = self.geometry
+        cands = self.cands
+        values = self.values
+        values[cell] = digit
+        cands[cell] = bit
+        self.rows[geometry.row_of[cell]] |= bit
+        self.cols[geometry.col_of[cell]] |= bit
+        self.boxes[geometry.box_of[cell]] |= bit
+        self.unsolved -= 1
+        keep = ~bit
+        consistent = True
+        removed = 0
+        for peer in geometry.peers[cell]:
+            mask = cands[peer]
+            # a solved peer cannot hold this digit, or it would not have been a candidate here
+            if mask & bit:
+                mask &= keep
+                cands[peer] = mask
+                removed += 1
+                if not mask:
+                    consistent = False
+        if self.stats is not None:
+            self.stats.count_removed(technique, removed + bin(own).count('1') - 1)
+        return consistent
+
+    def eliminate_pass(self) -> int:
+        """
+        Runs one pass of naked singles (a cell with one candidate left)
+        and hidden singles (a digit with one place left in a row, column or square)
+        returns the number of digits placed, or -1 if the board was found to be contradictory
+        """
+        geometry = self.geometry
+        cands = self.cands
+        values = self.values
+        if self.stats is not None:
+            self.stats.elimination_loops += 1
+        placed = 0
+        for cell in range(geometry.cells):
+            if not values[cell]:
+                mask = cands[cell]
+                if not mask:
+                    return -1
+                if not mask & (mask - 1):
+                    if not self.place(cell, mask.bit_length(), 'naked_single'):
+                        return -1
+                    placed += 1
+
+        all_digits = geometry.all_digits
+        for unit in geometry.units:
+            once = 0
+            more = 0
+            used = 0
+            for cell in unit:
+                mask = cands[cell]
+                if values[cell]:
+                    used |= mask
+                else:
+                    more |= once & mask
+                    once |= mask
+            if (once | used) != all_digits:
+                return -1
+            hidden = once & ~more & ~used
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for cell in unit:
+                    if not values[cell] and cands[cell] & bit:
+                        if not self.place(cell, bit.bit_length(), 'hidden_single'):
+                            return -1
+                        placed += 1
+                        break
+        return placed
+
+    def propagate(self) -> bool:
+        """
+        Repeats elimination passes until nothing changes
+        returns False if the board was found to be contradictory
+        """
+        placed = 1
+        while placed > 0 and self.unsolved:
+            placed = self.eliminate_pass()
+        return placed >= 0
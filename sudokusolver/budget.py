@@ -0,0 +1,113 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Per solve budgets. A Budget is handed to one solve and caps its wall clock time, the search nodes it visits and the
+memory its search state takes. The engines charge it as they go and it raises BudgetExceeded once a limit is passed;
+the solve entry points catch that and hand back the most constrained board the budget saw, so a caller gets an answer
+in bounded time without killing anything. Nothing here is shared between solves, so concurrent solves with their own
+budgets never see each other's limits
+"""
+
+from typing import Any, List, Optional
+import time
+
+# the reasons a budget runs out, also used as batch statuses
+TIMEOUT = 'timeout'
+NODE_LIMIT = 'node-limit'
+MEMORY_LIMIT = 'memory-limit'
+REASONS = [TIMEOUT, NODE_LIMIT, MEMORY_LIMIT]
+
+
+class BudgetExceeded(Exception):
+    """Raised inside a solve by the budget that ran out, reason is one of REASONS"""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Budget:
+    """
+    Limits for one solve: seconds of wall clock time, nodes of search and bytes of search state, 0 meaning no limit
+    nodes are branches of the depth first search, rows tried by Dancing Links and guesses of the guess engine.
+    Memory is what the engine keeps on top of the board, the board snapshots of the search stack or the Dancing
+    Links matrix, since measuring the whole process would charge one solve for everything else running in it
+    the solve starts the budget and fills in what was spent: nodes, peak_memory, exceeded with the reason it ran out
+    or None, and best, the board in the list of lists format with the fewest unsolved cells reached so far
+    a board reached by the search may hold guesses that turn out wrong, it is only the furthest the solve got
+    """
+
+    __slots__ = ('seconds', 'max_nodes', 'max_memory', 'deadline', 'nodes', 'peak_memory', 'exceeded', 'best', 'best_unsolved')
+
+    def __init__(self, seconds: float = 0.0, nodes: int = 0, memory: int = 0) -> None:
+        self.seconds = seconds
+        self.max_nodes = nodes
+        self.max_memory = memory
+        self.start()
+
+    def copy(self, seconds: float = 0.0) -> 'Budget':
+        """Returns a fresh budget with the same limits, keeping the shorter of its time limit and seconds when that is given"""
+        if seconds > 0 and (self.seconds <= 0 or seconds < self.seconds):
+            return Budget(seconds, self.max_nodes, self.max_memory)
+        return Budget(self.seconds, self.max_nodes, self.max_memory)
+
+    def is_limited(self) -> bool:
+        """Returns whether any limit is set"""
+        return self.seconds > 0 or self.max_nodes > 0 or self.max_memory > 0
+
+    def start(self) -> None:
+        """Starts the clock and clears what was spent, so a budget can be used again for another solve"""
+        self.deadline = time.perf_counter() + self.seconds if self.seconds > 0 else 0.0
+        self.nodes = 0
+        self.peak_memory = 0
+        self.exceeded: Optional[str] = None
+        self.best: Optional[List[List[Any]]] = None
+        self.best_unsolved = -1
+
+    def _stop(self, reason: str) -> None:
+        """Records why the budget ran out and raises BudgetExceeded"""
+        self.exceeded = reason
+        raise BudgetExceeded(reason)
+
+    def spend(self, nodes: int = 1) -> None:
+        """Charges nodes of search, raising BudgetExceeded if that passes the node limit or the deadline has gone by"""
+        self.nodes += nodes
+        if self.max_nodes and self.nodes > self.max_nodes:
+            self._stop(NODE_LIMIT)
+        if self.deadline and time.perf_counter() > self.deadline:
+            self._stop(TIMEOUT)
+
+    def check_time(self) -> None:
+        """Raises BudgetExceeded if the deadline has gone by, for work that is not search nodes"""
+        if self.deadline and time.perf_counter() > self.deadline:
+            self._stop(TIMEOUT)
+
+    def hold(self, nbytes: int) -> None:
+        """Records that the engine holds nbytes of search state, raising BudgetExceeded if that passes the memory limit"""
+        if nbytes > self.peak_memory:
+            self.peak_memory = nbytes
+        if self.max_memory and nbytes > self.max_memory:
+            self._stop(MEMORY_LIMIT)
+
+    def improves(self, unsolved: int) -> bool:
+        """Returns whether a board with this many unsolved cells is more constrained than the best one kept so far"""
+        return self.best_unsolved < 0 or unsolved < self.best_unsolved
+
+    def keep(self, board: List[List[Any]], unsolved: int) -> None:
+        """Keeps a board in the list of lists format as the most constrained one reached"""
+        self.best = board
+        self.best_unsolved = unsolved
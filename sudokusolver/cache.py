@@ -0,0 +1,228 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+A solution cache keyed by the canonical form of a puzzle.
+
+Relabelling the digits, transposing, and swapping bands, stacks, or rows and columns inside them all turn a puzzle into
+one with the same solution moved the same way. The canonical form picks one representative of all those puzzles:
+bands, rows, stacks and columns are sorted by how many clues they hold (and the clue counts they cross), every order
+left tied by that is tried, and the smallest grid after relabelling digits by first appearance wins. Since the sort
+keys do not change under the symmetries, every variant of a puzzle reaches the same representative
+"""
+
+from collections import OrderedDict
+from itertools import permutations, product
+from typing import Dict, List, Optional, Tuple
+
+from sudokusolver.units import Geometry
+
+# puzzles whose clue counts leave more orders than this tied are not cached, since canonicalizing them costs
+# more than solving them
+MAX_CANDIDATES = 2000
+
+
+class Transform:
+    """
+    A symmetry that takes a puzzle to its canonical form
+    cell (r, c) of the canonical grid comes from cell (rows[r], cols[c]) of the puzzle, transposed first if transpose is set,
+    and digit d of the puzzle becomes labels[d]
+    """
+
+    __slots__ = ('transpose', 'rows', 'cols', 'labels')
+
+    def __init__(self, transpose: bool, rows: Tuple[int, ...], cols: Tuple[int, ...], labels: Dict[int, int]) -> None:
+        self.transpose = transpose
+        self.rows = rows
+        self.cols = cols
+        self.labels = labels
+
+    def apply(self, grid: List[int], size: int) -> List[int]:
+        """Moves and relabels a flat grid into the canonical orientation. Empty cells stay 0"""
+        if self.transpose:
+            grid = [grid[c * size + r] for r in range(size) for c in range(size)]
+        labels = self.labels
+        return [labels.get(grid[r * size + c], 0) for r in self.rows for c in self.cols]
+
+    def invert(self, grid: List[int], size: int) -> List[int]:
+        """Moves and relabels a flat grid in the canonical orientation back to the puzzle's orientation"""
+        digits = {label: digit for digit, label in self.labels.items()}
+        moved = [0] * (size * size)
+        for r, row in enumerate(self.rows):
+            for c, col in enumerate(self.cols):
+                moved[row * size + col] = digits.get(grid[r * size + c], 0)
+        if self.transpose:
+            moved = [moved[c * size + r] for r in range(size) for c in range(size)]
+        return moved
+
+
+def _line_orders(grid: List[int], geometry: Geometry) -> List[Tuple[int, ...]]:
+    """
+    Returns every row order of the grid that sorts bands and the rows inside them by their clue counts
+    rows are compared by how many clues they hold and then by the clue counts of the columns those clues sit in
+    """
+    size = geometry.size
+    box = geometry.box
+    column_counts = [sum(1 for r in range(size) if grid[r * size + c]) for c in range(size)]
+    row_keys = []
+    for r in range(size):
+        crossed = sorted((column_counts[c] for c in range(size) if grid[r * size + c]), reverse=True)
+        row_keys.append((len(crossed), tuple(crossed)))
+
+    band_keys = [tuple(sorted((row_keys[band * box + k] for k in range(box)), reverse=True)) for band in range(box)]
+    band_choices = _tied_orders(list(range(box)), band_keys)
+    inside_choices = [_tied_orders([band * box + k for k in range(box)], row_keys) for band in range(box)]
+
+    orders = []
+    for bands in band_choices:
+        for insides in product(*(inside_choices[band] for band in bands)):
+            orders.append(tuple(row for inside in insides for row in inside))
+    return orders
+
+
+def _tied_orders(items: List[int], keys: List) -> List[Tuple[int, ...]]:
+    """
+    Sorts items by their keys, largest first, and returns every order that only differs between items with equal keys
+    """
+    ranked = sorted(items, key=lambda item: keys[item], reverse=True)
+    groups = []
+    for item in ranked:
+        if groups and keys[groups[-1][0]] == keys[item]:
+            groups[-1].append(item)
+        else:
+            groups.append([item])
+    return [tuple(item for group in choice for item in group) for choice in product(*(permutations(group) for group in groups))]
+
+
+def canonical_form(grid: List[int], geometry: Geometry) -> Optional[Tuple[str, Transform]]:
+    """
+    Finds the canonical form of a flat puzzle, with 0 for empty cells
+    returns the canonical puzzle as a string key and the transform that produces it,
+    or None if too many orders are tied to search them all
+    """
+    size = geometry.size
+    transposed = [grid[c * size + r] for r in range(size) for c in range(size)]
+    orientations = []
+    total = 0
+    for transpose, cells in ((False, grid), (True, transposed)):
+        rows = _line_orders(cells, geometry)
+        cols = _line_orders([cells[c * size + r] for r in range(size) for c in range(size)], geometry)
+        total += len(rows) * len(cols)
+        if total > MAX_CANDIDATES:
+            return None
+        orientations.append((transpose, cells, rows, cols))
+
+    best: Optional[List[int]] = None
+    best_transform = None
+    for transpose, cells, row_orders, col_orders in orientations:
+        for rows in row_orders:
+            for cols in col_orders:
+                labels: Dict[int, int] = {}
+                candidate = []
+                # build the relabelled grid, giving up as soon as it is known to be larger than the best so far
+                smaller = best is None
+                for r in rows:
+                    base = r * size
+                    for c in cols:
+                        digit = cells[base + c]
+                        if digit:
+                            label = labels.get(digit)
+                            if label is None:
+                                label = len(labels) + 1
+                                labels[digit] = label
+                        else:
+                            label = 0
+                        if not smaller:
+                            other = best[len(candidate)]
+                            if label > other:
+                                break
+                            if label < other:
+                                smaller = True
+                        candidate.append(label)
+                    else:
+                        continue
+                    break
+                if smaller and len(candidate) == len(cells):
+                    best = candidate
+                    best_transform = Transform(transpose, rows, cols, labels)
+
+    # digits missing from the puzzle take the labels left over, in order
+    labels = best_transform.labels
+    for digit in range(1, size + 1):
+        if digit not in labels:
+            labels[digit] = len(labels) + 1
+    return ','.join(str(label) for label in best), best_transform
+
+
+class SolutionCache:
+    """
+    Solutions keyed by canonical puzzle, in a bounded in-memory LRU with an optional sqlite file behind it
+    the file keeps solutions across restarts, and entries read from it are moved into memory
+    hits, misses and uncacheable count lookups that found a solution, found none, and puzzles too symmetric to canonicalize
+    """
+
+    def __init__(self, max_entries: int = 10000, path: str = "") -> None:
+        self.max_entries = max_entries
+        self.entries: 'OrderedDict[str, str]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.uncacheable = 0
+        self.connection = None
+        if len(path) > 0:
+            import sqlite3
+            self.connection = sqlite3.connect(path, timeout=30.0)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS solutions (puzzle TEXT PRIMARY KEY, solution TEXT NOT NULL)")
+            self.connection.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the canonical solution stored for a canonical puzzle, or None, counting the hit or miss"""
+        solution = self.entries.get(key)
+        if solution is not None:
+            self.entries.move_to_end(key)
+        elif self.connection is not None:
+            row = self.connection.execute("SELECT solution FROM solutions WHERE puzzle = ?", (key,)).fetchone()
+            if row is not None:
+                solution = row[0]
+                self._remember(key, solution)
+        if solution is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return solution
+
+    def put(self, key: str, solution: str) -> None:
+        """Stores the canonical solution of a canonical puzzle"""
+        self._remember(key, solution)
+        if self.connection is not None:
+            self.connection.execute("INSERT OR REPLACE INTO solutions (puzzle, solution) VALUES (?, ?)", (key, solution))
+            self.connection.commit()
+
+    def _remember(self, key: str, solution: str) -> None:
+        """Puts an entry in memory, evicting the least recently used ones past max_entries"""
+        self.entries[key] = solution
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def counters(self) -> Dict[str, int]:
+        """Returns the hit, miss and uncacheable counts and the number of entries in memory"""
+        return {"hits": self.hits, "misses": self.misses, "uncacheable": self.uncacheable, "entries": len(self.entries)}
+
+    def close(self) -> None:
+        """Closes the sqlite file, if there is one"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The command line interface. Subcommands and optional engines are only imported once they are asked for,
+so a plain solve starts with little more than the solver loaded
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+import argparse
+import sys
+import time
+
+from sudokusolver.bitboard import BitBoard
+from sudokusolver.budget import Budget
+from sudokusolver.solver import (BATCH_ENGINES, ENGINE_NUMPY, ENGINE_SEARCH, STANDARD_SYMBOLS, board_digits, cells_to_board,
+                                 count_solutions, solve_cached_sudoku, solve_reasonable_sudoku)
+from sudokusolver.symbols import default_symbols, format_board, parse_cells, parse_symbols
+from sudokusolver.techniques import TECHNIQUE_NAMES, parse_techniques, rate_stats
+from sudokusolver.units import geometry_for_size
+from sudokusolver.version import VERSION
+
+if TYPE_CHECKING:
+    from sudokusolver.cache import SolutionCache
+
+ESC = chr(27)
+
+ABOUT = f"""sudoku-solver-py {VERSION} is a program that solves sudoku puzzles
+ 
+    Sudokus are entered through plain text files with periods for empty spaces and optional line separators
+    Whitespace is ignored
+
+    Example:
+
+    -------------------------
+    | 8 . . | . . . | . . . |
+    | . . 3 | 6 . . | . . . |
+    | . 7 . | . 9 . | 2 . . |
+    -------------------------
+    | . 5 . | . . 7 | . . . |
+    | . . . | . 4 5 | 7 . . |
+    | . . . | 1 . . | . 3 . |
+    -------------------------
+    | . . 1 | . . . | . 6 8 |
+    | . . 8 | 5 . . | . 1 . |
+    | . 9 . | . . . | 4 . . |
+    -------------------------
+
+    Boards of any square size work the same way, such as 4x4, 16x16 or 25x25. Digits past 9 are the letters A-Z,
+    or numbers such as 10 and 16 separated by whitespace, and --symbols takes any other set of symbols
+    
+  Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+  sudoku-solver-py is free software: you can redistribute it and/or modify
+  it under the terms of the GNU General Public License as published by
+  the Free Software Foundation, either version 3 of the License, or
+  (at your option) any later version.
+
+  sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+  but WITHOUT ANY WARRANTY; without even the implied warranty of
+  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+  GNU General Public License for more details.
+
+  You should have received a copy of the GNU General Public License
+  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+"""
+
+def wipe_screen() -> None:
+    """Clears all text from the terminal"""
+    print(ESC + "[H" + ESC + "[J", end="")
+
+class LiveDisplay:
+    """
+    A progress callback that redraws the board in the terminal as it is being solved
+    redraws are dropped when they come faster than refresh_rate times a second, so drawing never dominates the solve
+    symbols are the symbols the board is drawn with, see print_board
+    """
+
+    def __init__(self, refresh_rate: float = 10.0, symbols: Optional[Sequence[str]] = None) -> None:
+        self.interval = 1.0 / refresh_rate if refresh_rate > 0 else 0.0
+        self.last_draw = -self.interval
+        self.symbols = symbols
+
+    def __call__(self, bit_board: BitBoard, status: Dict[str, Any]) -> None:
+        now = time.monotonic()
+        if now - self.last_draw < self.interval:
+            return
+        self.last_draw = now
+        wipe_screen()
+        if status["stage"] == "elimination":
+            print(f"Reroll {status['reroll']}... Guess {status['guess']}... Still solving... loop {status['loop']}... {status['changes']} changes")
+        else:
+            print(f"Searching... depth {status['depth']}... {status['nodes']} nodes")
+        print_board(bit_board.to_list_board(), self.symbols)
+
+def print_board(board: List[Any], symbols: Optional[Sequence[str]] = None) -> None:
+    """
+    prints out the given sudoku board in a pretty format
+    symbols are the symbols of the digits, see sudokusolver.symbols. None uses the default ones for the board size
+    """
+    geometry = geometry_for_size(len(board))
+    print(format_board(board_digits(board), geometry, symbols or default_symbols(geometry.size)))
+
+def write_board_to_file(board: List[List[Any]], filename: str, symbols: Optional[Sequence[str]] = None) -> None:
+    """
+    writes the given sudoku board to a file in a pretty format
+    symbols are the symbols of the digits, see sudokusolver.symbols. None uses the default ones for the board size
+    """
+    geometry = geometry_for_size(len(board))
+    with open(filename, 'a') as out_file:
+        out_file.write(format_board(board_digits(board), geometry, symbols or default_symbols(geometry.size)) + "\n\n")
+
+def format_cache_counters(cache: 'SolutionCache') -> str:
+    """Returns the cache hit and miss counts as a line of text"""
+    counters = cache.counters()
+    return f"Cache: {counters['hits']} hits, {counters['misses']} misses, {counters['uncacheable']} uncacheable"
+
+def main():
+    """
+    The main function. The entry point of this program
+    """
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        from sudokusolver.bench import bench_main
+        sys.exit(bench_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'serve':
+        from sudokusolver.server import serve_main
+        sys.exit(serve_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'generate':
+        from sudokusolver.generator import generate_main
+        sys.exit(generate_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'convert':
+        from sudokusolver.binary import convert_main
+        sys.exit(convert_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == 'client':
+        from sudokusolver.client import client_main
+        sys.exit(client_main(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(formatter_class=argparse.RawDescriptionHelpFormatter, description=ABOUT)
+    parser.add_argument('file', type=str, help='The name of the sudoku text file')
+    parser.add_argument('-b', '--batch', action='store_true', help="Read the file as one puzzle per line and write puzzle,solution,status lines")
+    parser.add_argument('-j', '--jobs', type=int, help="Number of worker processes for batch solving, 0 for one per CPU", default=1)
+    parser.add_argument('--chunk-size', type=int, help="Number of puzzles sent to a worker at once in batch solving", default=64)
+    parser.add_argument('--ordered', action='store_true', help="Keep batch results in input order when solving with several jobs")
+    display_group = parser.add_mutually_exclusive_group()
+    display_group.add_argument('-q', '--quiet', action='store_true', help="Print nothing, only write the -o file")
+    display_group.add_argument('-l', '--live', action='store_true', help="Redraw the board in the terminal while solving")
+    parser.add_argument('-r', '--refresh-rate', type=float, help="Maximum number of redraws per second with --live", default=10.0)
+    parser.add_argument('-s', '--stats', action='store_true', help="Print how much work the solve took, for a single puzzle")
+    parser.add_argument('-p', '--profile', type=str, help="Run the solve under cProfile and write the profile to this file. With --jobs only the main process is profiled", default="")
+    parser.add_argument('-t', '--timeout', type=float, help="Seconds allowed per puzzle, 0 for no limit. A puzzle that runs out stops with the most constrained board reached", default=0.0)
+    parser.add_argument('--max-nodes', type=int, help="Search nodes allowed per puzzle: branches of the search, rows tried by dlx or guesses. 0 for no limit", default=0)
+    parser.add_argument('--max-memory', type=float, metavar='MB', help="Megabytes of search state allowed per puzzle, 0 for no limit", default=0.0)
+    parser.add_argument('-T', '--techniques', type=str, default=None,
+                        help="Comma separated logical techniques to try once singles are stuck, or all or none. Defaults to all for the guess engine "
+                             "and none for the others. Techniques are " + ", ".join(TECHNIQUE_NAMES))
+    count_group = parser.add_mutually_exclusive_group()
+    count_group.add_argument('--count', type=int, metavar='LIMIT', help="Count the solutions instead of solving, stopping at LIMIT of them, 0 for no limit")
+    count_group.add_argument('-u', '--unique', action='store_true', help="Check that the puzzle has exactly one solution instead of solving. The exit status is 1 if it does not")
+    parser.add_argument('-c', '--cache', action='store_true', help="Look puzzles up in a solution cache before solving them, including relabelled, transposed or shuffled copies")
+    parser.add_argument('--cache-db', type=str, help="sqlite file that keeps the solution cache between runs, implies --cache", default="")
+    parser.add_argument('--cache-size', type=int, help="Maximum number of solutions the cache holds in memory", default=10000)
+    parser.add_argument('--size', type=int, help="Side of the board, such as 4, 9, 16 or 25. Worked out from the puzzle when not given", default=0)
+    parser.add_argument('--symbols', type=str, default="",
+                        help="Symbols of the digits in order, such as ABCDEFGHIJKLMNOP, or comma separated for symbols longer than one character. "
+                             "Defaults to 1-9 then A-Z for the size of the board")
+    parser.add_argument('-o', '--out', type=str, help="Name of optional solution file output", default="")
+    parser.add_argument('-v', '--version', action='version', version=f'%(prog)s {VERSION}', help="Show program's version number and exit.")
+    parser.add_argument('-m', '--max', type=int, help="Maximum number of guesses per roll, used by the guess engine", default=500)
+    parser.add_argument('-e', '--engine', type=str, choices=BATCH_ENGINES,
+                        help="Solving engine to use once elimination gets stuck. The numpy engine needs --batch and NumPy installed", default=ENGINE_SEARCH)
+
+    args = parser.parse_args()
+
+    if args.jobs != 1 and not args.batch:
+        parser.error("--jobs needs --batch")
+    if args.engine == ENGINE_NUMPY:
+        if not args.batch:
+            parser.error("--engine numpy needs --batch")
+        try:
+            from sudokusolver.vectorized import require_numpy
+            require_numpy()
+        except ImportError as error:
+            parser.error(str(error))
+    if args.stats and args.batch:
+        parser.error("--stats works on a single puzzle, not --batch")
+    if args.timeout < 0 or args.max_nodes < 0 or args.max_memory < 0:
+        parser.error("--timeout, --max-nodes and --max-memory need a limit of 0 or more")
+    if args.max < 1:
+        parser.error("--max needs at least 1 guess per roll")
+    budget = Budget(args.timeout, args.max_nodes, int(args.max_memory * 1024 * 1024))
+    if not budget.is_limited():
+        budget = None
+    techniques = None
+    if args.techniques is not None:
+        try:
+            techniques = parse_techniques(args.techniques)
+        except ValueError as error:
+            parser.error(str(error))
+    symbols = None
+    if len(args.symbols) > 0:
+        try:
+            symbols = parse_symbols(args.symbols)
+        except ValueError as error:
+            parser.error(str(error))
+        if args.size and args.size != len(symbols):
+            parser.error(f"--symbols gives {len(symbols)} symbols for a board of size {args.size}")
+    elif args.size and (geometry_for_size(args.size) is None or args.size < 4):
+        parser.error("--size has to be a square number of at least 4, such as 4, 9, 16 or 25")
+    if args.engine == ENGINE_NUMPY and ((symbols is not None and symbols != STANDARD_SYMBOLS) or args.size not in (0, 9)):
+        parser.error("--engine numpy only solves 9x9 boards written with the digits 1-9")
+    limit = 2 if args.unique else args.count
+    if limit is not None and args.engine == ENGINE_NUMPY:
+        parser.error("--count and --unique do not work with --engine numpy")
+    if limit is not None and limit < 0:
+        parser.error("--count needs a limit of 0 or more")
+    cache = None
+    if args.cache or len(args.cache_db) > 0:
+        if args.jobs != 1:
+            parser.error("--cache needs --jobs 1")
+        if limit is not None:
+            parser.error("--cache only applies to solving, not --count or --unique")
+        if args.engine == ENGINE_NUMPY:
+            parser.error("--cache does not work with --engine numpy")
+        from sudokusolver.cache import SolutionCache
+        cache = SolutionCache(max(args.cache_size, 1), args.cache_db)
+
+    profiler = None
+    if len(args.profile) > 0:
+        import cProfile
+        profiler = cProfile.Profile()
+
+    if args.batch:
+        from sudokusolver.batch import solve_batch, solve_batch_parallel
+        out_file = open(args.out, 'a') if len(args.out) > 0 else sys.stdout
+        if profiler is not None:
+            profiler.enable()
+        try:
+            if args.jobs == 1:
+                solve_batch(args.file, out_file, args.engine, args.timeout, cache, limit, techniques, symbols, args.size, budget, args.max)
+            else:
+                solve_batch_parallel(args.file, out_file, args.engine, args.jobs, max(args.chunk_size, 1), args.ordered, args.timeout, limit,
+                                     techniques, symbols, args.size, budget, args.max)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(args.profile)
+            if out_file is not sys.stdout:
+                out_file.close()
+            if cache is not None:
+                if not args.quiet:
+                    sys.stderr.write(format_cache_counters(cache) + "\n")
+                cache.close()
+        return
+
+    text_file = open(args.file, 'r')
+    text_in = text_file.read()
+    text_file.close()
+    cells = parse_cells(text_in, symbols, size=args.size)
+    if cells is None:
+        size = f" {args.size}x{args.size}" if args.size else f" {len(symbols)}x{len(symbols)}" if symbols is not None else ""
+        sys.stderr.write(f"sudokusolver: {args.file} does not hold a{size} board\n")
+        sys.exit(2)
+    original_sudoku_board = cells_to_board(cells[0], cells[1])
+    symbols = cells[2]
+
+    if limit is not None:
+        if profiler is not None:
+            profiler.enable()
+        count = count_solutions(original_sudoku_board, limit, budget)
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+        exceeded = budget.exceeded if budget is not None else None
+        if not args.quiet:
+            if exceeded is not None:
+                print(f"Stopped early: {exceeded}, after finding {count} solution" + ("" if count == 1 else "s"))
+                if args.unique and count < 2:
+                    print("Unique: unknown")
+                elif args.unique:
+                    print("Unique: no, it has several solutions")
+            elif args.unique:
+                print("Unique: " + ("yes" if count == 1 else "no, it has no solution" if count == 0 else "no, it has several solutions"))
+            else:
+                print(f"Solutions: {count}" + (" (stopped at the limit)" if limit and count == limit else ""))
+        if args.unique and (count != 1 or exceeded is not None):
+            sys.exit(1)
+        return
+
+    if profiler is not None:
+        profiler.enable()
+    display = LiveDisplay(args.refresh_rate, symbols) if args.live else None
+    if cache is not None:
+        [final_board, solved, stats] = solve_cached_sudoku(original_sudoku_board, cache, args.engine, display, True, techniques, budget, args.max)
+        cache.close()
+    else:
+        [final_board, solved, stats] = solve_reasonable_sudoku(original_sudoku_board, args.engine, display, True, techniques, budget, args.max)
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+
+    if not args.quiet:
+        print(f"Done... Solved: {solved}")
+        if stats.exceeded is not None:
+            print(f"Stopped early: {stats.exceeded}. This is the most constrained board reached, search guesses included")
+        elif not solved:
+            print("This puzzle is either unsolvable or infeasible to solve in reasonable time")
+        print_board(final_board, symbols)
+    if args.stats:
+        print(stats.format())
+        if stats.cached:
+            print("Difficulty: not rated for a cache hit")
+        else:
+            print(f"Difficulty: {rate_stats(stats, solved)}")
+        if cache is not None:
+            print(format_cache_counters(cache))
+    if len(args.out) > 0:
+        write_board_to_file(final_board, args.out, symbols)
+    
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+A client and load generator for `sudokusolver serve`, run as `sudokusolver client`.
+By default it sends every puzzle of a file down one connection and prints the result lines.
+With --load it keeps a number of connections busy with one request at a time each and reports throughput and latency
+"""
+
+from typing import List, Tuple
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from sudokusolver.bench import load_puzzle_set, percentile
+from sudokusolver.server import MAX_BODY
+
+# the longest response line read, enough for the JSON answer to a request of MAX_BODY bytes
+RESPONSE_LIMIT = 4 * MAX_BODY
+
+
+async def connect(host: str, port: int, unix: str) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    """Opens a connection to the server, on the Unix socket if one is given"""
+    if len(unix) > 0:
+        return await asyncio.open_unix_connection(unix, limit=RESPONSE_LIMIT)
+    return await asyncio.open_connection(host, port, limit=RESPONSE_LIMIT)
+
+
+async def solve_lines(lines: List[str], host: str, port: int, unix: str, as_json: bool = False) -> List[str]:
+    """
+    Sends one line puzzles to the server and returns its response lines in the same order
+    as_json sends them as a single JSON request and returns the JSON response as one line
+    """
+    reader, writer = await connect(host, port, unix)
+    try:
+        requests = [json.dumps({"puzzles": lines})] if as_json else lines
+
+        async def send() -> None:
+            # written alongside the reading so neither side waits on a full socket buffer
+            for request in requests:
+                writer.write(request.encode('utf-8') + b"\n")
+                await writer.drain()
+
+        sending = asyncio.ensure_future(send())
+        responses = []
+        for _ in requests:
+            line = await reader.readline()
+            if not line:
+                break
+            responses.append(line.decode('utf-8').rstrip("\n"))
+        await sending
+        return responses
+    finally:
+        writer.close()
+
+
+async def generate_load(lines: List[str], host: str, port: int, unix: str, concurrency: int, repeat: int) -> Tuple[List[float], float]:
+    """
+    Sends every puzzle repeat times over concurrency connections, each waiting for a response before sending the next request
+    returns the latency of every request in seconds and the wall time of the whole run
+    """
+    requests = [line for _ in range(repeat) for line in lines]
+    latencies: List[float] = []
+    position = [0]
+
+    async def run_connection() -> None:
+        reader, writer = await connect(host, port, unix)
+        try:
+            while position[0] < len(requests):
+                request = requests[position[0]]
+                position[0] += 1
+                start = time.perf_counter()
+                writer.write(request.encode('utf-8') + b"\n")
+                await writer.drain()
+                if not await reader.readline():
+                    return
+                latencies.append(time.perf_counter() - start)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_connection() for _ in range(concurrency)))
+    return latencies, time.perf_counter() - start
+
+
+def client_main(argv: List[str]) -> int:
+    """
+    The entry point of `sudokusolver client`
+    """
+    parser = argparse.ArgumentParser(prog='sudokusolver client', description="Sends puzzles to a running sudokusolver serve")
+    parser.add_argument('file', type=str, help="One puzzle per line file, or the name of a bundled puzzle set")
+    parser.add_argument('--host', type=str, help="Address of the server", default='127.0.0.1')
+    parser.add_argument('--port', type=int, help="TCP port of the server", default=8765)
+    parser.add_argument('-u', '--unix', type=str, help="Connect to this Unix socket instead of a TCP port", default="")
+    parser.add_argument('--json', action='store_true', help="Send the puzzles as one JSON request and print the JSON response")
+    parser.add_argument('--load', action='store_true', help="Generate load and report throughput and latency instead of printing results")
+    parser.add_argument('-C', '--concurrency', type=int, help="Number of connections kept busy with --load", default=8)
+    parser.add_argument('-n', '--repeat', type=int, help="Number of times every puzzle is sent with --load", default=1)
+    args = parser.parse_args(argv)
+
+    lines = load_puzzle_set(args.file)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        if not args.load:
+            for response in loop.run_until_complete(solve_lines(lines, args.host, args.port, args.unix, args.json)):
+                print(response)
+            return 0
+
+        latencies, seconds = loop.run_until_complete(generate_load(lines, args.host, args.port, args.unix,
+                                                                   max(args.concurrency, 1), max(args.repeat, 1)))
+    except OSError as error:
+        sys.stderr.write(f"sudokusolver client: {error}\n")
+        return 1
+    finally:
+        loop.close()
+
+    latencies.sort()
+    print(f"{len(latencies)} requests in {seconds:.2f} s, {len(latencies) / seconds if seconds > 0 else 0.0:.1f} requests/s")
+    print(f"latency ms: p50 {percentile(latencies, 0.50) * 1000:.2f}, p95 {percentile(latencies, 0.95) * 1000:.2f}, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f}, max {(latencies[-1] if latencies else 0.0) * 1000:.2f}")
+    return 0
@@ -0,0 +1,296 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Exact cover solving with Knuth's Algorithm X on Dancing Links.
+A sudoku becomes one matrix row per (cell, digit) candidate and one column per constraint:
+every cell is filled, and every row, column and square holds every digit once
+"""
+
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import sys
+
+from sudokusolver.bitboard import BitBoard
+from sudokusolver.budget import Budget
+
+# nodes between the selections offered to the deeper callback of DancingLinks.solutions
+DEEPER_EVERY = 32
+
+
+class DancingLinks:
+    """
+    A sparse 0/1 matrix stored as circular doubly linked lists in flat int arrays
+    node 0 is the root, nodes 1 to columns are the column headers and every later node is a 1 in the matrix
+    nodes, backtracks and max_depth count the rows tried, the rows that led nowhere and the deepest level of the search
+    """
+
+    __slots__ = ('left', 'right', 'up', 'down', 'column', 'size', 'row_of', 'nodes', 'backtracks', 'max_depth')
+
+    def __init__(self, columns: int) -> None:
+        headers = columns + 1
+        self.left = [i - 1 for i in range(headers)]
+        self.left[0] = columns
+        self.right = [i + 1 for i in range(headers)]
+        self.right[columns] = 0
+        self.up = list(range(headers))
+        self.down = list(range(headers))
+        self.column = list(range(headers))
+        self.size = [0] * headers
+        self.row_of = [-1] * headers
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+
+    def add_row(self, row: int, columns: List[int]) -> None:
+        """Adds a matrix row with 1s in the given columns, numbered from 1"""
+        left, right, up, down = self.left, self.right, self.up, self.down
+        first = len(left)
+        for offset, col in enumerate(columns):
+            node = first + offset
+            left.append(node - 1 if offset else first + len(columns) - 1)
+            right.append(node + 1 if offset < len(columns) - 1 else first)
+            up.append(up[col])
+            down.append(col)
+            down[up[col]] = node
+            up[col] = node
+            self.column.append(col)
+            self.row_of.append(row)
+            self.size[col] += 1
+
+    def cover(self, col: int) -> None:
+        """Removes a column and every row with a 1 in it from the matrix"""
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, col: int) -> None:
+        """Undoes cover, relinking in exactly the reverse order"""
+        left, right, up, down, column, size = self.left, self.right, self.up, self.down, self.column, self.size
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def smallest_column(self) -> int:
+        """Returns the uncovered column with the fewest 1s left, or 0 if every column is covered"""
+        right, size = self.right, self.size
+        best = 0
+        best_size = -1
+        col = right[0]
+        while col:
+            if best_size < 0 or size[col] < best_size:
+                best = col
+                best_size = size[col]
+                if best_size <= 1:
+                    break
+            col = right[col]
+        return best
+
+    def memory(self) -> int:
+        """Returns the bytes taken by the arrays of the matrix"""
+        return sum(sys.getsizeof(array) for array in (self.left, self.right, self.up, self.down, self.column, self.size, self.row_of))
+
+    def solutions(self, budget: Optional[Budget] = None, deeper: Optional[Callable[[List[int]], bool]] = None) -> Iterator[List[int]]:
+        """
+        Yields every exact cover as a list of row numbers
+        the search keeps its own stack so deep boards do not hit the recursion limit
+        budget, when given, is charged a node per row tried, see sudokusolver.budget
+        deeper, when given, is called with the rows selected when more of them are selected than in any selection it
+        accepted before, while every constraint left can still be met. It returns whether it accepted them, and since
+        checking a selection costs far more than a node it is only offered one every DEEPER_EVERY nodes
+        """
+        right, left, down, column = self.right, self.left, self.down, self.column
+        if not right[0]:
+            yield []
+            return
+
+        col = self.smallest_column()
+        self.cover(col)
+        # each entry is [covered column, row node being tried in it]
+        stack = [[col, down[col]]]
+        deepest = 0
+        while stack:
+            frame = stack[-1]
+            col, node = frame
+            if node == col:
+                # every row in this column was tried, back up a level
+                self.uncover(col)
+                stack.pop()
+                if stack:
+                    parent = stack[-1]
+                    self.backtracks += 1
+                    self._deselect(parent[1])
+                    parent[1] = down[parent[1]]
+                continue
+
+            self.nodes += 1
+            if budget is not None:
+                budget.spend()
+            if len(stack) > self.max_depth:
+                self.max_depth = len(stack)
+            j = right[node]
+            while j != node:
+                self.cover(column[j])
+                j = right[j]
+
+            if not right[0]:
+                yield [self.row_of[entry[1]] for entry in stack]
+                self._deselect(node)
+                frame[1] = down[node]
+                continue
+
+            next_col = self.smallest_column()
+            if down[next_col] == next_col:
+                self.backtracks += 1
+                self._deselect(node)
+                frame[1] = down[node]
+                continue
+            if (deeper is not None and not self.nodes % DEEPER_EVERY and len(stack) > deepest
+                    and deeper([self.row_of[entry[1]] for entry in stack])):
+                deepest = len(stack)
+            self.cover(next_col)
+            stack.append([next_col, down[next_col]])
+
+    def _deselect(self, node: int) -> None:
+        """Uncovers the other columns of a selected row, in reverse order"""
+        left, column = self.left, self.column
+        j = left[node]
+        while j != node:
+            self.uncover(column[j])
+            j = left[j]
+
+
+def build_matrix(bit_board: BitBoard) -> Tuple[DancingLinks, List[Tuple[int, int]]]:
+    """
+    Builds the exact cover matrix for the unsolved part of a board
+    constraints already met by placed digits and candidates already ruled out are left out
+    returns the matrix and the (cell, digit) placement behind each matrix row
+    """
+    geometry = bit_board.geometry
+    size = geometry.size
+    columns: Dict[Tuple[int, int, int], int] = {}
+
+    def column_id(key: Tuple[int, int, int]) -> int:
+        col = columns.get(key)
+        if col is None:
+            col = len(columns) + 1
+            columns[key] = col
+        return col
+
+    rows = []
+    row_columns = []
+    for cell in range(geometry.cells):
+        if bit_board.values[cell]:
+            continue
+        row = geometry.row_of[cell]
+        col = geometry.col_of[cell]
+        box = geometry.box_of[cell]
+        mask = bit_board.cands[cell]
+        cell_col = column_id((0, cell, 0))
+        for digit in range(1, size + 1):
+            if mask & (1 << (digit - 1)):
+                rows.append((cell, digit))
+                row_columns.append([
+                    cell_col,
+                    column_id((1, row, digit)),
+                    column_id((2, col, digit)),
+                    column_id((3, box, digit)),
+                ])
+
+    # a constraint nobody can meet makes the board unsolvable, so give it an empty column
+    for i in range(size):
+        for digit in range(1, size + 1):
+            bit = 1 << (digit - 1)
+            if not bit_board.rows[i] & bit:
+                column_id((1, i, digit))
+            if not bit_board.cols[i] & bit:
+                column_id((2, i, digit))
+            if not bit_board.boxes[i] & bit:
+                column_id((3, i, digit))
+
+    matrix = DancingLinks(len(columns))
+    for row, cols in enumerate(row_columns):
+        matrix.add_row(row, cols)
+    return matrix, rows
+
+
+def exact_cover_solutions(bit_board: BitBoard, budget: Optional[Budget] = None) -> Iterator[BitBoard]:
+    """
+    Yields a solved copy of the board for every solution
+    the rows tried and abandoned are added to the board's stats once the caller stops asking for solutions
+    budget, when given, is charged the matrix as memory and a node per row tried, and keeps the board with the most rows
+    placed that elimination finds no contradiction in
+    """
+    matrix, rows = build_matrix(bit_board)
+
+    def deeper(selected: List[int]) -> bool:
+        partial = bit_board.copy()
+        partial.stats = None
+        for row in selected:
+            cell, digit = rows[row]
+            if not partial.place(cell, digit, 'search'):
+                return False
+        if not partial.propagate():
+            return False
+        if budget.improves(partial.unsolved):
+            budget.keep(partial.to_list_board(), partial.unsolved)
+        return True
+
+    try:
+        if budget is not None:
+            budget.hold(matrix.memory())
+        for solution in matrix.solutions(budget, deeper if budget is not None else None):
+            solved = bit_board.copy()
+            for row in solution:
+                cell, digit = rows[row]
+                solved.values[cell] = digit
+                solved.cands[cell] = 1 << (digit - 1)
+            solved.unsolved = 0
+            for cell in range(solved.geometry.cells):
+                bit = solved.cands[cell]
+                solved.rows[solved.geometry.row_of[cell]] |= bit
+                solved.cols[solved.geometry.col_of[cell]] |= bit
+                solved.boxes[solved.geometry.box_of[cell]] |= bit
+            yield solved
+    finally:
+        stats = bit_board.stats
+        if stats is not None:
+            stats.guesses += matrix.nodes
+            stats.backtracks += matrix.backtracks
+            stats.max_depth = max(stats.max_depth, matrix.max_depth)
+
+
+def solve_exact_cover(bit_board: BitBoard, budget: Optional[Budget] = None) -> Optional[BitBoard]:
+    """Returns a solved copy of the board, or None if it has no solution. budget works as in exact_cover_solutions"""
+    for solved in exact_cover_solutions(bit_board, budget):
+        return solved
+    return None
@@ -0,0 +1,252 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The puzzle generator behind `sudokusolver generate`.
+A full grid comes from the depth first search with its candidates tried in random order, then clues are taken away
+one at a time in random order, putting back any whose removal would make the puzzle harder than asked for, which
+for every difficulty but extreme also keeps it unique. Each removal starts from a puzzle known to have one solution,
+so it only has to be shown that the techniques put the removed clue back: they only remove candidates that cannot be
+right, so every solution of the smaller puzzle then has that clue too. The techniques stop as soon as they do, rather
+than going on to solve the whole puzzle. For extreme puzzles, removing clue d from cell c keeps the
+puzzle unique exactly when no solution has something other than d in c, so each removal costs one search for such
+a solution rather than a full count
+"""
+
+from collections import deque
+from typing import List, Optional, Tuple
+import argparse
+import os
+import random
+import sys
+
+from sudokusolver.bitboard import BitBoard
+from sudokusolver.search import search
+from sudokusolver.symbols import default_symbols, format_cells
+from sudokusolver.techniques import DIFFICULTIES, apply_next, naked_singles, rate_board, techniques_up_to
+from sudokusolver.units import Geometry, STANDARD, geometry_for_size
+from sudokusolver.validate import UnitTracker
+
+# puzzles generated by one task of a worker process
+GENERATE_BATCH = 8
+
+
+def board_from_clues(puzzle: List[int], geometry: Geometry = STANDARD) -> Optional[BitBoard]:
+    """
+    Builds a bitmask board from a flat list of clues, with 0 for empty cells
+    returns None if the clues contradict each other
+    """
+    bit_board = BitBoard(geometry)
+    for cell, digit in enumerate(puzzle):
+        if digit and not bit_board.place(cell, digit):
+            return None
+    return bit_board
+
+
+def random_grid(rng: random.Random, geometry: Geometry = STANDARD) -> List[int]:
+    """Returns a random full grid as a flat list of digits"""
+    bit_board = BitBoard(geometry)
+    search(bit_board, rng=rng)
+    return list(bit_board.values)
+
+
+def settles_cell(bit_board: Optional[BitBoard], cell: int, digit: int, difficulty: str) -> bool:
+    """
+    Returns whether the techniques of the given difficulty leave only digit in cell, see sudokusolver.techniques
+    for a board of clues from a unique puzzle with that clue taken out, this is whether the clue can be taken out
+    stops as soon as the cell is settled, and returns False for a board that is None or contradictory. Changes the board
+    """
+    if bit_board is None or not naked_singles(bit_board):
+        return False
+    bit = 1 << (digit - 1)
+    cands = bit_board.cands
+    if cands[cell] == bit:
+        return True
+    if difficulty == DIFFICULTIES[0]:
+        return False
+    enabled = techniques_up_to(difficulty)
+    while cands[cell] != bit:
+        changed = bit_board.eliminate_pass()
+        if changed == 0:
+            changed = apply_next(bit_board, enabled)
+            if changed == 0:
+                return False
+        if changed < 0:
+            return False
+    return True
+
+
+def rate_difficulty(puzzle: List[int], geometry: Geometry = STANDARD) -> Optional[str]:
+    """
+    Rates a puzzle by the techniques needed to solve it, see sudokusolver.techniques
+    returns None if the puzzle has no solution
+    """
+    bit_board = board_from_clues(puzzle, geometry)
+    if bit_board is None:
+        return None
+    rating = rate_board(bit_board)
+    if rating == DIFFICULTIES[-1] and search(bit_board) is None:
+        return None
+    return rating
+
+
+def has_other_solution(puzzle: List[int], cell: int, digit: int, geometry: Geometry = STANDARD) -> bool:
+    """
+    Returns whether the puzzle has a solution with something other than digit in cell
+    for a puzzle made unique with digit in cell, this is whether emptying that cell allows a second solution
+    """
+    bit_board = board_from_clues(puzzle, geometry)
+    if bit_board is None:
+        return False
+    bit_board.cands[cell] &= ~(1 << (digit - 1))
+    if not bit_board.cands[cell]:
+        return False
+    return search(bit_board) is not None
+
+
+def remove_clues(puzzle: List[int], order: List[int], difficulty: str, geometry: Geometry = STANDARD) -> int:
+    """
+    Empties the cells of the puzzle in the given order, putting back every clue whose removal leaves a puzzle
+    that the techniques of the given difficulty do not solve, or for extreme puzzles one with a second solution
+    returns the number of clues removed
+    """
+    removed = 0
+    # the clues left, with the digits of every unit to hand for the naked single shortcut below
+    clues = UnitTracker.from_grid(puzzle, geometry)
+    for cell in order:
+        digit = puzzle[cell]
+        if not digit:
+            continue
+        puzzle[cell] = 0
+        clues.remove(cell)
+        if clues.seen(cell) == geometry.all_digits ^ (1 << (digit - 1)):
+            # the clues around the cell leave only its digit, so naked singles put it straight back
+            removed += 1
+            continue
+        if difficulty != DIFFICULTIES[-1]:
+            # a puzzle that logic solves is unique, so the difficulty check covers uniqueness too
+            keep = not settles_cell(board_from_clues(puzzle, geometry), cell, digit, difficulty)
+        else:
+            keep = has_other_solution(puzzle, cell, digit, geometry)
+        if keep:
+            puzzle[cell] = digit
+            clues.place(cell, digit)
+        else:
+            removed += 1
+    return removed
+
+
+def difficulties_for(geometry: Geometry) -> List[str]:
+    """
+    Returns the difficulties puzzles can be generated at on boards of the given geometry
+    naked singles solve every 4x4 puzzle the clue removal leaves, so those boards only have easy ones
+    """
+    return DIFFICULTIES[:1] if geometry.box == 2 else DIFFICULTIES
+
+
+def generate_puzzle(rng: random.Random, difficulty: str = 'medium', geometry: Geometry = STANDARD) -> Tuple[List[int], List[int]]:
+    """
+    Generates a puzzle with exactly one solution and the given difficulty
+    grids whose puzzle comes out easier than asked for are thrown away, which makes expert puzzles, needing fish or
+    triples, by far the slowest to generate
+    returns the puzzle and its solution as flat lists, with 0 for empty cells
+    raises ValueError for a difficulty the board size does not have, see difficulties_for
+    """
+    if difficulty not in difficulties_for(geometry):
+        raise ValueError(f"{geometry.size}x{geometry.size} boards have no {difficulty} puzzles, use "
+                         + " or ".join(difficulties_for(geometry)))
+    while True:
+        solution = random_grid(rng, geometry)
+        puzzle = list(solution)
+        order = list(range(geometry.cells))
+        rng.shuffle(order)
+        remove_clues(puzzle, order, difficulty, geometry)
+        if rate_difficulty(puzzle, geometry) == difficulty:
+            return puzzle, solution
+
+
+def format_grid(grid: List[int], geometry: Geometry = STANDARD) -> str:
+    """Formats a flat list of digits in the one line format, with periods for empty cells, see sudokusolver.symbols"""
+    return format_cells(grid, default_symbols(geometry.size))
+
+
+def generate_lines(count: int, difficulty: str, seed: Optional[str] = None, with_solution: bool = False, size: int = 9) -> List[str]:
+    """
+    Generates count puzzles of the given size in the one line format, seeded with seed when it is given
+    with_solution makes each line puzzle,solution,difficulty
+    """
+    geometry = geometry_for_size(size)
+    rng = random.Random(seed) if seed is not None else random.Random()
+    lines = []
+    for _ in range(count):
+        puzzle, solution = generate_puzzle(rng, difficulty, geometry)
+        if with_solution:
+            lines.append(f"{format_grid(puzzle, geometry)},{format_grid(solution, geometry)},{difficulty}")
+        else:
+            lines.append(format_grid(puzzle, geometry))
+    return lines
+
+
+def generate_main(argv: List[str]) -> int:
+    """
+    The entry point of `sudokusolver generate`
+    """
+    parser = argparse.ArgumentParser(prog='sudokusolver generate', description="Generates puzzles with exactly one solution, one per line")
+    parser.add_argument('-n', '--count', type=int, help="Number of puzzles to generate", default=1)
+    parser.add_argument('-d', '--difficulty', type=str, choices=DIFFICULTIES, help="Difficulty of the puzzles", default='medium')
+    parser.add_argument('-s', '--size', type=int, help="Side of the board, such as 4, 9, 16 or 25", default=9)
+    parser.add_argument('-j', '--jobs', type=int, help="Number of worker processes, 0 for one per CPU", default=1)
+    parser.add_argument('--seed', type=str, help="Seed for reproducible output", default=None)
+    parser.add_argument('--with-solution', action='store_true', help="Write puzzle,solution,difficulty lines")
+    parser.add_argument('-o', '--out', type=str, help="Name of the file the puzzles are appended to, standard output if not given", default="")
+    args = parser.parse_args(argv)
+    if args.size < 4 or geometry_for_size(args.size) is None:
+        parser.error("--size has to be a square number of at least 4, such as 4, 9, 16 or 25")
+    if args.difficulty not in difficulties_for(geometry_for_size(args.size)):
+        parser.error(f"{args.size}x{args.size} boards only have " + " or ".join(difficulties_for(geometry_for_size(args.size))) + " puzzles")
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    tasks = [min(GENERATE_BATCH, args.count - start) for start in range(0, max(args.count, 0), GENERATE_BATCH)]
+    seeds = [f"{args.seed}:{number}" if args.seed is not None else None for number in range(len(tasks))]
+    out_file = open(args.out, 'a') if len(args.out) > 0 else sys.stdout
+    try:
+        if jobs == 1:
+            for count, seed in zip(tasks, seeds):
+                for line in generate_lines(count, args.difficulty, seed, args.with_solution, args.size):
+                    out_file.write(line + "\n")
+                out_file.flush()
+            return 0
+
+        # tasks are written in order, with a few per worker in flight so the output streams
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            running = deque()
+            pending = iter(zip(tasks, seeds))
+            for count, seed in pending:
+                running.append(executor.submit(generate_lines, count, args.difficulty, seed, args.with_solution, args.size))
+                if len(running) >= jobs * 2:
+                    break
+            while running:
+                lines = running.popleft().result()
+                out_file.write("".join(line + "\n" for line in lines))
+                out_file.flush()
+                for count, seed in pending:
+                    running.append(executor.submit(generate_lines, count, args.difficulty, seed, args.with_solution, args.size))
+                    break
+    finally:
+        if out_file is not sys.stdout:
+            out_file.close()
+    return 0
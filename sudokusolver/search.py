@@ -0,0 +1,149 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Deterministic depth first search over a bitmask board. It always branches on the cell with
+the fewest candidates left and runs elimination after every placement.
+The same search can go on past the first solution to count them
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, Optional
+import sys
+
+from sudokusolver.bitboard import BitBoard
+from sudokusolver.budget import Budget, BudgetExceeded
+
+if TYPE_CHECKING:
+    import random
+
+
+def pick_cell(bit_board: BitBoard) -> int:
+    """
+    Returns the unsolved cell with the fewest candidates, or -1 if every cell is solved
+    ties go to the lowest cell number so the search order is deterministic
+    """
+    geometry = bit_board.geometry
+    popcount = geometry.popcount
+    cands = bit_board.cands
+    values = bit_board.values
+    best = -1
+    best_count = geometry.size + 1
+    for cell in range(geometry.cells):
+        if not values[cell]:
+            mask = cands[cell]
+            count = popcount[mask] if popcount is not None else bin(mask).count('1')
+            if count < best_count:
+                best = cell
+                best_count = count
+                if count <= 2:
+                    break
+    return best
+
+
+def snapshot_bytes(bit_board: BitBoard) -> int:
+    """Returns the bytes one snapshot of the board takes, the lists themselves since their ints are shared with the board"""
+    state = bit_board.save()
+    return sys.getsizeof(state) + sum(sys.getsizeof(part) for part in state)
+
+
+def solutions(bit_board: BitBoard, progress: Optional[Callable[[BitBoard, Dict[str, Any]], None]] = None,
+              rng: Optional['random.Random'] = None, budget: Optional[Budget] = None) -> Iterator[BitBoard]:
+    """
+    Yields every solution of the board with depth first search, working on the board in place
+    each level of the search keeps a snapshot of the board so backing out of a wrong branch is a list copy
+    the board yielded is the solved board itself, so copy it before asking for the next solution if it is needed later
+    progress is called with the board and a status dict after every branch that survives elimination
+    branches, failed branches and the deepest level reached are counted in the board's stats when it has them
+    candidates are tried lowest first, or in a random order drawn from rng when it is given
+    budget, when given, is charged a node per branch and the snapshots on the stack as memory, and keeps the board
+    with the fewest unsolved cells. It raises BudgetExceeded out of the search once it runs out, see sudokusolver.budget
+    """
+    if not bit_board.propagate():
+        return
+
+    frame_bytes = snapshot_bytes(bit_board) if budget is not None else 0
+    # each entry is [snapshot before the branch, branching cell, candidates not tried yet]
+    stack = []
+    nodes = 0
+    stats = bit_board.stats
+    while True:
+        if bit_board.is_solved():
+            yield bit_board
+        else:
+            cell = pick_cell(bit_board)
+            stack.append([bit_board.save(), cell, bit_board.cands[cell]])
+            if budget is not None:
+                budget.hold(len(stack) * frame_bytes)
+
+        while stack:
+            frame = stack[-1]
+            untried = frame[2]
+            if not untried:
+                stack.pop()
+                continue
+            if rng is None:
+                bit = untried & -untried
+            else:
+                bit = 1 << rng.choice([digit for digit in range(untried.bit_length()) if untried >> digit & 1])
+            frame[2] = untried ^ bit
+            bit_board.restore(frame[0])
+            nodes += 1
+            if budget is not None:
+                budget.spend()
+            if bit_board.place(frame[1], bit.bit_length(), 'search') and bit_board.propagate():
+                if budget is not None and budget.improves(bit_board.unsolved):
+                    budget.keep(bit_board.to_list_board(), bit_board.unsolved)
+                if progress is not None:
+                    progress(bit_board, {"stage": "search", "depth": len(stack), "nodes": nodes})
+                if stats is not None:
+                    stats.guesses += 1
+                    stats.max_depth = max(stats.max_depth, len(stack))
+                break
+            if stats is not None:
+                stats.guesses += 1
+                stats.backtracks += 1
+        else:
+            return
+
+
+def search(bit_board: BitBoard, progress: Optional[Callable[[BitBoard, Dict[str, Any]], None]] = None,
+           rng: Optional['random.Random'] = None, budget: Optional[Budget] = None) -> Optional[BitBoard]:
+    """
+    Solves the board in place with depth first search, stopping at the first solution
+    progress, stats, rng and budget work as in solutions
+    returns the solved board, or None if the puzzle has no solution
+    """
+    for solved in solutions(bit_board, progress, rng, budget):
+        return solved
+    return None
+
+
+def count_solutions(bit_board: BitBoard, limit: int = 2, budget: Optional[Budget] = None) -> int:
+    """
+    Counts the solutions of the board, stopping once limit of them are found, or never if limit is 0
+    with the default limit of 2 the answer tells a puzzle with one solution from one with several
+    the board is left in whatever state the search stopped in
+    when the budget runs out the solutions found so far are returned, with budget.exceeded saying why
+    """
+    count = 0
+    try:
+        for _ in solutions(bit_board, budget=budget):
+            count += 1
+            if count == limit:
+                break
+    except BudgetExceeded:
+        pass
+    return count
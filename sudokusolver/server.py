@@ -0,0 +1,365 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The solver service behind `sudokusolver serve`. An asyncio front end listens on a TCP port or a Unix socket and
+hands the solving to a pool of worker processes that stay warm between requests.
+
+A connection sends one request per line and gets one response line back for each, in order:
+a one line puzzle gets a puzzle,solution,status line, and a JSON object holding "puzzle" or "puzzles"
+(with optional "engine", "timeout" and "max_nodes") gets a JSON object back. A connection that starts with an HTTP request line
+is answered as HTTP instead: POST a JSON object or one line puzzles to /solve, or GET /health
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+
+from sudokusolver.budget import Budget
+
+# the requests read ahead on one connection before waiting for their responses to be written
+PIPELINE_DEPTH = 64
+
+# the largest HTTP body or request line accepted, in bytes
+MAX_BODY = 16 * 1024 * 1024
+
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+def _running_loop() -> asyncio.AbstractEventLoop:
+    """Returns the loop running the current coroutine, with get_running_loop where it exists, which is Python 3.7 on"""
+    get_running_loop = getattr(asyncio, 'get_running_loop', None)
+    return get_running_loop() if get_running_loop is not None else asyncio.get_event_loop()
+
+
+async def read_request_line(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """
+    Reads one line from a stream opened with a limit of MAX_BODY, returning b'' once the stream is done
+    returns None for a line longer than the limit, after skipping the rest of it so the next line can be read
+    """
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+    except asyncio.LimitOverrunError as error:
+        consumed = error.consumed
+    while True:
+        # the bytes the overrun counted are left in the buffer, and hold no newline
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return None
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+
+async def _answered(response: str) -> str:
+    """Returns a response worked out without solving anything, for the queue of responses waiting to be written"""
+    return response
+
+
+def _warm_up() -> int:
+    """Runs in each worker when the pool starts so the processes exist before the first request"""
+    return os.getpid()
+
+
+def parse_result_line(result: str) -> Dict[str, str]:
+    """Splits a puzzle,solution,status result line into a dict"""
+    [puzzle, solution, status] = result.rsplit(',', 2)
+    return {"puzzle": puzzle, "solution": solution, "status": status}
+
+
+class SolverServer:
+    """
+    Serves solve requests from a warm pool of worker processes
+    engines are the engines requests may ask for. The workers solve with sudokusolver.batch, which is only imported when
+    a chunk is sent, so the front end stays free of the solving code
+    at most max_pending chunks are handed to the pool at once, requests beyond that wait, and since a connection only
+    reads PIPELINE_DEPTH requests ahead, clients that send faster than the pool solves are slowed down by TCP itself
+    timeout is the default number of seconds a request may take and max_nodes the search nodes each puzzle may take, 0 for no limit
+    puzzles that run out of either are answered with the most constrained board the worker reached, see sudokusolver.budget
+    """
+
+    def __init__(self, engines: List[str], engine: str, jobs: int = 0, timeout: float = 0.0,
+                 chunk_size: int = 64, max_pending: int = 0, max_guesses: int = 500, max_nodes: int = 0) -> None:
+        self.engines = engines
+        self.engine = engine
+        self.jobs = jobs if jobs > 0 else (os.cpu_count() or 1)
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending if max_pending > 0 else self.jobs * 4
+        self.max_guesses = max_guesses
+        self.max_nodes = max_nodes
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.pending: Optional[asyncio.Semaphore] = None
+        self.counters = {"requests": 0, "puzzles": 0, "timeouts": 0, "errors": 0}
+
+    async def start_pool(self) -> None:
+        """Starts the worker processes and waits until every one of them has run something"""
+        loop = _running_loop()
+        self.pending = asyncio.Semaphore(self.max_pending)
+        self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _warm_up) for _ in range(self.jobs)))
+
+    def close(self) -> None:
+        """Shuts the worker pool down"""
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    async def solve(self, lines: List[str], engine: str, timeout: float, max_nodes: int = 0) -> List[str]:
+        """
+        Solves one line puzzles on the pool, chunk_size at a time
+        returns a result line for each in the format puzzle,solution,status
+        the workers stop each puzzle after timeout seconds or max_nodes search nodes, and a chunk still running well after
+        its puzzles should have stopped gets a timeout status for all of them
+        """
+        self.counters["puzzles"] += len(lines)
+        chunks = [lines[i:i + self.chunk_size] for i in range(0, len(lines), self.chunk_size)]
+        budget = Budget(nodes=max_nodes) if max_nodes > 0 else None
+        results = await asyncio.gather(*(self._solve_chunk(chunk, engine, timeout, budget) for chunk in chunks))
+        return [line for chunk in results for line in chunk]
+
+    async def _solve_chunk(self, lines: List[str], engine: str, timeout: float, budget: Optional[Budget] = None) -> List[str]:
+        """
+        Runs one chunk on the pool once a pending slot is free
+        the slot is held until the worker is done with the chunk, even when the wait for it gives up first,
+        so chunks the backstop timed out still count against max_pending
+        """
+        from sudokusolver.batch import _solve_chunk
+        loop = _running_loop()
+        await self.pending.acquire()
+        executor = self.executor
+        try:
+            future = loop.run_in_executor(executor, _solve_chunk, lines, engine, timeout, self.max_guesses, None, None, None, 0, budget)
+        except BaseException:
+            self.pending.release()
+            raise
+        future.add_done_callback(self._chunk_done)
+        try:
+            # shielded, so giving up on the wait does not cancel the future and free the slot early
+            if timeout > 0:
+                # the workers time each puzzle themselves, this catches a chunk that is slow as a whole
+                return await asyncio.wait_for(asyncio.shield(future), timeout * len(lines) + 1.0)
+            return await asyncio.shield(future)
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += len(lines)
+            return [f"{line},,timeout" for line in lines]
+        except BrokenProcessPool:
+            self.counters["errors"] += len(lines)
+            if self.executor is executor:
+                executor.shutdown(wait=False)
+                self.executor = ProcessPoolExecutor(max_workers=self.jobs)
+            return [f"{line},,error" for line in lines]
+
+    def _chunk_done(self, future: 'asyncio.Future') -> None:
+        """Gives the pending slot of a chunk back once its worker is done with it"""
+        self.pending.release()
+        if not future.cancelled():
+            # retrieved so a chunk nobody waited for any more does not log an unretrieved exception
+            future.exception()
+
+    async def respond(self, text: str) -> str:
+        """Answers one request line, which is either a one line puzzle or a JSON object"""
+        self.counters["requests"] += 1
+        if not text.startswith('{'):
+            return (await self.solve([text], self.engine, self.timeout, self.max_nodes))[0]
+        return json.dumps(await self.respond_json(text))
+
+    async def respond_json(self, text: str) -> Dict[str, Any]:
+        """
+        Answers a JSON request holding "puzzle" or a "puzzles" list, and optionally "engine", "timeout" and "max_nodes"
+        a single puzzle gets its result back as an object, a list gets {"results": [...]} and a bad request gets {"error": ...}
+        """
+        try:
+            request = json.loads(text)
+        except ValueError as error:
+            return {"error": f"invalid JSON: {error}"}
+        if not isinstance(request, dict):
+            return {"error": "the request must be a JSON object"}
+        engine = request.get("engine", self.engine)
+        if engine not in self.engines:
+            return {"error": f"unknown engine {engine}, use one of {', '.join(self.engines)}"}
+        timeout = request.get("timeout", self.timeout)
+        if not isinstance(timeout, (int, float)) or isinstance(timeout, bool) or timeout < 0:
+            return {"error": "timeout must be a number of seconds"}
+        if self.timeout > 0:
+            timeout = min(timeout, self.timeout) if timeout > 0 else self.timeout
+        max_nodes = request.get("max_nodes", self.max_nodes)
+        if not isinstance(max_nodes, int) or isinstance(max_nodes, bool) or max_nodes < 0:
+            return {"error": "max_nodes must be a whole number of search nodes"}
+        if self.max_nodes > 0:
+            max_nodes = min(max_nodes, self.max_nodes) if max_nodes > 0 else self.max_nodes
+
+        if isinstance(request.get("puzzle"), str):
+            return parse_result_line((await self.solve([request["puzzle"]], engine, timeout, max_nodes))[0])
+        puzzles = request.get("puzzles")
+        if isinstance(puzzles, list) and all(isinstance(puzzle, str) for puzzle in puzzles):
+            return {"results": [parse_result_line(result) for result in await self.solve(puzzles, engine, timeout, max_nodes)]}
+        return {"error": "the request needs a \"puzzle\" string or a \"puzzles\" list of strings"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serves one connection until the client closes it"""
+        try:
+            first = await read_request_line(reader)
+            text = first.decode('utf-8', 'replace').strip() if first is not None else ""
+            if text.startswith(('GET ', 'POST ', 'PUT ', 'DELETE ', 'HEAD ')):
+                await self.handle_http(text, reader, writer)
+                return
+
+            # requests are answered concurrently but written back in the order they came in
+            responses: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_DEPTH)
+
+            async def write_responses() -> None:
+                while True:
+                    response = await responses.get()
+                    if response is None:
+                        return
+                    writer.write((await response).encode('utf-8') + b"\n")
+                    await writer.drain()
+
+            writing = asyncio.ensure_future(write_responses())
+            too_long = json.dumps({"error": f"request line longer than {MAX_BODY} bytes"})
+            line = first
+            while line != b'':
+                if writing.done():
+                    break
+                if line is None:
+                    self.counters["errors"] += 1
+                    await responses.put(asyncio.ensure_future(_answered(too_long)))
+                else:
+                    text = line.decode('utf-8', 'replace').strip()
+                    if text:
+                        await responses.put(asyncio.ensure_future(self.respond(text)))
+                line = await read_request_line(reader)
+            await responses.put(None)
+            await writing
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_http(self, request_line: str, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers a single HTTP/1.x request and closes the connection"""
+        headers = {}
+        headers_fit = True
+        while True:
+            raw = await read_request_line(reader)
+            if raw is None:
+                headers_fit = False
+                continue
+            line = raw.decode('latin-1').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        parts = request_line.split()
+        method = parts[0]
+        path = parts[1] if len(parts) > 1 else '/'
+        if not headers_fit:
+            status, body, content_type = 400, json.dumps({"error": f"header line longer than {MAX_BODY} bytes"}), 'application/json'
+        elif path == '/health':
+            status, body, content_type = 200, json.dumps({"status": "ok", "workers": self.jobs, **self.counters}), 'application/json'
+        elif path != '/solve':
+            status, body, content_type = 404, json.dumps({"error": "not found"}), 'application/json'
+        elif method != 'POST':
+            status, body, content_type = 405, json.dumps({"error": "use POST"}), 'application/json'
+        else:
+            try:
+                length = int(headers.get('content-length', '0') or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                status, body, content_type = 400, json.dumps({"error": "Content-Length must be a number of bytes"}), 'application/json'
+            elif length > MAX_BODY:
+                status, body, content_type = 413, json.dumps({"error": "request too large"}), 'application/json'
+            else:
+                text = (await reader.readexactly(length)).decode('utf-8', 'replace').strip()
+                self.counters["requests"] += 1
+                if text.startswith('{'):
+                    response = await self.respond_json(text)
+                    status = 400 if "error" in response else 200
+                    body, content_type = json.dumps(response), 'application/json'
+                else:
+                    lines = [line.strip() for line in text.splitlines() if line.strip()]
+                    status, content_type = 200, 'text/plain'
+                    body = "".join(result + "\n" for result in await self.solve(lines, self.engine, self.timeout, self.max_nodes))
+
+        payload = body.encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {HTTP_REASONS[status]}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode('latin-1') + payload)
+        await writer.drain()
+
+
+def serve_main(argv: List[str]) -> int:
+    """
+    The entry point of `sudokusolver serve`
+    """
+    from sudokusolver.solver import ENGINE_SEARCH, available_engines
+    engines = available_engines()
+    parser = argparse.ArgumentParser(prog='sudokusolver serve', description="Serves solve requests from a pool of warm worker processes")
+    parser.add_argument('--host', type=str, help="Address to listen on", default='127.0.0.1')
+    parser.add_argument('--port', type=int, help="TCP port to listen on", default=8765)
+    parser.add_argument('-u', '--unix', type=str, help="Listen on this Unix socket instead of a TCP port", default="")
+    parser.add_argument('-j', '--jobs', type=int, help="Number of worker processes, 0 for one per CPU", default=0)
+    parser.add_argument('-e', '--engine', type=str, choices=engines, help="Default solving engine", default=ENGINE_SEARCH)
+    parser.add_argument('-t', '--timeout', type=float, help="Seconds allowed per puzzle, 0 for no limit. Requests may ask for less", default=10.0)
+    parser.add_argument('--chunk-size', type=int, help="Number of puzzles of a batch sent to a worker at once", default=64)
+    parser.add_argument('--max-pending', type=int, help="Number of chunks handed to the workers at once, 0 for four per worker", default=0)
+    parser.add_argument('--max-nodes', type=int, help="Search nodes allowed per puzzle, 0 for no limit. Requests may ask for less", default=0)
+    parser.add_argument('-m', '--max', type=int, help="Maximum number of guesses per roll, used by the guess engine", default=500)
+    args = parser.parse_args(argv)
+    if args.max_nodes < 0:
+        parser.error("--max-nodes needs a limit of 0 or more")
+
+    server = SolverServer(engines, args.engine, args.jobs, args.timeout, max(args.chunk_size, 1), args.max_pending, args.max,
+                          args.max_nodes)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(server.start_pool())
+    if len(args.unix) > 0:
+        listener = loop.run_until_complete(asyncio.start_unix_server(server.handle, path=args.unix, limit=MAX_BODY))
+        where = args.unix
+    else:
+        listener = loop.run_until_complete(asyncio.start_server(server.handle, args.host, args.port, limit=MAX_BODY))
+        where = f"{args.host}:{args.port}"
+    if hasattr(signal, 'SIGTERM'):
+        try:
+            loop.add_signal_handler(signal.SIGTERM, loop.stop)
+        except NotImplementedError:
+            pass
+    sys.stderr.write(f"Serving on {where} with {server.jobs} workers\n")
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        loop.run_until_complete(listener.wait_closed())
+        server.close()
+        if len(args.unix) > 0 and os.path.exists(args.unix):
+            os.unlink(args.unix)
+        loop.close()
+    return 0
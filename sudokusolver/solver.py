@@ -0,0 +1,609 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+The solving API. Boards in the list of lists format are solved with elimination on the bitmask board followed by
+the depth first search, Dancing Links or the guess and reroll loop, and puzzles in the one line format are parsed,
+solved or counted and formatted back. Nothing here prints or reads the command line, see sudokusolver.cli
+Modules that only some solves need, such as Dancing Links, the cache or the copy and random modules behind the guess
+engine, are imported by the functions that use them
+"""
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import sys
+import time
+
+from sudokusolver.bitboard import BitBoard
+from sudokusolver.budget import Budget, BudgetExceeded
+from sudokusolver.search import count_solutions as count_bit_board_solutions, search
+from sudokusolver.stats import SolveStats
+from sudokusolver.symbols import default_symbols, format_cells, parse_cells
+from sudokusolver.techniques import TECHNIQUE_NAMES, apply_next
+from sudokusolver.units import Geometry, geometry_for_size
+from sudokusolver.validate import grid_is_solution
+
+if TYPE_CHECKING:
+    from sudokusolver.cache import SolutionCache
+
+# guesses the guess engine makes before it starts over with a new random order
+MAX_GUESSES_PER_ROLL = 500
+# rolls the guess engine gets when no time or node limit stops it. Hard 9x9 puzzles need a handful, and a puzzle with
+# no solution would otherwise keep it rolling forever
+MAX_ROLLS = 50
+
+STANDARD_SYMBOLS = default_symbols(9)
+
+# the value stored in E represents an empty space in the puzzle
+E = '.'
+
+# progress callbacks get the board being worked on and a status dict whose "stage" is "elimination" or "search"
+# elimination passes also report "reroll", "guess", "loop" and "changes", and search steps report "depth" and "nodes"
+ProgressCallback = Callable[[BitBoard, Dict[str, Any]], None]
+
+# the solving engines that can be chosen once elimination gets stuck
+ENGINE_SEARCH = 'search'
+ENGINE_GUESS = 'guess'
+ENGINE_DLX = 'dlx'
+ENGINES = [ENGINE_SEARCH, ENGINE_GUESS, ENGINE_DLX]
+# the NumPy engine propagates many boards at once, so it only runs in batch mode
+ENGINE_NUMPY = 'numpy'
+BATCH_ENGINES = ENGINES + [ENGINE_NUMPY]
+
+# logical techniques tried after singles when none are asked for. They save the guess engine most of its guessing,
+# but the bitmask search gets through the same puzzles faster than the techniques do
+DEFAULT_TECHNIQUES = {ENGINE_SEARCH: [], ENGINE_DLX: [], ENGINE_GUESS: TECHNIQUE_NAMES}
+
+def available_engines() -> List[str]:
+    """
+    Returns the engines batch mode can run here, which leaves out the NumPy engine when NumPy is not installed
+    """
+    import importlib.util
+    return BATCH_ENGINES if importlib.util.find_spec('numpy') is not None else ENGINES
+
+def square_single_members(i: int, j: int, board: List[List[Any]]) -> List[Any]:
+    """
+    finds the solved elements in the sudoku that are in the same square as the given location and returns a list of their values
+    """
+    geometry = geometry_for_size(len(board))
+    size = geometry.size
+    members = []
+    for cell in geometry.cell_units[i * size + j][2]:
+        value = board[cell // size][cell % size]
+        if isinstance(value, int):
+            members.append(value)
+    return members
+
+
+def list_diff(list1: List[Any], list2: List[Any]) -> List[Any]:
+    """
+    finds the difference of the unique elements in the given lists and returns it as a list
+    returns list1 - list2
+    """
+    return list(set(list1) - set(list2))
+
+def board_digits(board: List[List[Any]]) -> List[int]:
+    """
+    Flattens a board in the list of lists format to its digits row by row, with 0 for unsolved spaces
+    """
+    return [value if isinstance(value, int) else 0 for row in board for value in row]
+
+def verify_sudoku(board: List[List[Any]]) -> bool:
+    """
+    Checks for whether or not the given sudoku board is solved. Returns True if solved, False if not
+    """
+    geometry = geometry_for_size(len(board))
+    if geometry is None or any(len(row) != geometry.size for row in board):
+        return False
+    return grid_is_solution([value for row in board for value in row], geometry)
+
+def try_to_solve_with_elimiation(board: List[List[Any]], guess: int = -1, reroll: int = -1, progress: Optional[ProgressCallback] = None,
+                                 stats: Optional[SolveStats] = None) -> List[Union[List[List[Any]], bool]]:
+    """
+    Attempts to solve a sudoku only making moves that must be correct given the intial board
+    progress is called after every elimination pass, see ProgressCallback
+    stats is an optional SolveStats to count the work in
+    returns a list in the format [partialSudoku, solvedStatus] where partialSudoku is the attempted solution and solvedStatus is whether or not the sudoku is solved
+    True means solved where False means unsolved
+    """
+    bit_board = BitBoard.from_list_board(board, stats)
+    if bit_board is None:
+        import copy
+        return [copy.deepcopy(board), False]
+
+    return eliminate_on_bit_board(bit_board, guess, reroll, progress)
+
+def eliminate_on_bit_board(bit_board: BitBoard, guess: int = -1, reroll: int = -1, progress: Optional[ProgressCallback] = None,
+                           techniques: Sequence[str] = (), budget: Optional[Budget] = None) -> List[Union[List[List[Any]], bool]]:
+    """
+    Runs elimination passes on a bitmask board until nothing changes
+    techniques names the logical techniques from sudokusolver.techniques to try, cheapest first, whenever singles are stuck
+    budget, when given, has its deadline checked before every pass, see sudokusolver.budget
+    returns a list in the format [partialSudoku, solvedStatus] with partialSudoku converted back to the list format
+    solvedStatus is None when the board was found to be contradictory, which no engine can get any further with
+    """
+    diffs = 1
+    loop = 0
+    while diffs > 0 and not bit_board.is_solved():
+        if budget is not None:
+            budget.check_time()
+        diffs = bit_board.eliminate_pass()
+        if diffs == 0 and techniques and not bit_board.is_solved():
+            diffs = apply_next(bit_board, techniques)
+        if diffs < 0:
+            return [bit_board.to_list_board(), None]
+
+        if progress is not None:
+            progress(bit_board, {"stage": "elimination", "reroll": reroll, "guess": guess, "loop": loop, "changes": diffs})
+        loop += 1
+    return [bit_board.to_list_board(), bit_board.is_solved()]
+
+def guess_sub_iterator(unknown_list: List[Dict[Any, Any]]) -> List[Dict[Any, Any]]:
+    """
+    This function iterates over subguesses in the list of unknowns.
+    """
+    import copy
+    import random
+    random.shuffle(unknown_list)
+    for depth in range(len(unknown_list)+1):  # increase depth as needed
+        depth_complete = False
+        while not depth_complete:
+            sub_unknowns = []
+            # put together sublist for current depth and iteration
+            for i in range(depth+1):
+                sub_unknowns.append(copy.deepcopy(unknown_list[i]))
+
+            # this is returning the current subguess and whether or not another guess is possible
+            yield [copy.deepcopy(sub_unknowns), (unknown_list[-1]["iteration"]) < (unknown_list[-1]["count"] - 1)]
+
+            for i in range(depth+1):
+                if unknown_list[i]["iteration"] == (unknown_list[i]["count"] - 1):
+                    unknown_list[i]["iteration"] = 0
+                    if i == depth:
+                        depth_complete = True
+                        break
+                elif unknown_list[i]["iteration"] < unknown_list[i]["count"]:
+                    unknown_list[i]["iteration"] += 1
+                    break
+    yield [copy.deepcopy(sub_unknowns), False]
+
+
+def guess_generator(in_board: List[List[Any]]) -> List[Union[List[List[Any]], bool]]:
+    """
+    Generates a board with a single element set as a guess that might be true. Returns a list with the guess and a boolean value in the format [board, True/False]
+    The boolean value represents whether another guess exists after the current one. True means there is another, while False means there is not
+    a board with no unknowns or with a cell out of candidates gets the board itself back, with no guess after it
+    """
+    import copy
+    board = copy.deepcopy(in_board)
+    unknowns = []
+    for i in range(len(board)):
+        for j in range(len(board)):
+            if isinstance(board[i][j], list):
+                unknowns.append({"possible": board[i][j], "location": {"i": i, "j": j}, "count": len(board[i][j]), "iteration": 0})
+    if not unknowns or any(unknown["count"] == 0 for unknown in unknowns):
+        # nothing to guess, or a cell with no candidates left that no guess can fill
+        yield [board, False]
+        return
+
+    sub_iterator = guess_sub_iterator(copy.deepcopy(unknowns))
+
+    has_next_guess = True
+    while has_next_guess:
+        [sub_guess, has_next_guess] = next(sub_iterator)
+        for unknown in sub_guess:
+            i = unknown["iteration"]
+            board[unknown["location"]["i"]][unknown["location"]["j"]] = unknown["possible"][i]
+        yield [board, True]
+        board = copy.deepcopy(in_board)
+    yield [board, False]
+
+
+def _list_board_bytes(board: List[List[Any]]) -> int:
+    """Returns the bytes a board in the list of lists format takes, its rows and candidate lists included"""
+    return sys.getsizeof(board) + sum(sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row if isinstance(value, list))
+                                      for row in board)
+
+def _unknown_bytes(board: List[List[Any]]) -> List[int]:
+    """Returns the bytes each entry guess_generator makes for the unknown cells of a board takes"""
+    sizes = []
+    for row in board:
+        for value in row:
+            if isinstance(value, list):
+                unknown = {"possible": value, "location": {"i": 0, "j": 0}, "count": len(value), "iteration": 0}
+                sizes.append(sys.getsizeof(unknown) + sys.getsizeof(unknown["location"]) + sys.getsizeof(value))
+    return sizes
+
+def solve_with_smart_guesses(board: List[List[Any]], progress: Optional[ProgressCallback] = None,
+                             stats: Optional[SolveStats] = None, max_guesses: int = MAX_GUESSES_PER_ROLL,
+                             budget: Optional[Budget] = None, max_rolls: int = MAX_ROLLS) -> List[Union[List[List[Any]], bool]]:
+    """
+    This function tries to solve a sudoku with a mix of guessing and elimination
+    progress is called after every elimination pass, see ProgressCallback
+    stats is an optional SolveStats to count the guesses, rerolls and elimination work in
+    max_guesses is the number of guesses made before starting over with a new random order
+    budget, when given, is charged a node per guess and the boards and lists of unknown cells the guessing holds as memory
+    max_rolls is the number of random orders tried before giving up, unless the budget limits the time or the nodes. 0 means no limit
+    returns a list in the format [partialSudoku, solvedStatus] where partialSudoku is the attempted solution and solvedStatus is whether or not the sudoku is solved
+    True means solved where False means unsolved, and then partialSudoku is the board as it was given
+    """
+    if budget is not None and (budget.seconds > 0 or budget.max_nodes > 0):
+        max_rolls = 0
+    solved = False
+    has_guess = True
+    guesser = guess_generator(board)
+    solution = board
+    guess = 0
+    reroll = 0
+    if budget is not None:
+        # the guesser holds a copy of the board and two lists of its unknown cells, and every guess adds the guessed
+        # board, the board elimination makes of it and two copies of the unknowns it sets
+        board_bytes = _list_board_bytes(board)
+        unknown_bytes = _unknown_bytes(board)
+        average_unknown = sum(unknown_bytes) // max(len(unknown_bytes), 1)
+        held = 2 * board_bytes + 2 * (sum(unknown_bytes) + sys.getsizeof(unknown_bytes))
+    while not solved and has_guess:
+        # print(f"Guess {guess}")
+        # make a feasible partial guess - better than naiive - reject obviously impossible options
+        [temp_board, has_guess] = next(guesser)
+        # attempt elimination solution
+        [solution, solved] = try_to_solve_with_elimiation(temp_board, guess, reroll, progress, stats)
+        if budget is not None:
+            guessed = sum(isinstance(value, list) and not isinstance(guessed_value, list)
+                          for row, guessed_row in zip(board, temp_board) for value, guessed_value in zip(row, guessed_row))
+            budget.hold(held + board_bytes + _list_board_bytes(solution) + 2 * guessed * average_unknown)
+        guess += 1
+        if stats is not None:
+            stats.guesses += 1
+        if budget is not None and not solved:
+            unsolved = sum(isinstance(value, list) for row in solution for value in row)
+            if budget.improves(unsolved):
+                # a guess that ran into a contradiction is no use as a partial answer
+                check = BitBoard.from_list_board(solution)
+                if check is not None and check.propagate():
+                    budget.keep(solution, unsolved)
+            budget.spend()
+
+        if guess >= max_guesses:
+            reroll += 1
+            if stats is not None:
+                stats.rerolls += 1
+            guess = 0
+            if max_rolls and reroll >= max_rolls:
+                break
+            guesser = guess_generator(board)
+
+    if not solved:
+        # the last guess says nothing about the puzzle, so it is not worth handing back
+        solution = board
+    return [solution, solved]
+
+
+def solve_with_search(board: List[List[Any]]) -> List[Union[List[List[Any]], bool]]:
+    """
+    This function solves a sudoku with a deterministic depth first search, branching on the cell with the fewest candidates
+    returns a list in the format [partialSudoku, solvedStatus] where partialSudoku is the attempted solution and solvedStatus is whether or not the sudoku is solved
+    True means solved where False means unsolved
+    """
+    bit_board = BitBoard.from_list_board(board)
+    if bit_board is None:
+        return [board, False]
+    return search_bit_board(bit_board)
+
+def search_bit_board(bit_board: BitBoard, progress: Optional[ProgressCallback] = None,
+                     budget: Optional[Budget] = None) -> List[Union[List[List[Any]], bool]]:
+    """
+    Runs the depth first search on a bitmask board
+    progress is called after every search step, see ProgressCallback. budget is passed on to the search, see sudokusolver.search
+    returns a list in the format [partialSudoku, solvedStatus] with partialSudoku converted back to the list format
+    """
+    start = bit_board.save()
+    if search(bit_board, progress, budget=budget) is None:
+        bit_board.restore(start)
+        return [bit_board.to_list_board(), False]
+    return [bit_board.to_list_board(), True]
+
+def solve_exact_cover_sudoku(board: List[List[Any]]) -> List[Union[List[List[Any]], bool]]:
+    """
+    This function solves a sudoku as an exact cover problem with Dancing Links, which holds up on the hardest 9x9 puzzles and on larger boards
+    returns a list in the format [partialSudoku, solvedStatus] where partialSudoku is the attempted solution and solvedStatus is whether or not the sudoku is solved
+    True means solved where False means unsolved
+    """
+    bit_board = BitBoard.from_list_board(board)
+    if bit_board is None:
+        return [board, False]
+    return exact_cover_bit_board(bit_board)
+
+def exact_cover_bit_board(bit_board: BitBoard, budget: Optional[Budget] = None) -> List[Union[List[List[Any]], bool]]:
+    """
+    Runs the Dancing Links solver on a bitmask board
+    budget is passed on to the solver, see sudokusolver.dlx
+    returns a list in the format [partialSudoku, solvedStatus] with partialSudoku converted back to the list format
+    """
+    from sudokusolver.dlx import solve_exact_cover
+    solved_board = solve_exact_cover(bit_board, budget)
+    if solved_board is None:
+        return [bit_board.to_list_board(), False]
+    return [solved_board.to_list_board(), True]
+
+def solve_reasonable_sudoku(board: List[List[Any]], engine: str = ENGINE_SEARCH, progress: Optional[ProgressCallback] = None,
+                            return_stats: bool = False, techniques: Optional[Sequence[str]] = None, budget: Optional[Budget] = None,
+                            max_guesses: int = MAX_GUESSES_PER_ROLL) -> List[Union[List[List[Any]], bool, SolveStats]]:
+    """
+    Solves a sudoku that is reasonably solvable, with a smart mix of elimination and guessing
+    engine picks what happens once elimination gets stuck: ENGINE_SEARCH for depth first search, ENGINE_DLX for Dancing Links
+    or ENGINE_GUESS for the guess and reroll loop
+    progress is called as the solve goes on, see ProgressCallback. Nothing is printed without it
+    techniques names the logical techniques tried once singles are stuck, see sudokusolver.techniques. None uses DEFAULT_TECHNIQUES
+    budget limits the time, search nodes and memory of this solve, see sudokusolver.budget. max_guesses is passed on to the guess engine
+    returns a list in the format [partialSudoku, solvedStatus] where partialSudoku is the attempted solution and solvedStatus is whether or not the sudoku is solved
+    True means solved where False means unsolved
+    with return_stats the list is [partialSudoku, solvedStatus, stats] where stats is a SolveStats describing the work done
+    when the budget runs out, partialSudoku is the most constrained board the solve reached and solvedStatus is False,
+    with the reason in budget.exceeded and stats.exceeded
+    """
+    stats = SolveStats() if return_stats else None
+    result = _solve_reasonable_sudoku(board, engine, progress, stats, DEFAULT_TECHNIQUES.get(engine, []) if techniques is None else techniques,
+                                      budget, max_guesses)
+    if stats is not None:
+        result.append(stats)
+    return result
+
+def _solve_reasonable_sudoku(board: List[List[Any]], engine: str, progress: Optional[ProgressCallback],
+                             stats: Optional[SolveStats], techniques: Sequence[str], budget: Optional[Budget] = None,
+                             max_guesses: int = MAX_GUESSES_PER_ROLL) -> List[Union[List[List[Any]], bool]]:
+    """
+    The body of solve_reasonable_sudoku, timing each phase into stats when it is given
+    """
+    if budget is not None:
+        budget.start()
+    start = time.perf_counter()
+    # empty spaces go straight into the bitmask board, which checks the size and the range of the digits
+    for row in board:
+        for value in row:
+            if value != E and not isinstance(value, int):
+                return [board, False]
+
+    bit_board = BitBoard.from_list_board(board, stats)
+    checked = time.perf_counter()
+    if stats is not None:
+        stats.seconds['validation'] = checked - start
+    if bit_board is None:
+        return [board, False]
+
+    eliminated = 0.0
+    try:
+        [partial_board, solved] = eliminate_on_bit_board(bit_board, progress=progress, techniques=techniques, budget=budget)
+        eliminated = time.perf_counter()
+        if stats is not None:
+            stats.seconds['elimination'] = eliminated - checked
+        final_board = partial_board
+        if solved is None:
+            # the puzzle has no solution, so there is nothing for an engine to search
+            solved = False
+        elif not solved:
+            if budget is not None:
+                budget.keep(partial_board, bit_board.unsolved)
+            if engine == ENGINE_GUESS:
+                [final_board, solved] = solve_with_smart_guesses(partial_board, progress, stats, max_guesses, budget)
+            elif engine == ENGINE_DLX:
+                [final_board, solved] = exact_cover_bit_board(bit_board, budget)
+            else:
+                [final_board, solved] = search_bit_board(bit_board, progress, budget)
+            if stats is not None:
+                stats.seconds['search'] = time.perf_counter() - eliminated
+    except BudgetExceeded as error:
+        # the elimination board is kept before any search, so best is only missing when elimination itself ran out
+        final_board = budget.best if budget is not None and budget.best is not None else bit_board.to_list_board()
+        # a kept board with nothing left unsolved came through elimination without a contradiction, so it is a solution
+        solved = budget is not None and budget.best_unsolved == 0
+        if solved:
+            budget.exceeded = None
+        if stats is not None:
+            stats.exceeded = None if solved else error.reason
+            if eliminated:
+                stats.seconds['search'] = time.perf_counter() - eliminated
+            else:
+                stats.seconds['elimination'] = time.perf_counter() - checked
+    return [final_board, solved]
+
+def count_solutions(board: List[List[Any]], limit: int = 2, budget: Optional[Budget] = None) -> int:
+    """
+    Counts the solutions of a sudoku with the depth first search, stopping once limit of them are found, or never if limit is 0
+    the default limit of 2 is enough to tell whether the puzzle is well posed, which is when the count is 1
+    when the budget runs out the solutions found so far are counted, and budget.exceeded says why it stopped
+    returns 0 for a malformed board or one whose clues contradict each other
+    """
+    if budget is not None:
+        budget.start()
+    bit_board = BitBoard.from_list_board(board)
+    if bit_board is None:
+        return 0
+    return count_bit_board_solutions(bit_board, limit, budget)
+
+def solve_cached_sudoku(board: List[List[Any]], cache: 'SolutionCache', engine: str = ENGINE_SEARCH, progress: Optional[ProgressCallback] = None,
+                        return_stats: bool = False, techniques: Optional[Sequence[str]] = None, budget: Optional[Budget] = None,
+                        max_guesses: int = MAX_GUESSES_PER_ROLL) -> List[Union[List[List[Any]], bool, SolveStats]]:
+    """
+    Solves a sudoku like solve_reasonable_sudoku, looking it up in the cache first
+    the lookup uses the canonical form of the puzzle, so a puzzle relabelled, transposed or with rows, columns, bands or stacks
+    swapped finds the solution of the original, moved back to the orientation asked about. Solved puzzles are added to the cache
+    budget and max_guesses only apply to a puzzle that is not in the cache
+    returns the same list as solve_reasonable_sudoku. The stats of a puzzle found in the cache are empty, with cached set
+    """
+    from sudokusolver.cache import canonical_form
+    geometry = geometry_for_size(len(board))
+    grid = []
+    if geometry is not None:
+        for row in board:
+            if len(row) != geometry.size:
+                geometry = None
+                break
+            for value in row:
+                if value == E:
+                    grid.append(0)
+                elif isinstance(value, int) and 1 <= value <= geometry.size:
+                    grid.append(value)
+                else:
+                    geometry = None
+                    break
+    if geometry is None:
+        return solve_reasonable_sudoku(board, engine, progress, return_stats, techniques, budget, max_guesses)
+
+    form = canonical_form(grid, geometry)
+    if form is None:
+        cache.uncacheable += 1
+        return solve_reasonable_sudoku(board, engine, progress, return_stats, techniques, budget, max_guesses)
+
+    [key, transform] = form
+    solution = cache.get(key)
+    if solution is not None:
+        if budget is not None:
+            budget.start()
+        digits = transform.invert([int(label) for label in solution.split(',')], geometry.size)
+        result = [[digits[geometry.size * i + j] for j in range(geometry.size)] for i in range(geometry.size)]
+        if not return_stats:
+            return [result, True]
+        stats = SolveStats()
+        stats.cached = True
+        return [result, True, stats]
+
+    result = solve_reasonable_sudoku(board, engine, progress, return_stats, techniques, budget, max_guesses)
+    if result[1]:
+        labels = transform.apply([value for row in result[0] for value in row], geometry.size)
+        cache.put(key, ','.join(str(label) for label in labels))
+    return result
+
+def read_puzzle_lines(filename: str) -> Iterator[str]:
+    """
+    Yields the puzzles in a one puzzle per line file, one line at a time so the file is never held in memory
+    blank lines and lines starting with # are skipped
+    a file in the binary format is read through a memory map instead, see sudokusolver.binary
+    """
+    from sudokusolver.binary import BinaryReader, is_binary_file
+    if is_binary_file(filename):
+        with BinaryReader(filename) as reader:
+            symbols = default_symbols(reader.geometry.size)
+            for grid in reader.grids():
+                yield format_cells(grid, symbols)
+        return
+    with open(filename, 'r') as puzzle_file:
+        for line in puzzle_file:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+def parse_puzzle_line(line: str, symbols: Optional[Sequence[str]] = None, size: int = 0) -> Optional[List[List[Any]]]:
+    """
+    Parses a puzzle in the one line format: the cells read row by row, with symbols for clues and periods or zeros for empty spaces
+    81 characters make a 9x9 board, 256 a 16x16 board and so on. Symbols longer than one character are separated by whitespace
+    symbols are the symbols of the digits, see sudokusolver.symbols. None works out the size from the line
+    size, when given, is the only board size accepted
+    returns the board in the list of lists format, or None if the line is not a puzzle
+    """
+    puzzle = read_puzzle_line(line, symbols, size)
+    return puzzle[0] if puzzle is not None else None
+
+def read_puzzle_line(line: str, symbols: Optional[Sequence[str]] = None, size: int = 0) -> Optional[Tuple[List[List[Any]], Sequence[str]]]:
+    """
+    Parses a puzzle in the one line format like parse_puzzle_line
+    returns the board and the symbols it was written with, so results can be written the same way, or None if the line is not a puzzle
+    """
+    if symbols is None and size in (0, 9) and len(line) == 81:
+        # the common case, kept off the general parser
+        board = []
+        for i in range(9):
+            row = []
+            for character in line[9*i:9*i+9]:
+                if character == E or character == '0':
+                    row.append(E)
+                elif '1' <= character <= '9':
+                    row.append(int(character))
+                else:
+                    return None
+            board.append(row)
+        return board, STANDARD_SYMBOLS
+    cells = parse_cells(line, symbols, True, size)
+    if cells is None:
+        return None
+    return cells_to_board(cells[0], cells[1]), cells[2]
+
+def cells_to_board(geometry: Geometry, digits: List[int]) -> List[List[Any]]:
+    """
+    Builds a board in the list of lists format from a flat list of digits with 0 for empty spaces
+    """
+    size = geometry.size
+    return [[digit if digit else E for digit in digits[i * size:(i + 1) * size]] for i in range(size)]
+
+def board_to_line(board: List[List[Any]], symbols: Optional[Sequence[str]] = None) -> str:
+    """
+    Formats a board in the one line format, with periods for unsolved spaces
+    symbols are the symbols of the digits, see sudokusolver.symbols. None uses the default ones for the board size
+    """
+    return format_cells(board_digits(board), symbols or default_symbols(len(board)))
+
+def puzzle_budget(budget: Optional[Budget], timeout: float) -> Optional[Budget]:
+    """
+    Returns a fresh budget for one puzzle with the limits of budget, or None when there are none
+    timeout is a number of seconds for the puzzle, kept in place of the budget's own time limit when it is shorter
+    """
+    if budget is not None:
+        return budget.copy(timeout)
+    return Budget(timeout) if timeout > 0 else None
+
+def solve_puzzle_line(line: str, engine: str = ENGINE_SEARCH, timeout: float = 0.0, cache: Optional['SolutionCache'] = None,
+                      techniques: Optional[Sequence[str]] = None, symbols: Optional[Sequence[str]] = None, size: int = 0,
+                      budget: Optional[Budget] = None, max_guesses: int = MAX_GUESSES_PER_ROLL) -> str:
+    """
+    Solves a puzzle in the one line format without printing anything
+    timeout is the number of seconds allowed for the puzzle and budget the other limits on it, see puzzle_budget
+    cache, when given, is checked before solving, see solve_cached_sudoku. techniques and max_guesses are passed on to solve_reasonable_sudoku
+    symbols and size say how the puzzle is read, see parse_puzzle_line
+    returns a result line in the format puzzle,solution,status where status is solved, unsolved, invalid or, when the budget
+    runs out, the reason it did: timeout, node-limit or memory-limit. Then the solution is the most constrained board reached
+    """
+    puzzle = read_puzzle_line(line, symbols, size)
+    if puzzle is None:
+        return f"{line},,invalid"
+    [board, symbols] = puzzle
+
+    limits = puzzle_budget(budget, timeout)
+    if cache is not None:
+        [final_board, solved] = solve_cached_sudoku(board, cache, engine, techniques=techniques, budget=limits, max_guesses=max_guesses)
+    else:
+        [final_board, solved] = solve_reasonable_sudoku(board, engine, techniques=techniques, budget=limits, max_guesses=max_guesses)
+    if limits is not None and limits.exceeded is not None:
+        status = limits.exceeded
+    else:
+        status = 'solved' if solved else 'unsolved'
+    return f"{line},{board_to_line(final_board, symbols)},{status}"
+
+def count_puzzle_line(line: str, limit: int = 2, timeout: float = 0.0, symbols: Optional[Sequence[str]] = None, size: int = 0,
+                      budget: Optional[Budget] = None) -> str:
+    """
+    Counts the solutions of a puzzle in the one line format, stopping at limit, see count_solutions
+    timeout and budget limit the count like they limit solve_puzzle_line
+    returns a result line in the format puzzle,count,status where status is unique, multiple, none, invalid or, when the
+    budget runs out, the reason it did. Then the count is the number of solutions found before it ran out
+    """
+    board = parse_puzzle_line(line, symbols, size)
+    if board is None:
+        return f"{line},,invalid"
+    limits = puzzle_budget(budget, timeout)
+    count = count_solutions(board, limit, limits)
+    if limits is not None and limits.exceeded is not None:
+        return f"{line},{count},{limits.exceeded}"
+    status = 'none' if count == 0 else 'unique' if count == 1 else 'multiple'
+    return f"{line},{count},{status}"
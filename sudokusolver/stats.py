@@ -0,0 +1,89 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Per solve statistics. A SolveStats object rides along with the board and the engines add to its counters as they go
+"""
+
+from typing import Any, Dict, Optional
+
+# the solving phases that are timed separately
+PHASES = ['validation', 'elimination', 'search']
+
+
+class SolveStats:
+    """
+    The work done by one solve
+    seconds holds the wall time of each phase, removed the number of candidates removed by each technique
+    and hits the number of times each technique made progress
+    guesses counts guesses of the guess engine and branches of the search engines, and backtracks the branches that failed
+    exceeded is the reason the solve stopped early when its budget ran out, see sudokusolver.budget, or None
+    cached is True when the solution came from a SolutionCache, so none of the work was done and the counts are all 0
+    """
+
+    __slots__ = ('seconds', 'elimination_loops', 'guesses', 'rerolls', 'backtracks', 'max_depth', 'removed', 'hits', 'exceeded', 'cached')
+
+    def __init__(self) -> None:
+        self.seconds = {phase: 0.0 for phase in PHASES}
+        self.elimination_loops = 0
+        self.guesses = 0
+        self.rerolls = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.removed: Dict[str, int] = {}
+        self.hits: Dict[str, int] = {}
+        self.exceeded: Optional[str] = None
+        self.cached = False
+
+    def count_removed(self, technique: str, count: int) -> None:
+        """Adds to the number of candidates removed by a technique and counts a hit for it"""
+        self.removed[technique] = self.removed.get(technique, 0) + count
+        self.hits[technique] = self.hits.get(technique, 0) + 1
+
+    def total_seconds(self) -> float:
+        """Returns the wall time of all phases together"""
+        return sum(self.seconds.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the statistics as plain data, ready for JSON"""
+        return {
+            "seconds": dict(self.seconds),
+            "total_seconds": self.total_seconds(),
+            "elimination_loops": self.elimination_loops,
+            "guesses": self.guesses,
+            "rerolls": self.rerolls,
+            "backtracks": self.backtracks,
+            "max_depth": self.max_depth,
+            "removed": dict(self.removed),
+            "hits": dict(self.hits),
+            "exceeded": self.exceeded,
+            "cached": self.cached,
+        }
+
+    def format(self) -> str:
+        """Returns the statistics as lines of text for the terminal"""
+        lines = [f"Time: {self.total_seconds() * 1000:.2f} ms ("
+                 + ", ".join(f"{phase} {self.seconds[phase] * 1000:.2f} ms" for phase in PHASES) + ")",
+                 f"Elimination loops: {self.elimination_loops}",
+                 f"Guesses: {self.guesses}, rerolls: {self.rerolls}, backtracks: {self.backtracks}, max depth: {self.max_depth}"]
+        if self.removed:
+            lines.append("Candidates removed: " + ", ".join(f"{technique} {count}" for technique, count in sorted(self.removed.items())))
+            lines.append("Technique hits: " + ", ".join(f"{technique} {count}" for technique, count in sorted(self.hits.items())))
+        if self.exceeded is not None:
+            lines.append(f"Stopped early: {self.exceeded}")
+        if self.cached:
+            lines.append("Cache hit: the solution was looked up, not solved")
+        return "\n".join(lines)
@@ -0,0 +1,226 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Board text for every board size. The digits 1 to size are written as symbols, 1-9 then A-Z by default, so 16x16
+boards use 1-9 and A-G and 25x25 boards 1-9 and A-P. Other alphabets such as ABCDEFGHIJKLMNOP can be given, and
+symbols longer than one character, such as the numbers 1 to 16, are read as whitespace separated tokens.
+Periods are empty spaces, and so are zeros when 0 is not a symbol
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sudokusolver.units import Geometry, geometry_for_size
+
+EMPTY = '.'
+ALPHABET = '123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+# characters that only draw the borders of a board file
+BORDERS = '|-+'
+
+
+def default_symbols(size: int) -> List[str]:
+    """Returns the symbols of the digits 1 to size, single characters while ALPHABET lasts and numbers past that"""
+    if size <= len(ALPHABET):
+        return list(ALPHABET[:size])
+    return numbered_symbols(size)
+
+
+def numbered_symbols(size: int) -> List[str]:
+    """Returns the numbers 1 to size as symbols, for boards written as tokens such as 10 or 16"""
+    return [str(digit) for digit in range(1, size + 1)]
+
+
+def parse_symbols(text: str) -> List[str]:
+    """
+    Parses a list of symbols given on the command line, either one character per digit such as ABCDEFGHIJKLMNOP,
+    or tokens separated by commas
+    raises ValueError if a symbol is empty, repeated or could not be told apart from the board layout,
+    or if the number of symbols is not the side of a board
+    """
+    symbols = [token.strip() for token in text.split(',')] if ',' in text else list(text.strip())
+    for symbol in symbols:
+        if not symbol or symbol == EMPTY or any(character.isspace() or character in BORDERS for character in symbol):
+            raise ValueError(f"'{symbol}' cannot be a symbol")
+    if len(set(symbols)) != len(symbols):
+        raise ValueError("symbols must all be different")
+    if board_geometry(len(symbols) ** 2) is None:
+        raise ValueError(f"{len(symbols)} symbols do not make a board, the count has to be a square number such as 4, 9, 16 or 25")
+    return symbols
+
+
+def board_geometry(cells: int) -> Optional[Geometry]:
+    """Returns the geometry of a board with the given number of cells, or None if no board has that many"""
+    size = int(round(cells ** 0.5))
+    if size < 4 or size * size != cells:
+        return None
+    return geometry_for_size(size)
+
+
+def _lookup(symbols: Sequence[str]) -> Dict[str, int]:
+    """Maps each symbol, and its lower case form, to its digit and the empty markers to 0"""
+    digits = {symbol: digit for digit, symbol in enumerate(symbols, 1)}
+    for symbol, digit in list(digits.items()):
+        digits.setdefault(symbol.lower(), digit)
+    digits.setdefault(EMPTY, 0)
+    digits.setdefault('0', 0)
+    return digits
+
+
+def _read_tokens(tokens: List[str], symbols: Sequence[str]) -> Optional[List[int]]:
+    """Reads one cell per token, returning None at the first token that is not a symbol or empty marker"""
+    lookup = _lookup(symbols)
+    digits = []
+    for token in tokens:
+        digit = lookup.get(token)
+        if digit is None:
+            return None
+        digits.append(digit)
+    return digits
+
+
+def _read_characters(text: str, symbols: Sequence[str], strict: bool) -> Optional[List[int]]:
+    """
+    Reads one cell per character, skipping whitespace
+    strict returns None for any other character that is not a symbol, otherwise they are skipped too
+    """
+    lookup = _lookup(symbols)
+    if not strict:
+        return [lookup[character] for character in text if character in lookup]
+    digits = []
+    for character in text:
+        digit = lookup.get(character)
+        if digit is None:
+            if character.isspace():
+                continue
+            return None
+        digits.append(digit)
+    return digits
+
+
+def _fits(digits: Optional[List[int]], size: int) -> bool:
+    """Returns whether digits holds the cells of a board with the given side"""
+    return digits is not None and len(digits) == size * size and max(digits) <= size
+
+
+def parse_cells(text: str, symbols: Optional[Sequence[str]] = None, strict: bool = False,
+                size: int = 0) -> Optional[Tuple[Geometry, List[int], Sequence[str]]]:
+    """
+    Reads the cells of a board row by row from text in any layout
+    without symbols the size of the board comes from the number of cells, read with the default symbols for that size
+    or as numbered tokens. strict is for the one line format: anything that is not a symbol, an empty marker or whitespace
+    makes the text invalid, where otherwise it is skipped along with the borders of a board file
+    size, when given, is the only board size accepted
+    returns the geometry of the board, its digits as a flat list with 0 for empty cells and the symbols it was written with,
+    or None if the text is not a board
+    """
+    cells = _parse_cells(text, symbols, strict)
+    if cells is None or (size and cells[0].size != size):
+        return None
+    return cells
+
+
+def _parse_cells(text: str, symbols: Optional[Sequence[str]], strict: bool) -> Optional[Tuple[Geometry, List[int], Sequence[str]]]:
+    """The body of parse_cells"""
+    if not strict:
+        for border in BORDERS:
+            text = text.replace(border, ' ')
+
+    if symbols is not None:
+        size = len(symbols)
+        if all(len(symbol) == 1 for symbol in symbols):
+            digits = _read_characters(text, symbols, strict)
+        else:
+            digits = _read_tokens(text.split(), symbols)
+        return (geometry_for_size(size), digits, symbols) if _fits(digits, size) else None
+
+    tokens = text.split()
+    geometry = board_geometry(len(tokens))
+    if geometry is not None:
+        # one cell per token, as numbers or as the default symbols
+        for candidates in (numbered_symbols(geometry.size), default_symbols(geometry.size)):
+            digits = _read_tokens(tokens, candidates)
+            if _fits(digits, geometry.size):
+                return geometry, digits, candidates
+
+    if not strict:
+        # digits alone first, so 9x9 board files read the same whatever else they have in them
+        digits = _read_characters(text, ALPHABET[:9], False)
+        geometry = board_geometry(len(digits))
+        if geometry is not None and geometry.size <= 9 and _fits(digits, geometry.size):
+            return geometry, digits, default_symbols(geometry.size)
+    digits = _read_characters(text, ALPHABET, strict)
+    geometry = board_geometry(len(digits)) if digits is not None else None
+    if geometry is None or not _fits(digits, geometry.size):
+        return None
+    return geometry, digits, default_symbols(geometry.size)
+
+
+def iter_text_boards(lines: Iterable[str], geometry: Geometry, symbols: Optional[Sequence[str]] = None) -> Iterator[List[int]]:
+    """
+    Reads boards one after another from lines of text in any layout, such as a file write_board_to_file appended to,
+    each geometry.cells cells making one board. Borders, whitespace and anything that is not a symbol are skipped
+    yields the digits of each board as a flat list with 0 for empty cells
+    """
+    symbols = symbols or default_symbols(geometry.size)
+    lookup = _lookup(symbols)
+    tokens = any(len(symbol) > 1 for symbol in symbols)
+    cells = geometry.cells
+    board: List[int] = []
+    for line in lines:
+        if tokens:
+            for border in BORDERS:
+                line = line.replace(border, ' ')
+            board.extend(lookup[token] for token in line.split() if token in lookup)
+        else:
+            board.extend(lookup[character] for character in line if character in lookup)
+        while len(board) >= cells:
+            yield board[:cells]
+            del board[:cells]
+
+
+def format_cells(digits: Sequence[int], symbols: Sequence[str]) -> str:
+    """
+    Formats a flat list of digits in the one line format, with periods for empty cells
+    symbols longer than one character are written as space separated tokens
+    """
+    cells = [symbols[digit - 1] if digit else EMPTY for digit in digits]
+    if all(len(symbol) == 1 for symbol in symbols):
+        return ''.join(cells)
+    return ' '.join(cells)
+
+
+def format_board(digits: Sequence[int], geometry: Geometry, symbols: Sequence[str]) -> str:
+    """
+    Formats a flat list of digits as a grid with borders around the squares, with periods for empty cells
+    every cell is padded to the width of the longest symbol
+    """
+    width = max(len(symbol) for symbol in symbols)
+    size = geometry.size
+    lines = []
+    for i in range(size):
+        row = "| "
+        for j in range(size):
+            digit = digits[i * size + j]
+            row += (symbols[digit - 1] if digit else EMPTY).rjust(width) + " "
+            if (j + 1) % geometry.box == 0:
+                row += "| "
+        if i == 0:
+            border = "-" * (len(row) - 1)
+            lines.append(border)
+        lines.append(row)
+        if (i + 1) % geometry.box == 0:
+            lines.append(border)
+    return "\n".join(lines)
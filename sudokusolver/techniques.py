@@ -0,0 +1,382 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Logical techniques that run once naked and hidden singles are stuck. Each one removes candidates from a bitmask board
+and returns how many it removed, or -1 if it left a cell without candidates.
+They are kept in TECHNIQUES cheapest first, and propagate_with runs the enabled ones one at a time, going back to
+singles as soon as one of them makes progress, so the expensive ones only run when everything cheaper is stuck
+"""
+
+from itertools import combinations
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sudokusolver.bitboard import BitBoard
+from sudokusolver.stats import SolveStats
+
+# difficulties from easiest to hardest, see TECHNIQUE_LEVELS. Extreme puzzles need the search
+DIFFICULTIES = ['easy', 'medium', 'hard', 'expert', 'extreme']
+
+
+def _count(mask: int) -> int:
+    """Returns the number of set bits in a mask"""
+    return bin(mask).count('1')
+
+
+def _remove(bit_board: BitBoard, cell: int, mask: int) -> int:
+    """
+    Removes the digits in mask from the candidates of an unsolved cell
+    returns the number removed, or -1 if the cell has no candidates left
+    """
+    cands = bit_board.cands
+    removing = cands[cell] & mask
+    if not removing:
+        return 0
+    cands[cell] ^= removing
+    if not cands[cell]:
+        return -1
+    return _count(removing)
+
+
+def naked_singles(bit_board: BitBoard) -> bool:
+    """
+    Places naked singles until there are none left, without looking for hidden singles
+    returns False if the board was found to be contradictory
+    """
+    cands = bit_board.cands
+    values = bit_board.values
+    changed = True
+    while changed and bit_board.unsolved:
+        changed = False
+        for cell in range(bit_board.geometry.cells):
+            if not values[cell]:
+                mask = cands[cell]
+                if not mask:
+                    return False
+                if not mask & (mask - 1):
+                    if not bit_board.place(cell, mask.bit_length(), 'naked_single'):
+                        return False
+                    changed = True
+    return True
+
+
+def pointing_pairs(bit_board: BitBoard) -> int:
+    """
+    When a digit's places in a square all lie in one row or column, the digit cannot go in the rest of that line
+    """
+    geometry = bit_board.geometry
+    cands = bit_board.cands
+    values = bit_board.values
+    removed = 0
+    for number, box in enumerate(geometry.boxes):
+        missing = geometry.all_digits & ~bit_board.boxes[number]
+        while missing:
+            bit = missing & -missing
+            missing ^= bit
+            places = [cell for cell in box if not values[cell] and cands[cell] & bit]
+            if len(places) < 2:
+                continue
+            rows = {geometry.row_of[cell] for cell in places}
+            cols = {geometry.col_of[cell] for cell in places}
+            if len(rows) == 1:
+                line = geometry.rows[rows.pop()]
+            elif len(cols) == 1:
+                line = geometry.cols[cols.pop()]
+            else:
+                continue
+            for cell in line:
+                if not values[cell] and geometry.box_of[cell] != number:
+                    count = _remove(bit_board, cell, bit)
+                    if count < 0:
+                        return -1
+                    removed += count
+    return removed
+
+
+def box_line_reduction(bit_board: BitBoard) -> int:
+    """
+    When a digit's places in a row or column all lie in one square, the digit cannot go in the rest of that square
+    """
+    geometry = bit_board.geometry
+    cands = bit_board.cands
+    values = bit_board.values
+    removed = 0
+    for lines, placed, line_of in ((geometry.rows, bit_board.rows, geometry.row_of), (geometry.cols, bit_board.cols, geometry.col_of)):
+        for number, line in enumerate(lines):
+            missing = geometry.all_digits & ~placed[number]
+            while missing:
+                bit = missing & -missing
+                missing ^= bit
+                boxes = {geometry.box_of[cell] for cell in line if not values[cell] and cands[cell] & bit}
+                if len(boxes) != 1:
+                    continue
+                for cell in geometry.boxes[boxes.pop()]:
+                    if not values[cell] and line_of[cell] != number:
+                        count = _remove(bit_board, cell, bit)
+                        if count < 0:
+                            return -1
+                        removed += count
+    return removed
+
+
+def _naked_subsets(bit_board: BitBoard, size: int) -> int:
+    """
+    When size cells of a unit share size candidates between them, those digits cannot go anywhere else in the unit
+    """
+    cands = bit_board.cands
+    values = bit_board.values
+    removed = 0
+    for unit in bit_board.geometry.units:
+        open_cells = [cell for cell in unit if not values[cell] and 2 <= _count(cands[cell]) <= size]
+        if len(open_cells) < size:
+            continue
+        for subset in combinations(open_cells, size):
+            union = 0
+            for cell in subset:
+                union |= cands[cell]
+            if _count(union) != size:
+                continue
+            for cell in unit:
+                if not values[cell] and cell not in subset:
+                    count = _remove(bit_board, cell, union)
+                    if count < 0:
+                        return -1
+                    removed += count
+    return removed
+
+
+def _hidden_subsets(bit_board: BitBoard, size: int) -> int:
+    """
+    When size digits of a unit only fit in the same size cells, those cells cannot hold any other digit
+    """
+    cands = bit_board.cands
+    values = bit_board.values
+    removed = 0
+    for unit in bit_board.geometry.units:
+        # digit bit -> mask of the positions in the unit where it still fits
+        places: Dict[int, int] = {}
+        for position, cell in enumerate(unit):
+            if values[cell]:
+                continue
+            mask = cands[cell]
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                places[bit] = places.get(bit, 0) | (1 << position)
+        digits = [bit for bit, positions in places.items() if 2 <= _count(positions) <= size]
+        if len(digits) < size:
+            continue
+        for subset in combinations(digits, size):
+            positions = 0
+            keep = 0
+            for bit in subset:
+                positions |= places[bit]
+                keep |= bit
+            if _count(positions) != size:
+                continue
+            for position, cell in enumerate(unit):
+                if positions >> position & 1:
+                    count = _remove(bit_board, cell, ~keep & bit_board.geometry.all_digits)
+                    if count < 0:
+                        return -1
+                    removed += count
+    return removed
+
+
+def _fish(bit_board: BitBoard, size: int) -> int:
+    """
+    When a digit fits in only the same size columns across size rows, it cannot go anywhere else in those columns,
+    and the same with rows and columns swapped. Size 2 is the X-Wing and size 3 the Swordfish
+    """
+    geometry = bit_board.geometry
+    cands = bit_board.cands
+    values = bit_board.values
+    removed = 0
+    for base_lines, cover_lines, base_of, cover_of in ((geometry.rows, geometry.cols, geometry.row_of, geometry.col_of),
+                                                       (geometry.cols, geometry.rows, geometry.col_of, geometry.row_of)):
+        for digit in range(geometry.size):
+            bit = 1 << digit
+            # base line -> mask of the cover lines where the digit still fits
+            lines: List[Tuple[int, int]] = []
+            for number, line in enumerate(base_lines):
+                covers = 0
+                for cell in line:
+                    if not values[cell] and cands[cell] & bit:
+                        covers |= 1 << cover_of[cell]
+                if 2 <= _count(covers) <= size:
+                    lines.append((number, covers))
+            if len(lines) < size:
+                continue
+            for subset in combinations(lines, size):
+                covers = 0
+                for _, mask in subset:
+                    covers |= mask
+                if _count(covers) != size:
+                    continue
+                chosen = {number for number, _ in subset}
+                for cover in range(geometry.size):
+                    if not covers >> cover & 1:
+                        continue
+                    for cell in cover_lines[cover]:
+                        if not values[cell] and base_of[cell] not in chosen:
+                            count = _remove(bit_board, cell, bit)
+                            if count < 0:
+                                return -1
+                            removed += count
+    return removed
+
+
+def naked_pairs(bit_board: BitBoard) -> int:
+    """Naked subsets of two cells"""
+    return _naked_subsets(bit_board, 2)
+
+
+def naked_triples(bit_board: BitBoard) -> int:
+    """Naked subsets of three cells"""
+    return _naked_subsets(bit_board, 3)
+
+
+def hidden_pairs(bit_board: BitBoard) -> int:
+    """Hidden subsets of two digits"""
+    return _hidden_subsets(bit_board, 2)
+
+
+def hidden_triples(bit_board: BitBoard) -> int:
+    """Hidden subsets of three digits"""
+    return _hidden_subsets(bit_board, 3)
+
+
+def x_wing(bit_board: BitBoard) -> int:
+    """Fish over two rows or columns"""
+    return _fish(bit_board, 2)
+
+
+def swordfish(bit_board: BitBoard) -> int:
+    """Fish over three rows or columns"""
+    return _fish(bit_board, 3)
+
+
+# every technique after singles, cheapest first
+TECHNIQUES: List[Tuple[str, Callable[[BitBoard], int]]] = [
+    ('pointing_pair', pointing_pairs),
+    ('box_line', box_line_reduction),
+    ('naked_pair', naked_pairs),
+    ('hidden_pair', hidden_pairs),
+    ('x_wing', x_wing),
+    ('naked_triple', naked_triples),
+    ('hidden_triple', hidden_triples),
+    ('swordfish', swordfish),
+]
+
+TECHNIQUE_NAMES = [name for name, _ in TECHNIQUES]
+
+# the index in DIFFICULTIES of the puzzles that need each technique
+TECHNIQUE_LEVELS = {
+    'naked_single': 0,
+    'hidden_single': 1,
+    'pointing_pair': 2,
+    'box_line': 2,
+    'naked_pair': 2,
+    'hidden_pair': 2,
+    'x_wing': 3,
+    'naked_triple': 3,
+    'hidden_triple': 3,
+    'swordfish': 3,
+}
+
+
+def parse_techniques(text: str) -> List[str]:
+    """
+    Parses a comma separated list of technique names, where all means every technique and none means no technique
+    raises ValueError for an unknown name
+    """
+    if text == 'all':
+        return list(TECHNIQUE_NAMES)
+    if text == 'none' or len(text) == 0:
+        return []
+    names = [name.strip() for name in text.split(',')]
+    for name in names:
+        if name not in TECHNIQUE_NAMES:
+            raise ValueError(f"unknown technique {name}, use all, none or some of {', '.join(TECHNIQUE_NAMES)}")
+    return names
+
+
+def techniques_up_to(difficulty: str) -> List[str]:
+    """Returns the techniques a puzzle of the given difficulty may need"""
+    level = DIFFICULTIES.index(difficulty)
+    return [name for name in TECHNIQUE_NAMES if TECHNIQUE_LEVELS[name] <= level]
+
+
+def apply_next(bit_board: BitBoard, enabled: Sequence[str]) -> int:
+    """
+    Runs the enabled techniques cheapest first until one of them removes candidates
+    the removals are counted in the board's stats when it has them
+    returns the number of candidates removed, 0 if every technique is stuck, or -1 if the board was found to be contradictory
+    """
+    for name, technique in TECHNIQUES:
+        if name not in enabled:
+            continue
+        removed = technique(bit_board)
+        if removed != 0:
+            if removed > 0 and bit_board.stats is not None:
+                bit_board.stats.count_removed(name, removed)
+            return removed
+    return 0
+
+
+def propagate_with(bit_board: BitBoard, enabled: Sequence[str]) -> bool:
+    """
+    Runs singles and the enabled techniques until nothing changes
+    returns False if the board was found to be contradictory
+    """
+    while True:
+        if not bit_board.propagate():
+            return False
+        if bit_board.is_solved():
+            return True
+        removed = apply_next(bit_board, enabled)
+        if removed <= 0:
+            return removed == 0
+
+
+def rate_stats(stats: SolveStats, solved: bool) -> str:
+    """
+    Rates a solve by the hardest technique that removed candidates in it, or extreme if it needed guessing or was not solved
+    """
+    if not solved or stats.guesses > 0:
+        return DIFFICULTIES[-1]
+    level = 0
+    for technique, count in stats.removed.items():
+        if count > 0:
+            level = max(level, TECHNIQUE_LEVELS.get(technique, 0))
+    return DIFFICULTIES[level]
+
+
+def rate_board(bit_board: BitBoard) -> Optional[str]:
+    """
+    Rates an unsolved board by the techniques needed to solve it, without changing it
+    easy boards fall to naked singles alone, and the others are rated by the hardest technique that removed candidates
+    returns None if the board was found to have no solution by the techniques
+    """
+    board = bit_board.copy()
+    board.stats = SolveStats()
+    if not naked_singles(board):
+        return None
+    if board.is_solved():
+        return DIFFICULTIES[0]
+    if not propagate_with(board, TECHNIQUE_NAMES):
+        return None
+    return DIFFICULTIES[max(1, DIFFICULTIES.index(rate_stats(board.stats, board.is_solved())))]
@@ -0,0 +1,89 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Precomputed cell indexes. Cells are numbered row by row from 0, and every cell is mapped
+to its row, column and square units and to its peers as flat tuples of ints
+"""
+
+from typing import Dict, Optional
+
+
+class Geometry:
+    """
+    The unit and peer index for one board size
+    box is the side of a square, size = box * box is the side of the board and cells = size * size
+    units lists all rows, then all columns, then all squares
+    cell_units[cell] is the (row, column, square) triple and peers[cell] every other cell sharing a unit
+    """
+
+    __slots__ = ('box', 'size', 'cells', 'all_digits', 'row_of', 'col_of', 'box_of',
+                 'rows', 'cols', 'boxes', 'units', 'cell_units', 'peers', 'popcount')
+
+    def __init__(self, box: int) -> None:
+        size = box * box
+        cells = size * size
+        self.box = box
+        self.size = size
+        self.cells = cells
+        self.all_digits = (1 << size) - 1
+
+        self.row_of = tuple(cell // size for cell in range(cells))
+        self.col_of = tuple(cell % size for cell in range(cells))
+        self.box_of = tuple((cell // size) // box * box + (cell % size) // box for cell in range(cells))
+
+        self.rows = tuple(tuple(k * size + j for j in range(size)) for k in range(size))
+        self.cols = tuple(tuple(i * size + k for i in range(size)) for k in range(size))
+        boxes = [[] for _ in range(size)]
+        for cell in range(cells):
+            boxes[self.box_of[cell]].append(cell)
+        self.boxes = tuple(tuple(members) for members in boxes)
+        self.units = self.rows + self.cols + self.boxes
+
+        self.cell_units = tuple(
+            (self.rows[self.row_of[cell]], self.cols[self.col_of[cell]], self.boxes[self.box_of[cell]])
+            for cell in range(cells)
+        )
+        self.peers = tuple(
+            tuple(sorted(set(row + col + square) - {cell}))
+            for cell, (row, col, square) in enumerate(self.cell_units)
+        )
+
+        # number of candidates in a mask, indexed by the mask. Too large to tabulate past 16 digits
+        self.popcount = tuple(bin(mask).count('1') for mask in range(self.all_digits + 1)) if size <= 16 else None
+
+
+_geometries: Dict[int, Geometry] = {}
+
+
+def geometry_for_box(box: int) -> Geometry:
+    """Returns the index for boards made of box by box squares, building it on first use"""
+    geometry = _geometries.get(box)
+    if geometry is None:
+        geometry = Geometry(box)
+        _geometries[box] = geometry
+    return geometry
+
+
+def geometry_for_size(size: int) -> Optional[Geometry]:
+    """Returns the index for a board with the given side length, or None if the side is not a square number"""
+    box = int(round(size ** 0.5))
+    if box < 1 or box * box != size:
+        return None
+    return geometry_for_box(box)
+
+
+STANDARD = geometry_for_box(3)
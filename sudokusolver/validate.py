@@ -0,0 +1,162 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Checking grids. UnitTracker follows a grid as digits are placed and removed, keeping a count of every digit in every
+row, column and square, so whether the grid is consistent or solved is known after each move without a rescan.
+validate_grid checks grids that are already filled in, many at a time
+"""
+
+from typing import Any, Iterable, List, Optional, Sequence
+
+from sudokusolver.symbols import default_symbols
+from sudokusolver.units import Geometry, STANDARD
+
+
+class UnitTracker:
+    """
+    The digits of a grid with per unit digit counts, updated in constant time by place and remove
+    units are numbered like geometry.units: rows, then columns, then squares
+    counts[unit * size + digit - 1] is the number of times digit is in unit and masks[unit] the digits present in it
+    conflicts is the number of digits that repeat a digit already in one of their units, counted once per unit
+    """
+
+    __slots__ = ('geometry', 'values', 'counts', 'masks', 'conflicts', 'filled')
+
+    def __init__(self, geometry: Geometry = STANDARD) -> None:
+        self.geometry = geometry
+        self.values = [0] * geometry.cells
+        self.counts = [0] * (3 * geometry.size * geometry.size)
+        self.masks = [0] * (3 * geometry.size)
+        self.conflicts = 0
+        self.filled = 0
+
+    @classmethod
+    def from_grid(cls, grid: Sequence[int], geometry: Geometry = STANDARD) -> 'UnitTracker':
+        """Builds a tracker from a flat list of digits, with 0 for empty cells"""
+        tracker = cls(geometry)
+        for cell, digit in enumerate(grid):
+            if digit:
+                tracker.place(cell, digit)
+        return tracker
+
+    def _units(self, cell: int) -> tuple:
+        """Returns the numbers of the row, column and square of a cell"""
+        geometry = self.geometry
+        size = geometry.size
+        return (geometry.row_of[cell], size + geometry.col_of[cell], 2 * size + geometry.box_of[cell])
+
+    def place(self, cell: int, digit: int) -> None:
+        """Puts a digit in a cell, replacing whatever was there. Conflicts are counted, not refused"""
+        if self.values[cell]:
+            self.remove(cell)
+        self.values[cell] = digit
+        self.filled += 1
+        bit = 1 << (digit - 1)
+        size = self.geometry.size
+        counts = self.counts
+        for unit in self._units(cell):
+            index = unit * size + digit - 1
+            counts[index] += 1
+            if counts[index] > 1:
+                self.conflicts += 1
+            self.masks[unit] |= bit
+
+    def remove(self, cell: int) -> int:
+        """Empties a cell, returning the digit it held or 0 if it was already empty"""
+        digit = self.values[cell]
+        if not digit:
+            return 0
+        self.values[cell] = 0
+        self.filled -= 1
+        size = self.geometry.size
+        counts = self.counts
+        for unit in self._units(cell):
+            index = unit * size + digit - 1
+            counts[index] -= 1
+            if counts[index] > 0:
+                self.conflicts -= 1
+            else:
+                self.masks[unit] &= ~(1 << (digit - 1))
+        return digit
+
+    def seen(self, cell: int) -> int:
+        """Returns the mask of the digits in the row, column and square of a cell, its own digit included"""
+        masks = self.masks
+        row, col, box = self._units(cell)
+        return masks[row] | masks[col] | masks[box]
+
+    def is_consistent(self) -> bool:
+        """Returns True when no digit repeats in a row, column or square"""
+        return self.conflicts == 0
+
+    def is_complete(self) -> bool:
+        """Returns True when every cell holds a digit"""
+        return self.filled == self.geometry.cells
+
+    def is_solution(self) -> bool:
+        """Returns True when the grid is filled in with no digit repeated in a unit, which makes it solved"""
+        return self.conflicts == 0 and self.filled == self.geometry.cells
+
+
+def grid_is_solution(grid: Sequence[int], geometry: Geometry = STANDARD) -> bool:
+    """Returns whether a flat list of digits is a solved grid: every row, column and square holds each digit once"""
+    if len(grid) != geometry.cells:
+        return False
+    size = geometry.size
+    bits = []
+    for digit in grid:
+        if not (isinstance(digit, int) and 1 <= digit <= size):
+            return False
+        bits.append(1 << (digit - 1))
+    return _units_full(bits, geometry)
+
+
+def _units_full(bits: List[int], geometry: Geometry) -> bool:
+    """Returns whether every unit of a grid of single digit bits holds every digit"""
+    all_digits = geometry.all_digits
+    for unit in geometry.units:
+        mask = 0
+        for cell in unit:
+            mask |= bits[cell]
+        if mask != all_digits:
+            return False
+    return True
+
+
+def validate_grid(grids: Any, geometry: Geometry = STANDARD, symbols: Optional[Sequence[str]] = None) -> Any:
+    """
+    Checks many filled in grids at once, returning whether each one is solved
+    grids may be a NumPy array of shape (N, cells) holding digits, which is checked with array operations and gives a
+    boolean array back, or any iterable of one line strings or flat digit sequences, which gives a list of bools.
+    Lines are read with the given single character symbols, the default ones for the board size if not given
+    """
+    if hasattr(grids, 'ndim'):
+        from sudokusolver.vectorized import validate_array
+        return validate_array(grids, geometry)
+    return list(iter_validate(grids, geometry, symbols))
+
+
+def iter_validate(grids: Iterable[Any], geometry: Geometry = STANDARD, symbols: Optional[Sequence[str]] = None) -> Iterable[bool]:
+    """Yields whether each grid is solved like validate_grid, one at a time so a stream of lines is never held in memory"""
+    bit_of = {symbol: 1 << digit for digit, symbol in enumerate(symbols or default_symbols(geometry.size))}
+    cells = geometry.cells
+    for grid in grids:
+        if isinstance(grid, str):
+            grid = grid.strip()
+            yield len(grid) == cells and _units_full([bit_of.get(character, 0) for character in grid], geometry)
+        else:
+            yield grid_is_solution(grid, geometry)
@@ -0,0 +1,211 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Constraint propagation on many boards at once with NumPy.
+Boards are packed into an (N, cells) array of candidate masks, naked and hidden singles are found with array
+operations over all rows, columns and squares of all boards, and boards that stall are finished by the depth first search.
+NumPy is an optional extra, install it with pip install sudokusolver[numpy]
+"""
+
+from typing import Any, Iterable, List, Optional, Tuple
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from sudokusolver.bitboard import BitBoard
+from sudokusolver.budget import Budget, BudgetExceeded
+from sudokusolver.search import search
+from sudokusolver.solver import puzzle_budget
+from sudokusolver.units import Geometry, STANDARD
+
+# board states reported by propagate
+STALLED = 0
+SOLVED = 1
+CONTRADICTION = 2
+
+
+def require_numpy() -> None:
+    """Raises ImportError with install instructions when NumPy is missing"""
+    if numpy is None:
+        raise ImportError("the numpy engine needs NumPy, install it with: pip install sudokusolver[numpy]")
+
+
+def pack_lines(lines: List[str], geometry: Geometry = STANDARD) -> Tuple[Any, Any]:
+    """
+    Packs puzzles in the one line format into an (N, cells) array of candidate masks
+    clues become a single bit and periods or zeros become every digit
+    returns the masks and a boolean array marking which lines were well formed
+    """
+    require_numpy()
+    cells = geometry.cells
+    count = len(lines)
+    codes = numpy.zeros((count, cells), dtype=numpy.uint8)
+    valid = numpy.zeros(count, dtype=bool)
+    for i, line in enumerate(lines):
+        if len(line) == cells:
+            raw = numpy.frombuffer(line.encode('ascii', 'replace'), dtype=numpy.uint8)
+            digits = raw - ord('0')
+            empty = (raw == ord('.')) | (digits == 0)
+            if numpy.all(empty | (digits <= geometry.size)):
+                codes[i] = numpy.where(empty, 0, digits)
+                valid[i] = True
+
+    shifts = numpy.maximum(codes.astype(numpy.int32) - 1, 0)
+    masks = numpy.where(codes > 0, numpy.left_shift(1, shifts), geometry.all_digits)
+    return masks.astype(numpy.int32), valid
+
+
+def _unit_index(geometry: Geometry) -> Tuple[Any, Any, Any]:
+    """Returns the row, column and square units of the geometry as (size, size) index arrays"""
+    return (numpy.array(geometry.rows), numpy.array(geometry.cols), numpy.array(geometry.boxes))
+
+
+def propagate(masks: Any, geometry: Geometry = STANDARD) -> Any:
+    """
+    Runs naked and hidden singles on every board in the (N, cells) mask array in place until none of them changes
+    returns an array holding STALLED, SOLVED or CONTRADICTION for each board
+    """
+    require_numpy()
+    count = masks.shape[0]
+    units = _unit_index(geometry)
+    state = numpy.full(count, STALLED, dtype=numpy.int8)
+    active = numpy.arange(count)
+
+    while active.size:
+        board = masks[active]
+        before = board.copy()
+        bad = numpy.zeros(active.size, dtype=bool)
+
+        # naked singles: clear every solved digit from the rest of its row, column and square
+        single = (board & (board - 1)) == 0
+        placed = numpy.where(single, board, 0)
+        peers_used = numpy.zeros_like(board)
+        for unit in units:
+            in_unit = placed[:, unit]
+            used = numpy.bitwise_or.reduce(in_unit, axis=2)
+            # two solved cells holding the same digit show up as a sum larger than the or
+            bad |= numpy.any(in_unit.sum(axis=2) != used, axis=1)
+            peers_used[:, unit] |= used[:, :, None]
+        board = numpy.where(single, board, board & ~peers_used)
+
+        # hidden singles: a digit with one place left in a unit goes there
+        # the candidates of the other cells in a unit are the or of the cells before and the cells after
+        forced = numpy.zeros_like(board)
+        for unit in units:
+            in_unit = board[:, unit]
+            before_cell = numpy.zeros_like(in_unit)
+            before_cell[:, :, 1:] = numpy.bitwise_or.accumulate(in_unit, axis=2)[:, :, :-1]
+            after_cell = numpy.zeros_like(in_unit)
+            after_cell[:, :, :-1] = numpy.bitwise_or.accumulate(in_unit[:, :, ::-1], axis=2)[:, :, -2::-1]
+            everywhere = before_cell[:, :, -1] | in_unit[:, :, -1]
+            bad |= numpy.any(everywhere != geometry.all_digits, axis=1)
+            forced[:, unit] |= in_unit & ~(before_cell | after_cell)
+        clash = (forced & (forced - 1)) != 0
+        bad |= numpy.any(clash, axis=1)
+        board = numpy.where(forced != 0, board & forced, board)
+        bad |= numpy.any(board == 0, axis=1)
+
+        masks[active] = board
+        done_single = numpy.all((board & (board - 1)) == 0, axis=1)
+        changed = numpy.any(board != before, axis=1)
+
+        state[active[bad]] = CONTRADICTION
+        state[active[~bad & done_single & ~changed]] = SOLVED
+        active = active[~bad & changed]
+    return state
+
+
+def solve_lines(lines: List[str], geometry: Geometry = STANDARD, timeout: float = 0.0, budget: Optional[Budget] = None) -> List[str]:
+    """
+    Solves puzzles in the one line format together
+    timeout and budget limit the search of each board that stalls, see sudokusolver.solver.puzzle_budget. The propagation
+    all the boards share is not charged to any of them
+    returns a result line for each in the format puzzle,solution,status where status is solved, unsolved, invalid or,
+    when the budget runs out, the reason it did. Then the solution is the most constrained board the search reached
+    """
+    require_numpy()
+    if not lines:
+        return []
+    masks, valid = pack_lines(lines, geometry)
+    state = propagate(masks, geometry)
+    # maps a mask to the character shown for it: its digit when down to one candidate, otherwise an empty space
+    symbols = numpy.full(geometry.all_digits + 1, ord('.'), dtype=numpy.uint8)
+    for digit in range(1, min(geometry.size, 9) + 1):
+        symbols[1 << (digit - 1)] = ord(str(digit))
+
+    results = []
+    for i, line in enumerate(lines):
+        if not valid[i]:
+            results.append(f"{line},,invalid")
+            continue
+        status = None
+        if state[i] == STALLED:
+            bit_board = BitBoard.from_candidates(masks[i].tolist(), geometry)
+            limits = puzzle_budget(budget, timeout)
+            if limits is not None:
+                limits.start()
+            try:
+                if bit_board is not None and search(bit_board, budget=limits) is not None:
+                    masks[i] = bit_board.cands
+                    state[i] = SOLVED
+            except BudgetExceeded:
+                status = limits.exceeded
+                best = BitBoard.from_list_board(limits.best) if limits.best is not None else None
+                if best is not None:
+                    masks[i] = best.cands
+        if status is None:
+            status = 'solved' if state[i] == SOLVED else 'unsolved'
+        solution = symbols[masks[i]].tobytes().decode('ascii')
+        results.append(f"{line},{solution},{status}")
+    return results
+
+
+def validate_array(grids: Any, geometry: Geometry = STANDARD, chunk_size: int = 65536) -> Any:
+    """
+    Checks an (N, cells) array of digits, returning a boolean array that is True for every row that is a solved grid
+    rows are checked chunk_size at a time so the temporary arrays stay small
+    """
+    require_numpy()
+    grids = numpy.asarray(grids)
+    if grids.ndim != 2 or grids.shape[1] != geometry.cells:
+        raise ValueError(f"expected an array of shape (N, {geometry.cells}), got {grids.shape}")
+    units = numpy.array(geometry.units)
+    result = numpy.zeros(len(grids), dtype=bool)
+    for start in range(0, len(grids), chunk_size):
+        chunk = grids[start:start + chunk_size].astype(numpy.int64)
+        in_range = numpy.all((chunk >= 1) & (chunk <= geometry.size), axis=1)
+        bits = numpy.left_shift(1, numpy.clip(chunk, 1, geometry.size) - 1)
+        full = numpy.bitwise_or.reduce(bits[:, units], axis=2) == geometry.all_digits
+        result[start:start + chunk_size] = in_range & numpy.all(full, axis=1)
+    return result
+
+
+def solve_batches(lines: Iterable[str], batch_size: int = 4096, geometry: Geometry = STANDARD, timeout: float = 0.0,
+                  budget: Optional[Budget] = None) -> Iterable[str]:
+    """
+    Solves a stream of one line puzzles batch_size at a time, yielding the result lines in input order
+    timeout and budget are passed on to solve_lines
+    """
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= batch_size:
+            yield from solve_lines(batch, geometry, timeout, budget)
+            batch = []
+    yield from solve_lines(batch, geometry, timeout, budget)
@@ -0,0 +1,62 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""
+Puzzles shared by the tests, in the one line format, a check that a result line solves its puzzle
+and a way to run the command line in process
+"""
+
+import contextlib
+import io
+import sys
+from typing import Tuple
+from unittest import mock
+
+from sudokusolver.cli import main
+from sudokusolver.validate import grid_is_solution
+
+# solved by naked and hidden singles alone
+EASY = '3........1..2..94.2...45.8.....82..9...4....575.9.1..251....72.6.2....9.87..2...3'
+EASY_SOLUTION = '384719256165238947297645381431582679926473815758961432513896724642357198879124563'
+# needs search, but only a little of it
+HARD = '1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1'
+HARD_SOLUTION = '174385962293467158586192734451923876928674315367851249719548623635219487842736591'
+# the top row of EASY taken out, which leaves six solutions
+MULTIPLE = '.........1..2..94.2...45.8.....82..9...4....575.9.1..251....72.6.2....9.87..2...3'
+# no clue repeats in a unit, but the techniques find the clues contradict each other
+CONTRADICTORY = '800000012300000060000040000900000500000001070020000000000350400001400800060000000'
+# no clue repeats in a unit and elimination finds nothing wrong, but there is no solution
+NO_SOLUTION = '1.......2.9.4...5...6...7...5.9.3.......7.......85.14.7.....6...3...9.8...2.....1'
+
+
+def solves(puzzle: str, solution: str) -> bool:
+    """Returns whether a 9x9 solution line is a solved grid that keeps every clue of the puzzle line"""
+    if len(solution) != 81 or not solution.isdigit():
+        return False
+    digits = [int(character) for character in solution]
+    return grid_is_solution(digits) and all(clue in '.0' or clue == given for clue, given in zip(puzzle, solution))
+
+
+def run_main(*argv: str) -> Tuple[int, str, str]:
+    """Runs sudokusolver with the given arguments, returning its exit status and what it printed to stdout and stderr"""
+    out, err = io.StringIO(), io.StringIO()
+    status = 0
+    with mock.patch.object(sys, 'argv', ['sudokusolver'] + list(argv)), contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+        try:
+            main()
+        except SystemExit as error:
+            status = error.code if isinstance(error.code, int) else 0 if error.code is None else 1
+    return status, out.getvalue(), err.getvalue()
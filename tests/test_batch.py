@@ -0,0 +1,80 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for batch solving of one puzzle per line files in sudokusolver.batch"""
+
+import io
+import os
+import tempfile
+import unittest
+
+from puzzles import CONTRADICTORY, EASY, HARD, MULTIPLE, NO_SOLUTION, solves
+from sudokusolver.batch import read_chunks, solve_batch
+from sudokusolver.solver import ENGINES, read_puzzle_lines
+
+
+def write_puzzles(lines) -> str:
+    handle, filename = tempfile.mkstemp(suffix='.txt')
+    with os.fdopen(handle, 'w') as puzzle_file:
+        puzzle_file.write("\n".join(lines) + "\n")
+    return filename
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.filename = self.write(['# a comment', EASY, '', HARD, 'not a puzzle'])
+
+    def write(self, lines) -> str:
+        filename = write_puzzles(lines)
+        self.addCleanup(os.remove, filename)
+        return filename
+
+    def solve(self, filename: str, **options):
+        out = io.StringIO()
+        solve_batch(filename, out, **options)
+        return [line.split(',') for line in out.getvalue().splitlines()]
+
+    def test_comments_and_blank_lines_are_skipped(self):
+        self.assertEqual(list(read_puzzle_lines(self.filename)), [EASY, HARD, 'not a puzzle'])
+
+    def test_a_result_line_per_puzzle(self):
+        for engine in ENGINES:
+            results = self.solve(self.filename, engine=engine)
+            self.assertEqual([puzzle for puzzle, _, _ in results], [EASY, HARD, 'not a puzzle'])
+            self.assertEqual([status for _, _, status in results], ['solved', 'solved', 'invalid'])
+            self.assertTrue(solves(EASY, results[0][1]))
+            self.assertTrue(solves(HARD, results[1][1]))
+            self.assertEqual(results[2][1], '')
+
+    def test_unsolvable_puzzles(self):
+        filename = self.write([NO_SOLUTION, CONTRADICTORY])
+        for engine in ENGINES:
+            # few guesses per roll keep the guess engine quick to give up
+            results = self.solve(filename, engine=engine, max_guesses=10)
+            self.assertEqual([status for _, _, status in results], ['unsolved', 'unsolved'])
+
+    def test_counting(self):
+        results = self.solve(self.write([HARD, MULTIPLE, NO_SOLUTION]), limit=2)
+        self.assertEqual(results, [[HARD, '1', 'unique'], [MULTIPLE, '2', 'multiple'], [NO_SOLUTION, '0', 'none']])
+
+    def test_chunks(self):
+        self.assertEqual(list(read_chunks(iter('abcde'), 2)), [['a', 'b'], ['c', 'd'], ['e']])
+        self.assertEqual(list(read_chunks(iter(''), 2)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
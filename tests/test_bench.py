@@ -0,0 +1,80 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the benchmark harness in sudokusolver.bench"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from puzzles import EASY, HARD
+from sudokusolver.bench import bench_main, compare_reports, load_puzzle_set, percentile, run_benchmarks
+
+
+class BenchTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w') as puzzle_file:
+            puzzle_file.write("# two puzzles\n" + EASY + "\n" + HARD + "\n")
+        self.addCleanup(os.remove, self.filename)
+        self.name = os.path.splitext(os.path.basename(self.filename))[0]
+
+    def test_bundled_sets_load(self):
+        self.assertIn(EASY, load_puzzle_set('easy'))
+        self.assertEqual(load_puzzle_set(self.filename), [EASY, HARD])
+
+    def test_percentile(self):
+        values = [float(value) for value in range(1, 101)]
+        self.assertEqual((percentile(values, 0.5), percentile(values, 0.99)), (50.0, 99.0))
+        self.assertEqual(percentile([], 0.5), 0.0)
+
+    def test_report(self):
+        report = run_benchmarks(['search', 'dlx'], [self.filename], repeat=2)
+        for engine in ('search', 'dlx'):
+            result = report["engines"][engine][self.name]
+            self.assertEqual((result["puzzles"], result["solved"]), (4, 4))
+            self.assertGreater(result["puzzles_per_second"], 0)
+            self.assertLessEqual(result["latency_ms"]["p50"], result["latency_ms"]["max"])
+            self.assertGreater(result["peak_memory_bytes"], 0)
+
+    def test_slower_throughput_is_a_regression(self):
+        baseline = {"engines": {"search": {"easy": {"puzzles_per_second": 100.0}, "hard": {"puzzles_per_second": 100.0}}}}
+        current = {"engines": {"search": {"easy": {"puzzles_per_second": 90.0}, "hard": {"puzzles_per_second": 50.0},
+                                          "new": {"puzzles_per_second": 1.0}}}}
+        regressions = compare_reports(current, baseline, 0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("search/hard"))
+
+    def test_bench_main_writes_json_and_compares(self):
+        out = self.filename + '.json'
+        self.addCleanup(os.remove, out)
+        with contextlib.redirect_stderr(io.StringIO()):
+            self.assertEqual(bench_main(['-e', 'search', '-s', self.filename, '-o', out]), 0)
+            with open(out) as report_file:
+                report = json.load(report_file)
+            self.assertEqual(report["engines"]["search"][self.name]["solved"], 2)
+            report["engines"]["search"][self.name]["puzzles_per_second"] *= 1000
+            with open(out, 'w') as report_file:
+                json.dump(report, report_file)
+            self.assertEqual(bench_main(['-e', 'search', '-s', self.filename, '-o', os.devnull, '-c', out]), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the binary board format and sudokusolver convert in sudokusolver.binary"""
+
+import contextlib
+import io
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from puzzles import EASY, EASY_SOLUTION, HARD
+from sudokusolver.binary import (FORMAT_BINARY, FORMAT_LINE, FORMAT_TEXT, FORMAT_VERSION, HEADER, MAGIC, MAX_BOX, MIN_BOX,
+                                 BinaryReader, BinaryWriter, convert_main, detect_format, pack_grid, record_size, unpack_record)
+from sudokusolver.solver import read_puzzle_lines
+from sudokusolver.symbols import default_symbols, format_board
+from sudokusolver.units import STANDARD, geometry_for_box, geometry_for_size
+from sudokusolver.vectorized import numpy
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def digits(line: str):
+    return [0 if character == '.' else int(character) for character in line]
+
+
+class TempFiles:
+    """Mixin that hands out temporary file names removed after the test"""
+
+    def temp_path(self, suffix: str = '') -> str:
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        os.close(handle)
+        os.remove(path)
+        self.addCleanup(lambda: os.path.exists(path) and os.remove(path))
+        return path
+
+    def temp_text(self, text: str) -> str:
+        path = self.temp_path('.txt')
+        with open(path, 'w') as text_file:
+            text_file.write(text)
+        return path
+
+
+class RecordTest(unittest.TestCase):
+
+    def test_pack_and_unpack(self):
+        record = pack_grid(digits(EASY))
+        self.assertEqual(len(record), record_size(STANDARD))
+        self.assertEqual(len(record), 41)
+        self.assertEqual(unpack_record(record), digits(EASY))
+
+    def test_pack_refuses_other_boards(self):
+        with self.assertRaises(ValueError):
+            pack_grid(digits(EASY)[:80])
+        with self.assertRaises(ValueError):
+            pack_grid([10] + digits(EASY)[1:])
+
+
+class BinaryFileTest(TempFiles, unittest.TestCase):
+
+    def test_round_trip_at_every_box_size(self):
+        rng = random.Random(18)
+        for box in range(MIN_BOX, MAX_BOX + 1):
+            geometry = geometry_for_box(box)
+            grids = [[rng.randint(0, geometry.size) for _ in range(geometry.cells)] for _ in range(3)]
+            grids.append([geometry.size] * geometry.cells)
+            path = self.temp_path('.sdkb')
+            with BinaryWriter(path, geometry) as writer:
+                for grid in grids:
+                    writer.write(grid)
+            with BinaryReader(path) as reader:
+                self.assertIs(reader.geometry, geometry)
+                self.assertEqual(len(reader), len(grids))
+                self.assertEqual(list(reader.grids()), grids, f"box size {box}")
+                self.assertEqual(unpack_record(reader.record(1), geometry), grids[1])
+                with self.assertRaises(IndexError):
+                    reader.record(len(grids))
+
+    def test_appending(self):
+        path = self.temp_path('.sdkb')
+        with BinaryWriter(path) as writer:
+            writer.write(digits(EASY))
+        with BinaryWriter(path) as writer:
+            writer.write(digits(EASY_SOLUTION))
+        with BinaryReader(path) as reader:
+            self.assertEqual(list(reader.grids()), [digits(EASY), digits(EASY_SOLUTION)])
+        with self.assertRaises(ValueError):
+            BinaryWriter(path, geometry_for_size(16))
+
+    def test_writer_refuses_box_sizes_the_reader_rejects(self):
+        for box in (MIN_BOX - 1, MAX_BOX + 1):
+            path = self.temp_path('.sdkb')
+            with self.assertRaises(ValueError):
+                # only the size is looked at, which spares building the unit index of a 256x256 board
+                BinaryWriter(path, SimpleNamespace(box=box, size=box * box))
+            self.assertFalse(os.path.exists(path))
+
+    def write_header(self, magic: bytes = MAGIC, version: int = FORMAT_VERSION, box: int = 3, bits: int = 4, size: int = 41) -> str:
+        path = self.temp_path('.sdkb')
+        with open(path, 'wb') as out_file:
+            out_file.write(HEADER.pack(magic, version, box, bits, size))
+        return path
+
+    def test_bad_headers(self):
+        BinaryReader(self.write_header()).close()
+        for header in ({"magic": b'NOPE'}, {"version": FORMAT_VERSION + 1}, {"box": 0}, {"box": 1}, {"box": 60},
+                       {"bits": 8}, {"size": 40}):
+            with self.assertRaises(ValueError, msg=str(header)):
+                BinaryReader(self.write_header(**header))
+        with self.assertRaises(ValueError):
+            BinaryReader(self.temp_text('SDKB'))
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_arrays(self):
+        for box in (3, 4):
+            geometry = geometry_for_box(box)
+            grids = numpy.random.RandomState(box).randint(0, geometry.size + 1, size=(5, geometry.cells))
+            path = self.temp_path('.sdkb')
+            with BinaryWriter(path, geometry) as writer:
+                writer.write_array(grids)
+            with BinaryReader(path) as reader:
+                self.assertEqual(reader.unpack_array().tolist(), grids.tolist())
+                self.assertEqual(reader.array().shape, (5, record_size(geometry)))
+        with BinaryWriter(self.temp_path('.sdkb')) as writer:
+            with self.assertRaises(ValueError):
+                writer.write_array(numpy.full((1, 81), 10))
+
+
+class FormatTest(TempFiles, unittest.TestCase):
+
+    def test_detect_format(self):
+        path = self.temp_path('.sdkb')
+        with BinaryWriter(path) as writer:
+            writer.write(digits(EASY))
+        self.assertEqual(detect_format(path), FORMAT_BINARY)
+        self.assertEqual(detect_format(self.temp_text("# puzzles\n" + EASY + "\n")), FORMAT_LINE)
+        board = format_board(digits(EASY), STANDARD, default_symbols(9))
+        self.assertEqual(detect_format(self.temp_text(board + "\n")), FORMAT_TEXT)
+
+    def test_detect_format_with_a_size(self):
+        # every row of a 16x16 board with 16 characters looks like a 4x4 board in the one line format
+        rows = self.temp_text("\n".join('.' * 16 for _ in range(16)) + "\n")
+        self.assertEqual(detect_format(rows), FORMAT_LINE)
+        self.assertEqual(detect_format(rows, size=16), FORMAT_TEXT)
+
+    def test_batch_reads_binary_files(self):
+        path = self.temp_path('.sdkb')
+        with BinaryWriter(path) as writer:
+            writer.write(digits(EASY))
+            writer.write(digits(HARD))
+        self.assertEqual(list(read_puzzle_lines(path)), [EASY, HARD])
+
+
+class ConvertTest(TempFiles, unittest.TestCase):
+
+    def convert(self, *argv: str):
+        out, err = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            status = convert_main(list(argv))
+        return status, out.getvalue(), err.getvalue()
+
+    def test_round_trip_through_every_format(self):
+        lines = self.temp_text(f"{EASY},{EASY_SOLUTION},solved\nnot a board\n{HARD}\n")
+        binary = self.temp_path('.sdkb')
+        status, _, err = self.convert(lines, '--to', 'binary', '-o', binary)
+        self.assertEqual(status, 0)
+        self.assertIn("2 boards converted, 1 skipped", err)
+        text = self.temp_path('.txt')
+        self.assertEqual(self.convert(binary, '--to', 'text', '-o', text)[0], 0)
+        self.assertEqual(self.convert(text), (0, f"{EASY}\n{HARD}\n", ''))
+        self.assertEqual(self.convert(lines, '--solutions')[1].splitlines()[0], EASY_SOLUTION)
+
+    def test_errors(self):
+        self.assertEqual(self.convert(self.temp_text(EASY + "\n"), '--size', '16')[0], 0)
+        binary = self.temp_path('.sdkb')
+        self.convert(self.temp_text(EASY + "\n"), '--to', 'binary', '-o', binary)
+        status, _, err = self.convert(binary, '--size', '16')
+        self.assertEqual(status, 1)
+        self.assertIn("holds 9x9 boards", err)
+
+    def test_reading_a_pipe(self):
+        result = subprocess.run([sys.executable, '-m', 'sudokusolver', 'convert', '/dev/stdin'], input=f"{EASY}\n{HARD}\n",
+                                stdout=subprocess.PIPE, universal_newlines=True, cwd=ROOT, check=True)
+        self.assertEqual(result.stdout, f"{EASY}\n{HARD}\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the bitmask board in sudokusolver.bitboard"""
+
+import unittest
+
+from puzzles import EASY, EASY_SOLUTION
+from sudokusolver.bitboard import BitBoard, digits_to_mask, mask_to_digits
+from sudokusolver.solver import E, parse_puzzle_line
+
+
+class MaskTest(unittest.TestCase):
+
+    def test_masks_round_trip(self):
+        self.assertEqual(digits_to_mask([1, 3, 9]), 0b100000101)
+        self.assertEqual(mask_to_digits(0b100000101), [1, 3, 9])
+        self.assertEqual(mask_to_digits(0), [])
+
+
+class BitBoardTest(unittest.TestCase):
+
+    def test_propagate_solves_a_singles_puzzle(self):
+        bit_board = BitBoard.from_list_board(parse_puzzle_line(EASY))
+        self.assertTrue(bit_board.propagate())
+        self.assertTrue(bit_board.is_solved())
+        self.assertEqual(''.join(map(str, bit_board.values)), EASY_SOLUTION)
+
+    def test_givens_remove_candidates_from_peers(self):
+        bit_board = BitBoard.from_list_board(parse_puzzle_line(EASY))
+        # the 3 in the top left corner is gone from its row, column and square
+        for cell in (1, 8, 9, 72, 10, 20):
+            self.assertFalse(bit_board.cands[cell] & (1 << 2), cell)
+        self.assertEqual(bit_board.values[0], 3)
+
+    def test_repeated_clue_is_refused(self):
+        board = parse_puzzle_line('33' + '.' * 79)
+        self.assertIsNone(BitBoard.from_list_board(board))
+
+    def test_malformed_board_is_refused(self):
+        self.assertIsNone(BitBoard.from_list_board([[1, 2], [E]]))
+        self.assertIsNone(BitBoard.from_list_board([[10] + [E] * 8] + [[E] * 9] * 8))
+
+    def test_place_refuses_a_digit_that_is_not_a_candidate(self):
+        bit_board = BitBoard.from_list_board(parse_puzzle_line(EASY))
+        self.assertFalse(bit_board.place(1, 3))
+
+    def test_place_reports_a_peer_left_without_candidates(self):
+        bit_board = BitBoard()
+        bit_board.cands[1] = 1 << 4
+        self.assertFalse(bit_board.place(0, 5))
+
+    def test_save_and_restore(self):
+        bit_board = BitBoard.from_list_board(parse_puzzle_line(EASY))
+        state = bit_board.save()
+        bit_board.propagate()
+        bit_board.restore(state)
+        self.assertEqual(bit_board.unsolved, EASY.count('.'))
+        self.assertEqual(bit_board.values[1], 0)
+
+    def test_list_board_round_trip(self):
+        bit_board = BitBoard.from_list_board(parse_puzzle_line(EASY))
+        board = bit_board.to_list_board()
+        self.assertEqual(board[0][0], 3)
+        self.assertIsInstance(board[0][1], list)
+        again = BitBoard.from_list_board(board)
+        self.assertEqual(again.cands, bit_board.cands)
+
+
+if __name__ == '__main__':
+    unittest.main()
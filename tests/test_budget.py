@@ -0,0 +1,142 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for per solve budgets in sudokusolver.budget and how every engine keeps to them"""
+
+import os
+import tempfile
+import unittest
+
+from puzzles import EASY, HARD, NO_SOLUTION, run_main
+from sudokusolver.budget import MEMORY_LIMIT, NODE_LIMIT, TIMEOUT, Budget, BudgetExceeded
+from sudokusolver.solver import ENGINES, MAX_ROLLS, board_to_line, parse_puzzle_line, solve_puzzle_line, solve_reasonable_sudoku
+
+
+def keeps_clues(puzzle: str, partial: str) -> bool:
+    return len(partial) == len(puzzle) and all(clue == '.' or clue == cell for clue, cell in zip(puzzle, partial))
+
+
+class BudgetTest(unittest.TestCase):
+
+    def test_limits(self):
+        budget = Budget(nodes=2, memory=100)
+        self.assertTrue(budget.is_limited())
+        self.assertFalse(Budget().is_limited())
+        budget.spend(2)
+        with self.assertRaises(BudgetExceeded) as raised:
+            budget.spend()
+        self.assertEqual((raised.exception.reason, budget.exceeded), (NODE_LIMIT, NODE_LIMIT))
+        budget.start()
+        budget.hold(100)
+        with self.assertRaises(BudgetExceeded):
+            budget.hold(101)
+        self.assertEqual((budget.exceeded, budget.peak_memory), (MEMORY_LIMIT, 101))
+
+    def test_deadline(self):
+        budget = Budget(seconds=1e-9)
+        with self.assertRaises(BudgetExceeded):
+            budget.check_time()
+        self.assertEqual(budget.exceeded, TIMEOUT)
+
+    def test_copy_keeps_the_shorter_time(self):
+        budget = Budget(10.0, 5, 7)
+        copy = budget.copy()
+        self.assertIsNot(copy, budget)
+        self.assertEqual((copy.seconds, copy.max_nodes, copy.max_memory), (10.0, 5, 7))
+        self.assertEqual(budget.copy(2.0).seconds, 2.0)
+        self.assertEqual(budget.copy(20.0).seconds, 10.0)
+        self.assertEqual(Budget().copy(3.0).seconds, 3.0)
+
+    def test_the_most_constrained_board_is_kept(self):
+        budget = Budget()
+        self.assertTrue(budget.improves(50))
+        budget.keep([[1]], 50)
+        self.assertFalse(budget.improves(60))
+        self.assertTrue(budget.improves(40))
+
+
+class EngineBudgetTest(unittest.TestCase):
+
+    def solve(self, puzzle: str, engine: str, budget: Budget):
+        [board, solved, stats] = solve_reasonable_sudoku(parse_puzzle_line(puzzle), engine, return_stats=True, budget=budget)
+        self.assertFalse(solved)
+        self.assertTrue(keeps_clues(puzzle, board_to_line(board)), engine)
+        return stats
+
+    def test_node_limit(self):
+        for engine in ENGINES:
+            budget = Budget(nodes=1)
+            self.assertEqual(self.solve(HARD, engine, budget).exceeded, NODE_LIMIT, engine)
+            self.assertIsNotNone(budget.best, engine)
+
+    def test_memory_limit(self):
+        for engine in ENGINES:
+            budget = Budget(memory=1)
+            self.assertEqual(self.solve(HARD, engine, budget).exceeded, MEMORY_LIMIT, engine)
+
+    def test_timeout(self):
+        for engine in ENGINES:
+            self.assertEqual(self.solve(HARD, engine, Budget(seconds=1e-9)).exceeded, TIMEOUT, engine)
+
+    def test_enough_budget(self):
+        for engine in ENGINES:
+            budget = Budget(60.0, 10 ** 6, 10 ** 9)
+            [board, solved] = solve_reasonable_sudoku(parse_puzzle_line(HARD), engine, budget=budget)
+            self.assertTrue(solved)
+            self.assertIsNone(budget.exceeded)
+            self.assertGreater(budget.nodes, 0)
+
+    def test_no_search_needed(self):
+        self.assertEqual(solve_puzzle_line(EASY, budget=Budget(nodes=1)).rsplit(',', 1)[1], 'solved')
+
+    def test_result_line_statuses(self):
+        for engine in ENGINES:
+            puzzle, partial, status = solve_puzzle_line(HARD, engine, budget=Budget(nodes=1)).split(',')
+            self.assertEqual(status, NODE_LIMIT)
+            self.assertTrue(keeps_clues(HARD, partial))
+
+
+class GuessRollsTest(unittest.TestCase):
+
+    def test_rolls_are_bounded(self):
+        [board, solved, stats] = solve_reasonable_sudoku(parse_puzzle_line(NO_SOLUTION), 'guess', return_stats=True, max_guesses=5)
+        self.assertFalse(solved)
+        self.assertEqual(stats.rerolls, MAX_ROLLS)
+
+    def test_a_node_budget_replaces_the_roll_bound(self):
+        budget = Budget(nodes=MAX_ROLLS * 10)
+        [board, solved, stats] = solve_reasonable_sudoku(parse_puzzle_line(NO_SOLUTION), 'guess', return_stats=True, budget=budget,
+                                                         max_guesses=5)
+        self.assertEqual(stats.exceeded, NODE_LIMIT)
+        self.assertGreater(stats.rerolls, MAX_ROLLS)
+
+
+class CommandLineTest(unittest.TestCase):
+
+    def test_stopped_early(self):
+        handle, filename = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w') as puzzle_file:
+            puzzle_file.write(HARD + "\n")
+        self.addCleanup(os.remove, filename)
+        status, out, _ = run_main(filename, '--max-nodes', '1')
+        self.assertEqual(status, 0)
+        self.assertIn("Stopped early: node-limit", out)
+        status, _, err = run_main(filename, '--max-nodes', '-1')
+        self.assertEqual(status, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
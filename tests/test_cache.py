@@ -0,0 +1,120 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the solution cache in sudokusolver.cache"""
+
+import os
+import tempfile
+import unittest
+
+from puzzles import EASY, HARD, run_main, solves
+from sudokusolver.cache import SolutionCache, canonical_form
+from sudokusolver.solver import board_to_line, parse_puzzle_line, solve_cached_sudoku
+from sudokusolver.units import STANDARD
+
+
+def relabel(line: str) -> str:
+    return line.translate(str.maketrans('123456789', '917352486'))
+
+
+def transpose(line: str) -> str:
+    return ''.join(line[c * 9 + r] for r in range(9) for c in range(9))
+
+
+def shuffle_lines(line: str) -> str:
+    """Swaps the first two bands and the first two rows of the last band"""
+    rows = [line[r * 9:r * 9 + 9] for r in range(9)]
+    rows = rows[3:6] + rows[0:3] + [rows[7], rows[6], rows[8]]
+    return ''.join(rows)
+
+
+def canonical_key(line: str) -> str:
+    return canonical_form([0 if character == '.' else int(character) for character in line], STANDARD)[0]
+
+
+class CanonicalFormTest(unittest.TestCase):
+
+    def test_variants_share_a_key(self):
+        key = canonical_key(HARD)
+        for variant in (relabel(HARD), transpose(HARD), shuffle_lines(HARD), transpose(relabel(shuffle_lines(HARD)))):
+            self.assertEqual(canonical_key(variant), key)
+
+    def test_different_puzzles_have_different_keys(self):
+        self.assertNotEqual(canonical_key(EASY), canonical_key(HARD))
+
+
+class SolutionCacheTest(unittest.TestCase):
+
+    def solve(self, line: str, cache: SolutionCache):
+        [board, solved, stats] = solve_cached_sudoku(parse_puzzle_line(line), cache, return_stats=True)
+        self.assertTrue(solved)
+        self.assertTrue(solves(line, board_to_line(board)))
+        return stats
+
+    def test_a_variant_is_a_hit(self):
+        cache = SolutionCache()
+        self.assertFalse(self.solve(HARD, cache).cached)
+        for variant in (relabel(HARD), transpose(HARD), shuffle_lines(HARD)):
+            stats = self.solve(variant, cache)
+            self.assertTrue(stats.cached)
+            self.assertEqual(stats.guesses, 0)
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = SolutionCache(max_entries=2)
+        cache.put('a', '1')
+        cache.put('b', '2')
+        cache.get('a')
+        cache.put('c', '3')
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), ('1', None, '3'))
+        self.assertEqual(cache.counters(), {"hits": 3, "misses": 1, "uncacheable": 0, "entries": 2})
+
+    def test_sqlite_file_keeps_solutions(self):
+        handle, path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        cache = SolutionCache(path=path)
+        self.solve(HARD, cache)
+        cache.close()
+        cache = SolutionCache(path=path)
+        self.assertTrue(self.solve(transpose(HARD), cache).cached)
+        cache.close()
+
+
+class CommandLineTest(unittest.TestCase):
+
+    def test_a_cache_hit_is_not_rated(self):
+        handle, filename = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w') as puzzle_file:
+            puzzle_file.write(HARD + "\n")
+        self.addCleanup(os.remove, filename)
+        database = filename + '.db'
+        self.addCleanup(os.remove, database)
+
+        status, out, _ = run_main(filename, '-q', '--stats', '--cache-db', database)
+        self.assertEqual(status, 0)
+        self.assertIn("Difficulty: extreme", out)
+        self.assertIn("Cache: 0 hits, 1 misses", out)
+
+        status, out, _ = run_main(filename, '-q', '--stats', '--cache-db', database)
+        self.assertEqual(status, 0)
+        self.assertIn("Cache hit: the solution was looked up, not solved", out)
+        self.assertIn("Difficulty: not rated for a cache hit", out)
+        self.assertIn("Cache: 1 hits, 0 misses", out)
+
+
+if __name__ == '__main__':
+    unittest.main()
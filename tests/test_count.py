@@ -0,0 +1,84 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for counting solutions and checking uniqueness"""
+
+import os
+import tempfile
+import unittest
+
+from puzzles import CONTRADICTORY, EASY, HARD, MULTIPLE, NO_SOLUTION, run_main
+from sudokusolver.budget import Budget
+from sudokusolver.solver import count_puzzle_line, count_solutions, parse_puzzle_line
+
+
+class CountSolutionsTest(unittest.TestCase):
+
+    def count(self, line: str, limit: int = 2, budget: Budget = None) -> int:
+        return count_solutions(parse_puzzle_line(line), limit, budget)
+
+    def test_counts(self):
+        self.assertEqual(self.count(HARD), 1)
+        self.assertEqual(self.count(MULTIPLE), 2)
+        self.assertEqual(self.count(MULTIPLE, limit=0), 6)
+        self.assertEqual(self.count(MULTIPLE, limit=4), 4)
+        self.assertEqual(self.count(NO_SOLUTION), 0)
+        self.assertEqual(self.count(CONTRADICTORY), 0)
+
+    def test_a_clash_has_no_solution(self):
+        self.assertEqual(self.count('11' + EASY[2:]), 0)
+
+    def test_result_lines(self):
+        self.assertEqual(count_puzzle_line(EASY), f"{EASY},1,unique")
+        self.assertEqual(count_puzzle_line(MULTIPLE, limit=0), f"{MULTIPLE},6,multiple")
+        self.assertEqual(count_puzzle_line(NO_SOLUTION), f"{NO_SOLUTION},0,none")
+        self.assertEqual(count_puzzle_line('short'), "short,,invalid")
+
+    def test_budget(self):
+        self.assertEqual(count_puzzle_line(MULTIPLE, limit=0, budget=Budget(nodes=3)), f"{MULTIPLE},1,node-limit")
+
+
+class CommandLineTest(unittest.TestCase):
+
+    def run_on(self, line: str, *argv: str):
+        handle, filename = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w') as puzzle_file:
+            puzzle_file.write(line + "\n")
+        self.addCleanup(os.remove, filename)
+        return run_main(filename, *argv)
+
+    def test_count(self):
+        self.assertEqual(self.run_on(MULTIPLE, '--count', '0')[:2], (0, "Solutions: 6\n"))
+        self.assertEqual(self.run_on(MULTIPLE, '--count', '3')[:2], (0, "Solutions: 3 (stopped at the limit)\n"))
+
+    def test_unique(self):
+        self.assertEqual(self.run_on(HARD, '--unique')[:2], (0, "Unique: yes\n"))
+        self.assertEqual(self.run_on(MULTIPLE, '--unique')[:2], (1, "Unique: no, it has several solutions\n"))
+        self.assertEqual(self.run_on(NO_SOLUTION, '--unique')[:2], (1, "Unique: no, it has no solution\n"))
+
+    def test_unique_runs_out_of_nodes(self):
+        status, out, _ = self.run_on(MULTIPLE, '--unique', '--max-nodes', '3')
+        self.assertEqual(status, 1)
+        self.assertIn("Unique: unknown", out)
+
+    def test_bad_limit(self):
+        status, _, err = self.run_on(EASY, '--count', '-1')
+        self.assertEqual(status, 2)
+        self.assertIn("--count needs a limit of 0 or more", err)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for solving without a terminal and the live display in sudokusolver.cli"""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from puzzles import HARD, HARD_SOLUTION, run_main
+from sudokusolver import cli
+from sudokusolver.solver import ENGINES, parse_puzzle_line, solve_reasonable_sudoku
+
+
+class QuietSolveTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w') as puzzle_file:
+            puzzle_file.write(HARD + "\n")
+        self.addCleanup(os.remove, self.filename)
+
+    def test_the_library_prints_nothing(self):
+        for engine in ENGINES:
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                [board, solved] = solve_reasonable_sudoku(parse_puzzle_line(HARD), engine)
+            self.assertTrue(solved)
+            self.assertEqual(out.getvalue(), '')
+
+    def test_progress_goes_to_the_callback(self):
+        for engine in ('search', 'guess'):
+            stages = []
+            solve_reasonable_sudoku(parse_puzzle_line(HARD), engine, lambda board, status: stages.append(status["stage"]))
+            self.assertTrue(stages)
+
+    def test_quiet_prints_nothing(self):
+        solution_file = self.filename + '.out'
+        status, out, err = run_main(self.filename, '-q', '-o', solution_file)
+        self.addCleanup(os.remove, solution_file)
+        self.assertEqual((status, out, err), (0, '', ''))
+        with open(solution_file) as out_file:
+            written = ''.join(character for character in out_file.read() if character.isdigit())
+        self.assertEqual(written, HARD_SOLUTION)
+
+    def test_solved_board_is_printed_once(self):
+        status, out, _ = run_main(self.filename)
+        self.assertEqual(status, 0)
+        self.assertIn("Done... Solved: True", out)
+        self.assertNotIn(cli.ESC, out)
+
+    def test_live_display_drops_fast_redraws(self):
+        display = cli.LiveDisplay(refresh_rate=1.0)
+        board = mock.Mock()
+        board.to_list_board.return_value = parse_puzzle_line(HARD)
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            for nodes in range(100):
+                display(board, {"stage": "search", "depth": 1, "nodes": nodes})
+        self.assertEqual(out.getvalue().count("Searching..."), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the Dancing Links engine in sudokusolver.dlx"""
+
+import unittest
+
+from puzzles import CONTRADICTORY, EASY, EASY_SOLUTION, HARD, HARD_SOLUTION, MULTIPLE, NO_SOLUTION
+from sudokusolver.bitboard import BitBoard
+from sudokusolver.dlx import DancingLinks, exact_cover_solutions, solve_exact_cover
+from sudokusolver.solver import ENGINE_DLX, parse_puzzle_line, solve_reasonable_sudoku
+
+
+def bit_board(line: str) -> BitBoard:
+    return BitBoard.from_list_board(parse_puzzle_line(line))
+
+
+class DancingLinksTest(unittest.TestCase):
+
+    def test_small_exact_cover(self):
+        # Knuth's example: rows 0, 3 and 4 cover the seven columns exactly once
+        matrix = DancingLinks(7)
+        for row, columns in enumerate([[3, 5, 6], [1, 4, 7], [2, 3, 6], [1, 4], [2, 7], [4, 5, 7]]):
+            matrix.add_row(row, columns)
+        self.assertEqual([sorted(solution) for solution in matrix.solutions()], [[0, 3, 4]])
+
+    def test_solves_puzzles(self):
+        for puzzle, solution in ((EASY, EASY_SOLUTION), (HARD, HARD_SOLUTION)):
+            solved = solve_exact_cover(bit_board(puzzle))
+            self.assertEqual(''.join(map(str, solved.values)), solution)
+            self.assertTrue(solved.is_solved())
+
+    def test_every_solution_is_found(self):
+        self.assertEqual(len(list(exact_cover_solutions(bit_board(MULTIPLE)))), 6)
+
+    def test_no_solution(self):
+        self.assertIsNone(solve_exact_cover(bit_board(NO_SOLUTION)))
+
+    def test_engine_reports_unsolvable_input(self):
+        for puzzle in (NO_SOLUTION, CONTRADICTORY):
+            board, solved = solve_reasonable_sudoku(parse_puzzle_line(puzzle), ENGINE_DLX)
+            self.assertFalse(solved)
+
+
+if __name__ == '__main__':
+    unittest.main()
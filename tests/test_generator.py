@@ -0,0 +1,63 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the puzzle generator in sudokusolver.generator"""
+
+import contextlib
+import io
+import unittest
+
+from puzzles import CONTRADICTORY, NO_SOLUTION, solves
+from sudokusolver.generator import generate_lines, generate_main, rate_difficulty
+from sudokusolver.solver import count_solutions, parse_puzzle_line
+
+
+def grid(line: str):
+    return [0 if character in '.0' else int(character) for character in line]
+
+
+class GenerateTest(unittest.TestCase):
+
+    def test_puzzles_are_unique_and_rated_as_asked(self):
+        for difficulty in ('easy', 'medium', 'hard', 'extreme'):
+            [line] = generate_lines(1, difficulty, seed='tests', with_solution=True)
+            puzzle, solution, rating = line.split(',')
+            self.assertEqual(rating, difficulty)
+            self.assertTrue(solves(puzzle, solution))
+            self.assertEqual(count_solutions(parse_puzzle_line(puzzle)), 1)
+            self.assertEqual(rate_difficulty(grid(puzzle)), difficulty)
+
+    def test_a_seed_is_reproducible(self):
+        self.assertEqual(generate_lines(3, 'easy', seed='same'), generate_lines(3, 'easy', seed='same'))
+        self.assertNotEqual(generate_lines(3, 'easy', seed='same'), generate_lines(3, 'easy', seed='other'))
+
+    def test_rate_difficulty_of_a_puzzle_with_no_solution(self):
+        self.assertIsNone(rate_difficulty(grid(NO_SOLUTION)))
+        self.assertIsNone(rate_difficulty(grid(CONTRADICTORY)))
+        self.assertIsNone(rate_difficulty(grid('11' + '.' * 79)))
+
+    def test_generate_main(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.assertEqual(generate_main(['-n', '3', '-d', 'easy', '--seed', 'cli']), 0)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        for line in lines:
+            self.assertEqual(count_solutions(parse_puzzle_line(line)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
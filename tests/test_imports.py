@@ -0,0 +1,71 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the lazy package API in sudokusolver and what importing it loads"""
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from puzzles import EASY, EASY_SOLUTION
+import sudokusolver
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# modules that only some commands need, so importing the package or the command line must not load them
+HEAVY = ['numpy', 'asyncio', 'sqlite3', 'concurrent.futures', 'cProfile', 'sudokusolver.server', 'sudokusolver.cache',
+         'sudokusolver.vectorized', 'sudokusolver.batch', 'sudokusolver.generator']
+
+
+def loaded_after(statement: str):
+    """Runs statement in a fresh interpreter and returns which of the HEAVY modules it loaded"""
+    script = f"import sys, json\n{statement}\nprint(json.dumps([name for name in {HEAVY!r} if name in sys.modules]))"
+    result = subprocess.run([sys.executable, '-c', script], stdout=subprocess.PIPE, universal_newlines=True, cwd=ROOT, check=True)
+    return json.loads(result.stdout)
+
+
+class ImportTest(unittest.TestCase):
+
+    def test_the_package_loads_only_the_version(self):
+        script = "import sys, sudokusolver\nprint(sorted(name for name in sys.modules if name.startswith('sudokusolver')))"
+        result = subprocess.run([sys.executable, '-c', script], stdout=subprocess.PIPE, universal_newlines=True, cwd=ROOT, check=True)
+        self.assertEqual(result.stdout.strip(), "['sudokusolver', 'sudokusolver.version']")
+
+    def test_solving_loads_nothing_heavy(self):
+        self.assertEqual(loaded_after(f"import sudokusolver\nsudokusolver.solve(sudokusolver.parse_puzzle_line('{EASY}'))"), [])
+
+    def test_the_command_line_loads_nothing_heavy(self):
+        self.assertEqual(loaded_after("import sudokusolver.cli"), [])
+
+    def test_lazy_exports(self):
+        [board, solved] = sudokusolver.solve(sudokusolver.parse_puzzle_line(EASY))
+        self.assertTrue(solved)
+        self.assertEqual(sudokusolver.board_to_line(board), EASY_SOLUTION)
+        self.assertIs(sudokusolver.Budget, sudokusolver.budget.Budget)
+        self.assertIn('BinaryReader', dir(sudokusolver))
+        with self.assertRaises(AttributeError):
+            sudokusolver.no_such_name
+
+    def test_running_the_package(self):
+        result = subprocess.run([sys.executable, '-m', 'sudokusolver', '--version'], stdout=subprocess.PIPE, universal_newlines=True,
+                                cwd=ROOT, check=True)
+        self.assertIn(sudokusolver.VERSION, result.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for multi-process batch solving in sudokusolver.batch"""
+
+import io
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from puzzles import EASY, HARD, MULTIPLE, NO_SOLUTION, solves
+from sudokusolver import batch
+from sudokusolver.batch import solve_batch_parallel
+
+PARENT = os.getpid()
+real_solve_puzzle_line = batch.solve_puzzle_line
+
+
+def crash_on_hard(line: str, *args) -> str:
+    """Stands in for solve_puzzle_line, killing the worker process on HARD"""
+    if line == HARD and os.getpid() != PARENT:
+        os._exit(3)
+    return real_solve_puzzle_line(line, *args)
+
+
+class ParallelTest(unittest.TestCase):
+
+    def setUp(self):
+        self.lines = [EASY, HARD, 'not a puzzle', EASY, HARD, EASY, MULTIPLE]
+        handle, self.filename = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w') as puzzle_file:
+            puzzle_file.write("\n".join(self.lines) + "\n")
+        self.addCleanup(os.remove, self.filename)
+
+    def solve(self, **options):
+        out = io.StringIO()
+        solve_batch_parallel(self.filename, out, jobs=2, chunk_size=2, **options)
+        return [line.split(',') for line in out.getvalue().splitlines()]
+
+    def test_ordered_results(self):
+        results = self.solve(ordered=True)
+        self.assertEqual([puzzle for puzzle, _, _ in results], self.lines)
+        self.assertEqual([status for _, _, status in results], ['solved', 'solved', 'invalid', 'solved', 'solved', 'solved', 'solved'])
+        for puzzle, solution, status in results:
+            if status == 'solved':
+                self.assertTrue(solves(puzzle, solution))
+
+    def test_unordered_results_cover_every_puzzle(self):
+        results = self.solve()
+        self.assertEqual(sorted(puzzle for puzzle, _, _ in results), sorted(self.lines))
+
+    def test_counting(self):
+        results = self.solve(ordered=True, limit=2)
+        self.assertEqual([status for _, _, status in results], ['unique', 'unique', 'invalid', 'unique', 'unique', 'unique', 'multiple'])
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', "the crash is injected into forked workers")
+    def test_a_crashing_puzzle_is_isolated(self):
+        with mock.patch.object(batch, 'solve_puzzle_line', crash_on_hard):
+            results = self.solve(ordered=True)
+        self.assertEqual([puzzle for puzzle, _, _ in results], self.lines)
+        self.assertEqual([status for _, _, status in results], ['solved', 'error', 'invalid', 'solved', 'error', 'solved', 'solved'])
+
+    def test_unsolvable_puzzle(self):
+        with open(self.filename, 'w') as puzzle_file:
+            puzzle_file.write(NO_SOLUTION + "\n")
+        [[puzzle, _, status]] = self.solve()
+        self.assertEqual((puzzle, status), (NO_SOLUTION, 'unsolved'))
+
+
+if __name__ == '__main__':
+    unittest.main()
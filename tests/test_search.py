@@ -0,0 +1,73 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the depth first search engine in sudokusolver.search"""
+
+import random
+import unittest
+
+from puzzles import HARD, HARD_SOLUTION, MULTIPLE, NO_SOLUTION, solves
+from sudokusolver.bitboard import BitBoard
+from sudokusolver.search import count_solutions, search
+from sudokusolver.solver import ENGINE_SEARCH, board_to_line, parse_puzzle_line, solve_reasonable_sudoku
+from sudokusolver.stats import SolveStats
+
+
+def bit_board(line: str, stats: SolveStats = None) -> BitBoard:
+    return BitBoard.from_list_board(parse_puzzle_line(line), stats)
+
+
+class SearchTest(unittest.TestCase):
+
+    def test_search_solves_a_hard_puzzle(self):
+        solved = search(bit_board(HARD))
+        self.assertIsNotNone(solved)
+        self.assertEqual(''.join(map(str, solved.values)), HARD_SOLUTION)
+
+    def test_search_is_deterministic(self):
+        first, second = SolveStats(), SolveStats()
+        search(bit_board(HARD, first))
+        search(bit_board(HARD, second))
+        self.assertGreater(first.guesses, 0)
+        self.assertEqual((first.guesses, first.backtracks), (second.guesses, second.backtracks))
+
+    def test_random_order_still_solves(self):
+        solved = search(bit_board(HARD), rng=random.Random(7))
+        self.assertEqual(''.join(map(str, solved.values)), HARD_SOLUTION)
+
+    def test_no_solution(self):
+        self.assertIsNone(search(bit_board(NO_SOLUTION)))
+
+    def test_progress_is_reported(self):
+        calls = []
+        search(bit_board(HARD), progress=lambda board, status: calls.append(status))
+        self.assertTrue(calls)
+        self.assertEqual(calls[0]["stage"], "search")
+
+    def test_count_solutions(self):
+        self.assertEqual(count_solutions(bit_board(HARD)), 1)
+        self.assertEqual(count_solutions(bit_board(MULTIPLE)), 2)
+        self.assertEqual(count_solutions(bit_board(MULTIPLE), limit=0), 6)
+        self.assertEqual(count_solutions(bit_board(NO_SOLUTION)), 0)
+
+    def test_engine_through_the_solver(self):
+        board, solved = solve_reasonable_sudoku(parse_puzzle_line(HARD), ENGINE_SEARCH)
+        self.assertTrue(solved)
+        self.assertTrue(solves(HARD, board_to_line(board)))
+
+
+if __name__ == '__main__':
+    unittest.main()
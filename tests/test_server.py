@@ -0,0 +1,158 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the solver service in sudokusolver.server"""
+
+import asyncio
+import json
+import unittest
+
+from puzzles import EASY, EASY_SOLUTION, HARD, NO_SOLUTION, solves
+from sudokusolver.client import generate_load, solve_lines
+from sudokusolver.server import SolverServer, read_request_line
+from sudokusolver.solver import ENGINES
+
+# a small line limit for the test server, so overlong lines are cheap to send
+LIMIT = 4096
+
+
+class ReadRequestLineTest(unittest.TestCase):
+
+    def read_lines(self, data: bytes):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        async def read():
+            reader = asyncio.StreamReader(limit=16)
+            reader.feed_data(data)
+            reader.feed_eof()
+            lines = []
+            while True:
+                line = await read_request_line(reader)
+                lines.append(line)
+                if line == b'':
+                    return lines
+
+        return loop.run_until_complete(read())
+
+    def test_lines(self):
+        self.assertEqual(self.read_lines(b"one\ntwo\nend"), [b"one\n", b"two\n", b"end", b''])
+
+    def test_an_overlong_line_is_skipped(self):
+        self.assertEqual(self.read_lines(b"short\n" + b"x" * 100 + b"\nnext\n"), [b"short\n", None, b"next\n", b''])
+
+    def test_an_overlong_last_line(self):
+        self.assertEqual(self.read_lines(b"x" * 100), [None, b''])
+
+
+class SolverServerTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.loop = asyncio.new_event_loop()
+        cls.server = SolverServer(ENGINES, 'search', jobs=1, timeout=10.0, max_nodes=0)
+        cls.loop.run_until_complete(cls.server.start_pool())
+        cls.listener = cls.loop.run_until_complete(asyncio.start_server(cls.server.handle, '127.0.0.1', 0, limit=LIMIT))
+        cls.port = cls.listener.sockets[0].getsockname()[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.listener.close()
+        cls.loop.run_until_complete(cls.listener.wait_closed())
+        cls.server.close()
+        cls.loop.close()
+
+    def exchange(self, data: bytes) -> bytes:
+        """Sends data on a new connection, closes the sending side and returns everything sent back"""
+        async def talk():
+            reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+            writer.write(data)
+            writer.write_eof()
+            response = await reader.read()
+            writer.close()
+            return response
+
+        return self.loop.run_until_complete(talk())
+
+    def requests(self, *lines: str):
+        return self.exchange("".join(line + "\n" for line in lines).encode('utf-8')).decode('utf-8').splitlines()
+
+    def test_one_line_puzzles_in_order(self):
+        results = self.requests(EASY, HARD, 'not a puzzle', NO_SOLUTION)
+        self.assertEqual([result.split(',')[2] for result in results], ['solved', 'solved', 'invalid', 'unsolved'])
+        self.assertEqual(results[0], f"{EASY},{EASY_SOLUTION},solved")
+        self.assertTrue(solves(HARD, results[1].split(',')[1]))
+
+    def test_json_requests(self):
+        single, batch = self.requests(json.dumps({"puzzle": HARD, "engine": "dlx"}), json.dumps({"puzzles": [EASY, NO_SOLUTION]}))
+        self.assertEqual(json.loads(single)["status"], 'solved')
+        self.assertEqual([result["status"] for result in json.loads(batch)["results"]], ['solved', 'unsolved'])
+
+    def test_bad_json_requests(self):
+        requests = [{"puzzle": EASY, "timeout": True}, {"puzzle": EASY, "timeout": -1}, {"puzzle": EASY, "max_nodes": 1.5},
+                    {"puzzle": EASY, "engine": "nope"}, {"puzzles": [1, 2]}, {}]
+        responses = self.requests(*(json.dumps(request) for request in requests), '{not json')
+        self.assertEqual(len(responses), len(requests) + 1)
+        for response in responses:
+            self.assertIn("error", json.loads(response))
+
+    def test_node_limit(self):
+        [response] = self.requests(json.dumps({"puzzle": HARD, "max_nodes": 1}))
+        self.assertEqual(json.loads(response)["status"], 'node-limit')
+
+    def test_an_overlong_line_gets_an_error_and_the_connection_goes_on(self):
+        first, second, third = self.requests(EASY, 'x' * (LIMIT * 3), EASY)
+        self.assertTrue(first.endswith(',solved'))
+        self.assertIn("request line longer than", json.loads(second)["error"])
+        self.assertTrue(third.endswith(',solved'))
+
+    def http(self, request: str):
+        response = self.exchange(request.encode('latin-1')).decode('utf-8')
+        head, _, body = response.partition("\r\n\r\n")
+        return int(head.split()[1]), body
+
+    def test_http_solve(self):
+        body = json.dumps({"puzzle": EASY})
+        status, response = self.http(f"POST /solve HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n{body}")
+        self.assertEqual((status, json.loads(response)["solution"]), (200, EASY_SOLUTION))
+        body = EASY + "\n" + HARD + "\n"
+        status, response = self.http(f"POST /solve HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n{body}")
+        self.assertEqual((status, len(response.splitlines())), (200, 2))
+
+    def test_http_errors(self):
+        self.assertEqual(self.http("POST /solve HTTP/1.1\r\nContent-Length: abc\r\n\r\n")[0], 400)
+        self.assertEqual(self.http("POST /solve HTTP/1.1\r\nContent-Length: 99999999999\r\n\r\n")[0], 413)
+        self.assertEqual(self.http("GET /solve HTTP/1.1\r\n\r\n")[0], 405)
+        self.assertEqual(self.http("GET /nowhere HTTP/1.1\r\n\r\n")[0], 404)
+        self.assertEqual(self.http("GET /health HTTP/1.1\r\nX-Long: " + "x" * (LIMIT * 3) + "\r\n\r\n")[0], 400)
+
+    def test_health(self):
+        status, body = self.http("GET /health HTTP/1.1\r\n\r\n")
+        self.assertEqual(status, 200)
+        health = json.loads(body)
+        self.assertEqual((health["status"], health["workers"]), ('ok', 1))
+
+    def test_client(self):
+        results = self.loop.run_until_complete(solve_lines([EASY, HARD], '127.0.0.1', self.port, ''))
+        self.assertEqual([result.split(',')[2] for result in results], ['solved', 'solved'])
+        [response] = self.loop.run_until_complete(solve_lines([EASY, HARD], '127.0.0.1', self.port, '', as_json=True))
+        self.assertEqual(len(json.loads(response)["results"]), 2)
+        latencies, seconds = self.loop.run_until_complete(generate_load([EASY, HARD], '127.0.0.1', self.port, '', 2, 3))
+        self.assertEqual(len(latencies), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for boards of other square sizes, their symbols and generating them"""
+
+import random
+import unittest
+
+from sudokusolver.generator import difficulties_for, generate_lines, generate_puzzle
+from sudokusolver.solver import ENGINES, board_to_line, count_solutions, parse_puzzle_line, solve_puzzle_line
+from sudokusolver.symbols import default_symbols, format_board, format_cells, parse_cells, parse_symbols
+from sudokusolver.units import geometry_for_size
+from sudokusolver.validate import grid_is_solution
+
+# 4x4 and 16x16 puzzles made by the generator, with their solutions
+SMALL = '4...3.2....3....'
+SMALL_SOLUTION = '4231312424131342'
+LARGE = ('.....6G.E..2....A.D....4..F...62.G..FC8...5..7.A....7..2.9BG..38..1...6DB....9..D82...415.....A7..AF.5...3.7.64..C9.G.E.A.4.82.'
+         '52F4.5...C..36...3..6....85....B..5.G..3..F.E.A......CE.6G..9..8.5.B..2....31.......1...A7..BE.2.8ECD..9..G......723..BFG4E98....')
+LARGE_SOLUTION = ('93F816G5E7A24BDCA7DE39B418FCG562BG62FC8E3D54179A415C7AD269BGFE38G415A76DB28F39CED8239F415CE6BGA7EBAF25C893G7D6416C97G3EBA14D82F5'
+                  '2F4958A7CB136DEG3DE64G1F857A2CB9C58GBD392F6E7A141A7BCE26G4D95F8356B4E27CDA3198GFF9G1845A76CBE32D8ECD6193FG25A47B723ADBFG4E98C156')
+
+
+class SizesTest(unittest.TestCase):
+
+    def test_every_engine_solves_other_sizes(self):
+        for puzzle, solution in ((SMALL, SMALL_SOLUTION), (LARGE, LARGE_SOLUTION)):
+            for engine in ENGINES:
+                self.assertEqual(solve_puzzle_line(puzzle, engine), f"{puzzle},{solution},solved")
+
+    def test_size_is_worked_out_from_the_line(self):
+        self.assertEqual(len(parse_puzzle_line(SMALL)), 4)
+        self.assertEqual(len(parse_puzzle_line(LARGE)), 16)
+        self.assertIsNone(parse_puzzle_line(SMALL, size=9))
+        self.assertIsNone(parse_puzzle_line(SMALL[:-1] + '5'))
+
+    def test_symbols(self):
+        symbols = parse_symbols('WXYZ')
+        puzzle = SMALL.translate(str.maketrans('1234', 'WXYZ'))
+        self.assertEqual(solve_puzzle_line(puzzle, symbols=symbols), f"{puzzle},{SMALL_SOLUTION.translate(str.maketrans('1234', 'WXYZ'))},solved")
+        self.assertEqual(parse_symbols('a,b,c,d'), ['a', 'b', 'c', 'd'])
+        for bad in ('ABC', 'AABC', 'A.BC'):
+            with self.assertRaises(ValueError):
+                parse_symbols(bad)
+
+    def test_numbered_tokens(self):
+        text = ' '.join(str(int(character, 17)) if character != '.' else '.' for character in LARGE)
+        geometry, digits, symbols = parse_cells(text)
+        self.assertEqual(geometry.size, 16)
+        self.assertEqual(format_cells(digits, default_symbols(16)), LARGE)
+
+    def test_board_layout_reads_back(self):
+        geometry = geometry_for_size(16)
+        digits = parse_cells(LARGE)[1]
+        self.assertEqual(parse_cells(format_board(digits, geometry, default_symbols(16)))[1], digits)
+        self.assertEqual(board_to_line(parse_puzzle_line(LARGE)), LARGE)
+
+
+class GenerateSizesTest(unittest.TestCase):
+
+    def test_generated_puzzles_are_unique(self):
+        for size in (4, 16):
+            [puzzle] = generate_lines(1, 'easy', seed='sizes', size=size)
+            self.assertEqual(len(puzzle), size * size)
+            self.assertEqual(count_solutions(parse_puzzle_line(puzzle)), 1)
+
+    def test_small_boards_only_have_easy_puzzles(self):
+        geometry = geometry_for_size(4)
+        self.assertEqual(difficulties_for(geometry), ['easy'])
+        with self.assertRaises(ValueError):
+            generate_puzzle(random.Random(1), 'medium', geometry)
+        puzzle, solution = generate_puzzle(random.Random(1), 'easy', geometry)
+        self.assertTrue(grid_is_solution(solution, geometry))
+
+
+if __name__ == '__main__':
+    unittest.main()
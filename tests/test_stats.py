@@ -0,0 +1,93 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for per solve statistics in sudokusolver.stats and the --stats and --profile options"""
+
+import os
+import pstats
+import tempfile
+import unittest
+
+from puzzles import EASY, HARD, NO_SOLUTION, run_main
+from sudokusolver.solver import ENGINES, parse_puzzle_line, solve_reasonable_sudoku
+from sudokusolver.stats import PHASES, SolveStats
+from sudokusolver.techniques import DIFFICULTIES, rate_stats
+
+
+class SolveStatsTest(unittest.TestCase):
+
+    def test_an_easy_puzzle_needs_no_guesses(self):
+        [board, solved, stats] = solve_reasonable_sudoku(parse_puzzle_line(EASY), return_stats=True)
+        self.assertTrue(solved)
+        self.assertEqual(stats.guesses, 0)
+        self.assertGreater(stats.elimination_loops, 0)
+        self.assertGreater(sum(stats.removed.values()), 0)
+        # the solver leans on hidden singles, which rate medium
+        self.assertEqual(rate_stats(stats, solved), 'medium')
+
+    def test_a_hard_puzzle_is_searched(self):
+        for engine in ENGINES:
+            [board, solved, stats] = solve_reasonable_sudoku(parse_puzzle_line(HARD), engine, return_stats=True)
+            self.assertTrue(solved)
+            self.assertGreater(stats.guesses, 0)
+            self.assertGreater(stats.total_seconds(), 0)
+            self.assertEqual(rate_stats(stats, solved), DIFFICULTIES[-1])
+
+    def test_plain_data(self):
+        stats = SolveStats()
+        stats.count_removed('naked-single', 3)
+        stats.count_removed('naked-single', 2)
+        data = stats.to_dict()
+        self.assertEqual(set(data["seconds"]), set(PHASES))
+        self.assertEqual((data["removed"], data["hits"]), ({'naked-single': 5}, {'naked-single': 2}))
+        self.assertEqual((data["exceeded"], data["cached"]), (None, False))
+
+    def test_an_unsolved_puzzle_is_rated_extreme(self):
+        [board, solved, stats] = solve_reasonable_sudoku(parse_puzzle_line(NO_SOLUTION), return_stats=True)
+        self.assertFalse(solved)
+        self.assertEqual(rate_stats(stats, solved), DIFFICULTIES[-1])
+
+
+class CommandLineTest(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.filename = tempfile.mkstemp(suffix='.txt')
+        with os.fdopen(handle, 'w') as puzzle_file:
+            puzzle_file.write(EASY + "\n")
+        self.addCleanup(os.remove, self.filename)
+
+    def test_stats(self):
+        status, out, _ = run_main(self.filename, '-q', '--stats')
+        self.assertEqual(status, 0)
+        self.assertIn("Guesses: 0", out)
+        self.assertIn("Difficulty: medium", out)
+
+    def test_stats_need_a_single_puzzle(self):
+        status, _, err = run_main(self.filename, '--batch', '--stats')
+        self.assertEqual(status, 2)
+        self.assertIn("--stats works on a single puzzle", err)
+
+    def test_profile(self):
+        profile = self.filename + '.prof'
+        self.addCleanup(os.remove, profile)
+        status, _, _ = run_main(self.filename, '-q', '--profile', profile)
+        self.assertEqual(status, 0)
+        functions = [function for _, _, function in pstats.Stats(profile).stats]
+        self.assertIn('solve_reasonable_sudoku', functions)
+
+
+if __name__ == '__main__':
+    unittest.main()
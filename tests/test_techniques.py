@@ -0,0 +1,95 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the logical solving techniques in sudokusolver.techniques"""
+
+import unittest
+
+from puzzles import CONTRADICTORY, EASY, EASY_SOLUTION, NO_SOLUTION, solves
+from sudokusolver.bitboard import BitBoard
+from sudokusolver.solver import ENGINES, board_to_line, guess_generator, parse_puzzle_line, solve_reasonable_sudoku
+from sudokusolver.techniques import (DIFFICULTIES, TECHNIQUE_NAMES, parse_techniques, propagate_with, rate_board,
+                                     techniques_up_to)
+
+# needs pointing pairs
+HARD_LOGIC = '9....2....4..5.6.........48....8..2...63..4...3...4.1....87...5.7.53..9..9......7'
+# needs a swordfish
+EXPERT_LOGIC = '....4..962....3.5....2.7..8...3....91.54.........95.82..4.5.......7..3....2.....5'
+
+
+def bit_board(line: str) -> BitBoard:
+    return BitBoard.from_list_board(parse_puzzle_line(line))
+
+
+class TechniquesTest(unittest.TestCase):
+
+    def test_parse_techniques(self):
+        self.assertEqual(parse_techniques('all'), TECHNIQUE_NAMES)
+        self.assertEqual(parse_techniques('none'), [])
+        self.assertEqual(parse_techniques('x_wing,naked_pair'), ['x_wing', 'naked_pair'])
+        with self.assertRaises(ValueError):
+            parse_techniques('naked_pair,bogus')
+
+    def test_difficulty_adds_techniques(self):
+        self.assertEqual(techniques_up_to(DIFFICULTIES[-1]), TECHNIQUE_NAMES)
+        self.assertLess(set(techniques_up_to('hard')), set(techniques_up_to('expert')))
+
+    def test_rating(self):
+        self.assertEqual(rate_board(bit_board(EASY)), 'medium')
+        self.assertEqual(rate_board(bit_board(HARD_LOGIC)), 'hard')
+        self.assertEqual(rate_board(bit_board(EXPERT_LOGIC)), 'expert')
+        self.assertIsNone(rate_board(bit_board(CONTRADICTORY)))
+
+    def test_enough_techniques_need_no_search(self):
+        for puzzle, difficulty in ((HARD_LOGIC, 'hard'), (EXPERT_LOGIC, 'expert')):
+            [board, solved, stats] = solve_reasonable_sudoku(parse_puzzle_line(puzzle), techniques=techniques_up_to(difficulty),
+                                                             return_stats=True)
+            self.assertTrue(solved)
+            self.assertTrue(solves(puzzle, board_to_line(board)))
+            self.assertEqual(stats.guesses, 0)
+
+    def test_too_few_techniques_fall_back_to_search(self):
+        [board, solved, stats] = solve_reasonable_sudoku(parse_puzzle_line(EXPERT_LOGIC), techniques=[], return_stats=True)
+        self.assertTrue(solved)
+        self.assertGreater(stats.guesses, 0)
+
+
+class ContradictionTest(unittest.TestCase):
+
+    def test_techniques_find_the_contradiction(self):
+        self.assertFalse(propagate_with(bit_board(CONTRADICTORY), TECHNIQUE_NAMES))
+
+    def test_every_engine_reports_unsolvable_input(self):
+        for engine in ENGINES:
+            for techniques in (None, [], TECHNIQUE_NAMES):
+                for puzzle in (CONTRADICTORY, NO_SOLUTION):
+                    # few guesses per roll keep the guess engine quick to give up
+                    [board, solved] = solve_reasonable_sudoku(parse_puzzle_line(puzzle), engine, techniques=techniques, max_guesses=10)
+                    self.assertFalse(solved, (engine, techniques, puzzle))
+
+    def test_no_guess_for_a_cell_without_candidates(self):
+        board = parse_puzzle_line(EASY)
+        board[0][1] = []
+        board[0][2] = [4, 8]
+        self.assertEqual(list(guess_generator(board)), [[board, False]])
+
+    def test_no_guess_for_a_full_board(self):
+        board = parse_puzzle_line(EASY_SOLUTION)
+        self.assertEqual(list(guess_generator(board)), [[board, False]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the unit and peer index in sudokusolver.units"""
+
+import unittest
+
+from sudokusolver.solver import E, square_single_members
+from sudokusolver.units import STANDARD, geometry_for_box, geometry_for_size
+
+
+class GeometryTest(unittest.TestCase):
+
+    def test_standard_board(self):
+        self.assertEqual((STANDARD.box, STANDARD.size, STANDARD.cells), (3, 9, 81))
+        self.assertEqual(STANDARD.all_digits, 0b111111111)
+        self.assertEqual(len(STANDARD.units), 27)
+
+    def test_every_cell_has_twenty_peers(self):
+        for cell in range(81):
+            peers = STANDARD.peers[cell]
+            self.assertEqual(len(peers), 20)
+            self.assertNotIn(cell, peers)
+
+    def test_units_of_a_cell(self):
+        # row 4, column 5, the middle square
+        cell = 4 * 9 + 5
+        self.assertEqual((STANDARD.row_of[cell], STANDARD.col_of[cell], STANDARD.box_of[cell]), (4, 5, 4))
+        row, col, square = STANDARD.cell_units[cell]
+        self.assertEqual(row, tuple(range(36, 45)))
+        self.assertEqual(col, tuple(range(5, 81, 9)))
+        self.assertEqual(square, (30, 31, 32, 39, 40, 41, 48, 49, 50))
+
+    def test_every_unit_covers_the_board_once(self):
+        for units in (STANDARD.rows, STANDARD.cols, STANDARD.boxes):
+            self.assertEqual(sorted(cell for unit in units for cell in unit), list(range(81)))
+
+    def test_geometries_are_shared(self):
+        self.assertIs(geometry_for_size(9), STANDARD)
+        self.assertIs(geometry_for_box(4), geometry_for_size(16))
+
+    def test_sizes_that_are_not_square(self):
+        self.assertIsNone(geometry_for_size(10))
+        self.assertIsNone(geometry_for_size(0))
+
+    def test_square_members_use_the_index(self):
+        board = [[E] * 9 for _ in range(9)]
+        board[3][3] = 4
+        board[5][5] = 7
+        board[5][6] = 1
+        self.assertEqual(sorted(square_single_members(4, 4, board)), [4, 7])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for unit tracking and grid validation in sudokusolver.validate"""
+
+import unittest
+
+from puzzles import EASY, EASY_SOLUTION, HARD_SOLUTION
+from sudokusolver.solver import parse_puzzle_line, verify_sudoku
+from sudokusolver.units import STANDARD, geometry_for_size
+from sudokusolver.validate import UnitTracker, grid_is_solution, iter_validate, validate_grid
+from sudokusolver.vectorized import numpy
+
+
+def digits(line: str):
+    return [0 if character == '.' else int(character) for character in line]
+
+
+class UnitTrackerTest(unittest.TestCase):
+
+    def test_a_solution(self):
+        tracker = UnitTracker.from_grid(digits(EASY_SOLUTION))
+        self.assertTrue(tracker.is_solution())
+        self.assertEqual(tracker.masks, [STANDARD.all_digits] * 27)
+
+    def test_a_puzzle(self):
+        tracker = UnitTracker.from_grid(digits(EASY))
+        self.assertTrue(tracker.is_consistent())
+        self.assertFalse(tracker.is_complete())
+        self.assertEqual(tracker.filled, sum(1 for character in EASY if character != '.'))
+
+    def test_conflicts_come_and_go(self):
+        tracker = UnitTracker.from_grid(digits(EASY))
+        # 3 is already in the top left corner, so another 3 in its row and square repeats it twice
+        tracker.place(1, 3)
+        self.assertEqual(tracker.conflicts, 2)
+        self.assertFalse(tracker.is_consistent())
+        self.assertEqual(tracker.remove(1), 3)
+        self.assertTrue(tracker.is_consistent())
+        self.assertEqual(tracker.remove(1), 0)
+
+    def test_place_replaces_a_digit(self):
+        tracker = UnitTracker.from_grid(digits(EASY_SOLUTION))
+        tracker.place(0, 9)
+        self.assertEqual(tracker.filled, 81)
+        self.assertFalse(tracker.is_solution())
+        tracker.place(0, int(EASY_SOLUTION[0]))
+        self.assertTrue(tracker.is_solution())
+
+    def test_seen(self):
+        grid = digits(EASY)
+        tracker = UnitTracker.from_grid(grid)
+        for cell in range(81):
+            expected = 0
+            for other in STANDARD.peers[cell] + (cell,):
+                if grid[other]:
+                    expected |= 1 << (grid[other] - 1)
+            self.assertEqual(tracker.seen(cell), expected)
+
+
+class ValidateTest(unittest.TestCase):
+
+    def test_grid_is_solution(self):
+        self.assertTrue(grid_is_solution(digits(EASY_SOLUTION)))
+        self.assertFalse(grid_is_solution(digits(EASY)))
+        self.assertFalse(grid_is_solution(digits(EASY_SOLUTION)[:80]))
+        swapped = digits(EASY_SOLUTION)
+        swapped[0], swapped[1] = swapped[1], swapped[0]
+        self.assertFalse(grid_is_solution(swapped))
+        self.assertTrue(grid_is_solution(digits('4231312424131342'), geometry_for_size(4)))
+
+    def test_verify_sudoku(self):
+        self.assertTrue(verify_sudoku(parse_puzzle_line(EASY_SOLUTION)))
+        self.assertFalse(verify_sudoku(parse_puzzle_line(EASY)))
+        self.assertFalse(verify_sudoku([[1, 2], [2, 1]]))
+
+    def test_many_grids(self):
+        lines = [EASY_SOLUTION, HARD_SOLUTION, EASY, 'x' * 81, EASY_SOLUTION[:80]]
+        expected = [True, True, False, False, False]
+        self.assertEqual(validate_grid(lines), expected)
+        self.assertEqual(list(iter_validate(iter(lines))), expected)
+        self.assertEqual(validate_grid([digits(EASY_SOLUTION), digits(EASY)]), [True, False])
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_arrays(self):
+        grids = numpy.array([digits(EASY_SOLUTION), digits(EASY), digits(HARD_SOLUTION)])
+        self.assertEqual(validate_grid(grids).tolist(), [True, False, True])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# sudoku-solver-py is a program that solves sudoku puzzles
+#   Copyright (C) 2021 Noah Stanford <noahstandingford@gmail.com>
+#
+#   sudoku-solver-py is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   sudoku-solver-py is distributed in the hope that it will be interesting and fun,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+"""Tests for the NumPy engine in sudokusolver.vectorized, skipped when NumPy is not installed"""
+
+import unittest
+
+from puzzles import CONTRADICTORY, EASY, EASY_SOLUTION, HARD, NO_SOLUTION, solves
+from sudokusolver.budget import Budget
+from sudokusolver import vectorized
+
+if vectorized.numpy is not None:
+    import numpy
+
+
+@unittest.skipIf(vectorized.numpy is None, "NumPy is not installed")
+class VectorizedTest(unittest.TestCase):
+
+    def test_propagation_and_search(self):
+        results = [line.split(',') for line in vectorized.solve_lines([EASY, HARD, NO_SOLUTION, CONTRADICTORY])]
+        self.assertEqual([status for _, _, status in results], ['solved', 'solved', 'unsolved', 'unsolved'])
+        self.assertEqual(results[0][1], EASY_SOLUTION)
+        self.assertTrue(solves(HARD, results[1][1]))
+
+    def test_invalid_lines(self):
+        self.assertEqual(vectorized.solve_lines(['short', 'x' * 81]), ['short,,invalid', 'x' * 81 + ',,invalid'])
+        self.assertEqual(vectorized.solve_lines([]), [])
+
+    def test_batches_keep_input_order(self):
+        lines = [EASY, HARD, 'short'] * 3
+        results = list(vectorized.solve_batches(lines, batch_size=2))
+        self.assertEqual([result.split(',')[0] for result in results], lines)
+
+    def test_budget_stops_the_search(self):
+        [result] = vectorized.solve_lines([HARD], budget=Budget(nodes=1))
+        puzzle, partial, status = result.split(',')
+        self.assertEqual(status, 'node-limit')
+        self.assertEqual(len(partial), 81)
+        self.assertTrue(all(clue == '.' or clue == cell for clue, cell in zip(HARD, partial)))
+
+    def test_validate_array(self):
+        solution = [int(character) for character in EASY_SOLUTION]
+        broken = list(solution)
+        broken[0], broken[1] = broken[1], broken[0]
+        unfinished = [0] + solution[1:]
+        self.assertEqual(vectorized.validate_array(numpy.array([solution, broken, unfinished])).tolist(), [True, False, False])
+        with self.assertRaises(ValueError):
+            vectorized.validate_array(numpy.zeros((2, 80)))
+
+
+if __name__ == '__main__':
+    unittest.main()